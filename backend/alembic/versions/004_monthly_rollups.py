@@ -0,0 +1,86 @@
+"""Add monthly_rollups table.
+
+Revision ID: 004_monthly_rollups
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "004_monthly_rollups"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add monthly_rollups table and backfill it from transactions."""
+    op.create_table(
+        "monthly_rollups",
+        sa.Column("id", sa.UUID(), nullable=False, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column(
+            "type",
+            postgresql.ENUM("EXPENSE", "INCOME", name="transactiontype", create_type=False),
+            nullable=False,
+        ),
+        sa.Column("category_id", sa.UUID(), nullable=True),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("total", sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["categories.id"],
+            ondelete="CASCADE",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id",
+            "month",
+            "type",
+            "category_id",
+            "currency",
+            name="uq_monthly_rollup_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    
+    op.create_index(
+        "ix_monthly_rollups_category_id",
+        "monthly_rollups",
+        ["category_id"],
+    )
+    
+    # Backfill from existing transactions
+    op.execute(
+        """
+        INSERT INTO monthly_rollups (user_id, month, type, category_id, currency, total, count)
+        SELECT user_id,
+               CAST(date_trunc('month', transaction_date) AS DATE),
+               type,
+               category_id,
+               currency,
+               sum(amount),
+               count(*)
+        FROM transactions
+        GROUP BY 1, 2, 3, 4, 5
+        """
+    )
+
+
+def downgrade() -> None:
+    """Remove monthly_rollups table."""
+    op.drop_index("ix_monthly_rollups_category_id", table_name="monthly_rollups")
+    op.drop_table("monthly_rollups")
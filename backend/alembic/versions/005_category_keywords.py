@@ -0,0 +1,37 @@
+"""Add category_keywords table.
+
+Revision ID: 005_category_keywords
+Revises: 004_monthly_rollups
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "005_category_keywords"
+down_revision: Union[str, None] = "004_monthly_rollups"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add category_keywords table."""
+    op.create_table(
+        "category_keywords",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("keyword", sa.String(length=100), nullable=False),
+        sa.Column("category_hint", sa.String(length=50), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("keyword"),
+    )
+
+
+def downgrade() -> None:
+    """Remove category_keywords table."""
+    op.drop_table("category_keywords")
@@ -1,23 +1,23 @@
 """API dependency injection."""
 
 import uuid
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from fastapi import Depends, Header
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.core.exceptions import UnauthorizedException
 from app.core.security import decode_token
-from app.db.session import get_db
+from app.db.routing import read_session_maker_for
+from app.db.session import async_primary_read_session_maker, get_db
 from app.models.user import User
 from app.repositories.user_repo import UserRepository
+from app.schemas.user import UserRead
 
 
-async def get_current_user(
-    authorization: Annotated[str | None, Header()] = None,
-    db: AsyncSession = Depends(get_db),
-) -> User:
-    """Get current authenticated user from JWT token."""
+def _user_id_from_authorization(authorization: str | None) -> uuid.UUID:
+    """Get the user ID from a bearer access token."""
     if not authorization or not authorization.startswith("Bearer "):
         raise UnauthorizedException("Missing or invalid authorization header")
     
@@ -31,9 +31,38 @@ async def get_current_user(
         if not user_id_str or token_type != "access":
             raise UnauthorizedException("Invalid token type")
         
-        user_id = uuid.UUID(user_id_str)
+        return uuid.UUID(user_id_str)
     except (ValueError, KeyError):
         raise UnauthorizedException()
+
+
+async def get_current_principal(
+    authorization: Annotated[str | None, Header()] = None,
+) -> UserRead:
+    """Get the authenticated user from the JWT token and the principal cache.
+
+    The database is only queried when the principal is not cached, in a READ
+    ONLY transaction of its own on the primary so a just-registered user is
+    found. A session checks out no connection until its first query, so a
+    cache hit never touches the pool.
+    """
+    user_id = _user_id_from_authorization(authorization)
+    
+    async with async_primary_read_session_maker() as session:
+        principal = await UserRepository(session).get_principal(user_id)
+    
+    if not principal or not principal.is_active:
+        raise UnauthorizedException("User not found or inactive")
+    
+    return principal
+
+
+async def get_current_user(
+    authorization: Annotated[str | None, Header()] = None,
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    """Get current authenticated user from JWT token, as a full database row."""
+    user_id = _user_id_from_authorization(authorization)
     
     # Get user from database
     user_repo = UserRepository(db)
@@ -45,5 +74,48 @@ async def get_current_user(
     return user
 
 
-# Dependency for current user
+# Dependency for the current user's cached principal (enough for most endpoints)
+CurrentPrincipal = Annotated[UserRead, Depends(get_current_principal)]
+
+# Dependency for current user (loads the users row)
 CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+async def get_read_session_maker(
+    current_user: CurrentPrincipal,
+    x_read_primary: Annotated[str | None, Header()] = None,
+) -> async_sessionmaker[AsyncSession]:
+    """Session factory for the current user's reads.
+
+    Uses the replica when one is configured, except right after the user wrote
+    or when the request sends an ``X-Read-Primary`` header.
+    """
+    return await read_session_maker_for(current_user.id, force_primary=bool(x_read_primary))
+
+
+async def get_read_db(
+    session_maker: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_read_session_maker)
+    ],
+) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for sessions used by read-only endpoints.
+
+    The session runs READ ONLY transactions and is never committed; closing it
+    just ends the transaction. Use it through ``ReadDB`` so it is closed as soon
+    as the endpoint returns, before the response is sent.
+    """
+    async with session_maker() as session:
+        yield session
+
+
+# Dependency for endpoints that write. The session commits when the endpoint
+# returns, before the response is sent, so a failed commit is reported as an
+# error and a follow-up request sees the write and the invalidated caches
+DB = Annotated[AsyncSession, Depends(get_db, scope="function")]
+
+# Dependency for read-only endpoints; the connection is released when the endpoint returns
+ReadDB = Annotated[AsyncSession, Depends(get_read_db, scope="function")]
+
+
+# Dependency for the read session factory (for work on separate sessions)
+ReadSessionMaker = Annotated[async_sessionmaker[AsyncSession], Depends(get_read_session_maker)]
@@ -0,0 +1,99 @@
+"""ASGI middleware."""
+
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import http_request_duration
+from app.db.query_stats import track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """Count the SQL queries and database time of each HTTP request.
+
+    With ``server_timing`` the stats are sent as a ``Server-Timing`` header
+    (covering the queries run before the response started); otherwise they
+    are logged as structured fields once the request is finished, including
+    the commit of the request's session.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = False):
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        with track_queries() as stats:
+            async def send_with_stats(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if self.server_timing:
+                        MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                if not self.server_timing:
+                    fields = stats.as_log_fields()
+                    logger.info(
+                        "%s %s %d: %d queries, %.1f ms in db",
+                        scope["method"],
+                        scope["path"],
+                        status_code,
+                        fields["db_queries"],
+                        fields["db_time_ms"],
+                        extra={
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "status_code": status_code,
+                            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                            **fields,
+                        },
+                    )
+
+
+class MetricsMiddleware:
+    """Record the latency of each HTTP request by route template.
+
+    Requests that match no route share one label, so scanners probing random
+    paths can't blow up the number of series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            http_request_duration.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - started)
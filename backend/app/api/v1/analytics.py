@@ -0,0 +1,33 @@
+"""Analytics endpoints."""
+
+from datetime import date
+
+from fastapi import APIRouter
+
+from app.api.deps import CurrentPrincipal, ReadDB
+from app.core.exceptions import BadRequestException
+from app.schemas.analytics import AnalyticsSummary
+from app.services.analytics_service import AnalyticsService
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/summary", response_model=AnalyticsSummary)
+async def get_summary(
+    current_user: CurrentPrincipal,
+    db: ReadDB,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> AnalyticsSummary:
+    """Get income/expense totals with category and monthly breakdowns.
+
+    The summary is in the user's default currency; transactions in other
+    currencies are totalled separately under ``other_currencies``.
+    """
+    if start_date and end_date and start_date > end_date:
+        raise BadRequestException("start_date must not be after end_date")
+    
+    analytics_service = AnalyticsService(db)
+    return await analytics_service.get_summary(
+        current_user.id, current_user.default_currency, start_date, end_date
+    )
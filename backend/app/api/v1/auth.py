@@ -1,12 +1,10 @@
 """Authentication endpoints."""
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, status
 
-from app.api.deps import CurrentUser
+from app.api.deps import DB, CurrentPrincipal
 from app.core.exceptions import BadRequestException, ConflictException, UnauthorizedException
 from app.core.security import create_access_token, create_refresh_token, hash_password, verify_password
-from app.db.session import get_db
 from app.repositories.user_repo import UserRepository
 from app.schemas.common import MessageResponse
 from app.schemas.user import Token, UserCreate, UserLogin, UserRead
@@ -17,7 +15,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: AsyncSession = Depends(get_db),
+    db: DB,
 ) -> UserRead:
     """Register a new user."""
     user_repo = UserRepository(db)
@@ -44,7 +42,7 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     credentials: UserLogin,
-    db: AsyncSession = Depends(get_db),
+    db: DB,
 ) -> Token:
     """Login with email and password."""
     user_repo = UserRepository(db)
@@ -69,12 +67,12 @@ async def login(
 
 
 @router.get("/me", response_model=UserRead)
-async def get_current_user_info(current_user: CurrentUser) -> UserRead:
+async def get_current_user_info(current_user: CurrentPrincipal) -> UserRead:
     """Get current user information."""
-    return UserRead.model_validate(current_user)
+    return current_user
 
 
 @router.post("/logout", response_model=MessageResponse)
-async def logout(current_user: CurrentUser) -> MessageResponse:
+async def logout(current_user: CurrentPrincipal) -> MessageResponse:
     """Logout (client should discard tokens)."""
     return MessageResponse(message="Successfully logged out")
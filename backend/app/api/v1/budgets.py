@@ -0,0 +1,25 @@
+"""Budget endpoints."""
+
+from datetime import date
+
+from fastapi import APIRouter
+
+from app.api.deps import CurrentPrincipal, ReadDB
+from app.schemas.budget import BudgetStatus
+from app.services.budget_service import BudgetService
+
+router = APIRouter(prefix="/budgets", tags=["Budgets"])
+
+
+@router.get("/status", response_model=BudgetStatus)
+async def get_budget_status(
+    current_user: CurrentPrincipal,
+    db: ReadDB,
+    month: date | None = None,
+) -> BudgetStatus:
+    """Get spending against every category's monthly limit.
+
+    ``month`` may be any day of the month to evaluate; defaults to the current month.
+    """
+    budget_service = BudgetService(db)
+    return await budget_service.get_status(current_user.id, month)
@@ -2,12 +2,10 @@
 
 import uuid
 
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, status
 
-from app.api.deps import CurrentUser
+from app.api.deps import DB, CurrentPrincipal, ReadDB
 from app.core.exceptions import BadRequestException, ForbiddenException, NotFoundException
-from app.db.session import get_db
 from app.models.transaction import TransactionType
 from app.repositories.category_repo import CategoryRepository
 from app.schemas.category import CategoryCreate, CategoryRead, CategoryUpdate
@@ -18,8 +16,8 @@ router = APIRouter(prefix="/categories", tags=["Categories"])
 
 @router.get("", response_model=list[CategoryRead])
 async def list_categories(
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: ReadDB,
     type: TransactionType | None = None,
 ) -> list[CategoryRead]:
     """List all categories (system + user's custom)."""
@@ -36,8 +34,8 @@ async def list_categories(
 @router.post("", response_model=CategoryRead, status_code=status.HTTP_201_CREATED)
 async def create_category(
     category_data: CategoryCreate,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> CategoryRead:
     """Create a custom category."""
     category_repo = CategoryRepository(db)
@@ -69,8 +67,8 @@ async def create_category(
 @router.get("/{category_id}", response_model=CategoryRead)
 async def get_category(
     category_id: uuid.UUID,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: ReadDB,
 ) -> CategoryRead:
     """Get a single category."""
     category_repo = CategoryRepository(db)
@@ -86,8 +84,8 @@ async def get_category(
 async def update_category(
     category_id: uuid.UUID,
     category_data: CategoryUpdate,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> CategoryRead:
     """Update a custom category (system categories can only update monthly_limit)."""
     category_repo = CategoryRepository(db)
@@ -115,7 +113,7 @@ async def update_category(
         setattr(category, field, value)
     
     # Save
-    category = await category_repo.update(category)
+    category = await category_repo.update_user_category(category, current_user.id)
     
     return CategoryRead.model_validate(category)
 
@@ -123,8 +121,8 @@ async def update_category(
 @router.delete("/{category_id}", response_model=MessageResponse)
 async def delete_category(
     category_id: uuid.UUID,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> MessageResponse:
     """Delete a custom category (system categories cannot be deleted)."""
     category_repo = CategoryRepository(db)
@@ -0,0 +1,75 @@
+"""Statement import endpoints."""
+
+import asyncio
+import os
+import shutil
+import tempfile
+import uuid
+
+import pydantic
+from fastapi import APIRouter, BackgroundTasks, File, Form, UploadFile, status
+
+from app.api.deps import DB, CurrentPrincipal
+from app.core.exceptions import BadRequestException, NotFoundException
+from app.schemas.statement_import import CsvColumnMapping, ImportFormat, ImportJobRead
+from app.services.import_service import ImportService, run_import_job
+
+router = APIRouter(prefix="/imports", tags=["Imports"])
+
+
+def _detect_format(filename: str | None) -> ImportFormat:
+    """Infer the statement format from the file extension."""
+    extension = os.path.splitext(filename or "")[1].lstrip(".").lower()
+    try:
+        return ImportFormat(extension)
+    except ValueError:
+        raise BadRequestException("Could not detect file format; pass 'format' explicitly")
+
+
+@router.post("", response_model=ImportJobRead, status_code=status.HTTP_202_ACCEPTED)
+async def create_import(
+    current_user: CurrentPrincipal,
+    background_tasks: BackgroundTasks,
+    db: DB,
+    file: UploadFile = File(...),
+    format: ImportFormat | None = Form(None),
+    mapping: str | None = Form(None, description="CSV column mapping as JSON"),
+) -> ImportJobRead:
+    """Upload a CSV/OFX/QIF statement and start importing it in the background."""
+    file_format = format or _detect_format(file.filename)
+    
+    column_mapping = None
+    if mapping:
+        try:
+            column_mapping = CsvColumnMapping.model_validate_json(mapping)
+        except pydantic.ValidationError as exc:
+            raise BadRequestException(f"Invalid column mapping: {exc.errors()[0]['msg']}")
+    
+    # Copy the upload to a file owned by the job; the request's upload is
+    # closed once the response is sent
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_format.value}") as target:
+        await asyncio.to_thread(shutil.copyfileobj, file.file, target)
+    
+    import_service = ImportService(db)
+    try:
+        job = await import_service.create_job(current_user.id, file_format, file.filename)
+    except Exception:
+        os.unlink(target.name)
+        raise
+    
+    background_tasks.add_task(run_import_job, job, target.name, column_mapping)
+    
+    return job
+
+
+@router.get("/{job_id}", response_model=ImportJobRead)
+async def get_import(
+    job_id: uuid.UUID,
+    current_user: CurrentPrincipal,
+) -> ImportJobRead:
+    """Get the progress of an import job."""
+    job = await ImportService.get_job(job_id, current_user.id)
+    if not job:
+        raise NotFoundException("Import job not found")
+    
+    return job
@@ -3,10 +3,9 @@
 import uuid
 from datetime import date
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter
 
-from app.api.deps import CurrentUser, get_db
+from app.api.deps import DB, CurrentPrincipal, ReadDB
 from app.core.exceptions import ForbiddenException, NotFoundException
 from app.models.recurring_transaction import RecurringTransaction
 from app.models.transaction import Transaction
@@ -24,8 +23,8 @@ router = APIRouter(prefix="/recurring-transactions", tags=["recurring-transactio
 
 @router.get("", response_model=list[RecurringTransactionRead])
 async def list_recurring_transactions(
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: ReadDB,
 ) -> list[RecurringTransactionRead]:
     """List all recurring transactions for the current user."""
     repo = RecurringTransactionRepository(db)
@@ -36,8 +35,8 @@ async def list_recurring_transactions(
 @router.post("", response_model=RecurringTransactionRead, status_code=201)
 async def create_recurring_transaction(
     data: RecurringTransactionCreate,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> RecurringTransactionRead:
     """Create a new recurring transaction."""
     repo = RecurringTransactionRepository(db)
@@ -54,8 +53,8 @@ async def create_recurring_transaction(
 @router.get("/{recurring_transaction_id}", response_model=RecurringTransactionRead)
 async def get_recurring_transaction(
     recurring_transaction_id: uuid.UUID,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: ReadDB,
 ) -> RecurringTransactionRead:
     """Get a specific recurring transaction."""
     repo = RecurringTransactionRepository(db)
@@ -71,8 +70,8 @@ async def get_recurring_transaction(
 async def update_recurring_transaction(
     recurring_transaction_id: uuid.UUID,
     data: RecurringTransactionUpdate,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> RecurringTransactionRead:
     """Update a recurring transaction."""
     repo = RecurringTransactionRepository(db)
@@ -96,8 +95,8 @@ async def update_recurring_transaction(
 @router.delete("/{recurring_transaction_id}", status_code=204)
 async def delete_recurring_transaction(
     recurring_transaction_id: uuid.UUID,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> None:
     """Delete a recurring transaction."""
     repo = RecurringTransactionRepository(db)
@@ -115,8 +114,8 @@ async def delete_recurring_transaction(
 @router.post("/{recurring_transaction_id}/pay", response_model=TransactionRead, status_code=201)
 async def pay_recurring_transaction(
     recurring_transaction_id: uuid.UUID,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> TransactionRead:
     """Create a transaction from a recurring transaction (pay a bill)."""
     rt_repo = RecurringTransactionRepository(db)
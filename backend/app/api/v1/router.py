@@ -2,7 +2,16 @@
 
 from fastapi import APIRouter
 
-from app.api.v1 import auth, categories, recurring_transactions, transactions, users
+from app.api.v1 import (
+    analytics,
+    auth,
+    budgets,
+    categories,
+    imports,
+    recurring_transactions,
+    transactions,
+    users,
+)
 
 router = APIRouter(prefix="/v1")
 
@@ -11,4 +20,7 @@ router.include_router(auth.router)
 router.include_router(transactions.router)
 router.include_router(categories.router)
 router.include_router(recurring_transactions.router)
+router.include_router(imports.router)
+router.include_router(analytics.router)
+router.include_router(budgets.router)
 router.include_router(users.router, prefix="/users", tags=["Users"])
@@ -1,27 +1,130 @@
 """Transaction endpoints."""
 
+import asyncio
+import csv
+import io
+import json
 import uuid
-from datetime import date
+from collections.abc import AsyncIterator
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
+import pydantic
+from fastapi import APIRouter, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.api.deps import CurrentUser
-from app.core.exceptions import ForbiddenException, NotFoundException
-from app.db.session import get_db
-from app.models.transaction import TransactionType
-from app.repositories.transaction_repo import TransactionRepository
-from app.schemas.common import MessageResponse, PaginatedResponse
-from app.schemas.transaction import TransactionCreate, TransactionRead, TransactionUpdate
+from app.api.deps import DB, CurrentPrincipal, ReadDB, ReadSessionMaker
+from app.config import get_settings
+from app.core.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.transaction import Transaction, TransactionType
+from app.repositories.category_repo import CategoryRepository
+from app.repositories.transaction_repo import TransactionKey, TransactionRepository
+from app.schemas.common import CursorPaginatedResponse, MessageResponse, PaginatedResponse
+from app.schemas.transaction import (
+    ExportFormat,
+    TransactionBatchCreate,
+    TransactionBatchCreated,
+    TransactionBatchError,
+    TransactionBatchResult,
+    TransactionCreate,
+    TransactionRead,
+    TransactionUpdate,
+)
+from app.services.transaction_totals import TotalStrategy, TransactionTotalsService
+
+settings = get_settings()
 
 router = APIRouter(prefix="/transactions", tags=["Transactions"])
 
+EXPORT_COLUMNS = [
+    "id",
+    "transaction_date",
+    "type",
+    "amount",
+    "currency",
+    "description",
+    "category",
+    "created_at",
+]
+
+
+def _encode_transaction_cursor(transaction: Transaction, backwards: bool) -> str:
+    """Build an opaque cursor pointing at a transaction's keyset position."""
+    return encode_cursor({
+        "d": transaction.transaction_date.isoformat(),
+        "c": transaction.created_at.isoformat(),
+        "i": str(transaction.id),
+        "b": backwards,
+    })
+
+
+async def _export_chunks(
+    session_maker: async_sessionmaker[AsyncSession],
+    user_id: uuid.UUID,
+    export_format: ExportFormat,
+    **filters: object,
+) -> AsyncIterator[str]:
+    """Render a user's transactions batch by batch.
+
+    Runs on its own session so the server-side cursor lives exactly as long
+    as the response body is being streamed.
+    """
+    async with session_maker() as session:
+        transaction_repo = TransactionRepository(session)
+        
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if export_format == ExportFormat.CSV:
+            writer.writerow(EXPORT_COLUMNS)
+        
+        async for rows in transaction_repo.stream_by_user(user_id, **filters):
+            for row in rows:
+                values = {
+                    "id": str(row.id),
+                    "transaction_date": row.transaction_date.isoformat(),
+                    "type": row.type.value,
+                    "amount": str(row.amount),
+                    "currency": row.currency,
+                    "description": row.description,
+                    "category": row.category,
+                    "created_at": row.created_at.isoformat(),
+                }
+                if export_format == ExportFormat.CSV:
+                    writer.writerow(values[column] for column in EXPORT_COLUMNS)
+                else:
+                    buffer.write(json.dumps(values, ensure_ascii=False))
+                    buffer.write("\n")
+            
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        
+        # Header-only output for users without transactions
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+def _decode_transaction_cursor(cursor: str) -> tuple[TransactionKey, bool]:
+    """Parse a cursor into its keyset position and direction."""
+    payload = decode_cursor(cursor)
+    try:
+        position = (
+            date.fromisoformat(payload["d"]),
+            datetime.fromisoformat(payload["c"]),
+            uuid.UUID(payload["i"]),
+        )
+        backwards = bool(payload.get("b", False))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    return position, backwards
+
 
 @router.post("", response_model=TransactionRead, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_data: TransactionCreate,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> TransactionRead:
     """Create a new transaction."""
     transaction_repo = TransactionRepository(db)
@@ -40,60 +143,222 @@ async def create_transaction(
     return TransactionRead.model_validate(transaction)
 
 
+@router.post("/batch", response_model=TransactionBatchResult, status_code=status.HTTP_201_CREATED)
+async def create_transactions_batch(
+    batch: TransactionBatchCreate,
+    current_user: CurrentPrincipal,
+    db: DB,
+) -> TransactionBatchResult:
+    """Create many transactions in one request.
+
+    Valid items are written with multi-row inserts inside the request's
+    transaction; invalid items are skipped and reported by index.
+    """
+    transaction_repo = TransactionRepository(db)
+    category_repo = CategoryRepository(db)
+    
+    valid: list[tuple[int, TransactionCreate]] = []
+    errors: list[TransactionBatchError] = []
+    
+    for index, item in enumerate(batch.items):
+        try:
+            valid.append((index, TransactionCreate.model_validate(item)))
+        except pydantic.ValidationError as exc:
+            errors.append(TransactionBatchError(
+                index=index,
+                errors=[
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in exc.errors()
+                ],
+            ))
+    
+    # Resolve every referenced category with a single query
+    category_ids = {data.category_id for _, data in valid if data.category_id}
+    allowed_ids = await category_repo.get_accessible_ids(category_ids, current_user.id)
+    
+    rows = []
+    indexes = []
+    for index, data in valid:
+        if data.category_id and data.category_id not in allowed_ids:
+            errors.append(TransactionBatchError(index=index, errors=["category_id: Category not found"]))
+            continue
+        
+        rows.append({
+            "user_id": current_user.id,
+            "type": data.type,
+            "amount": data.amount,
+            "currency": data.currency,
+            "description": data.description,
+            "category_id": data.category_id,
+            "transaction_date": data.transaction_date,
+            "raw_message": data.raw_message,
+        })
+        indexes.append(index)
+    
+    ids = await transaction_repo.bulk_create(rows) if rows else []
+    
+    errors.sort(key=lambda error: error.index)
+    
+    return TransactionBatchResult(
+        created=[TransactionBatchCreated(index=i, id=id_) for i, id_ in zip(indexes, ids)],
+        errors=errors,
+    )
+
+
 @router.get("", response_model=PaginatedResponse[TransactionRead])
 async def list_transactions(
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    read_session_maker: ReadSessionMaker,
+    db: ReadDB,
     page: int = Query(1, ge=1),
     page_size: int = Query(50, ge=1, le=100),
     type: TransactionType | None = None,
     category_id: uuid.UUID | None = None,
     start_date: date | None = None,
     end_date: date | None = None,
+    total: TotalStrategy | None = Query(
+        None,
+        description="How to compute the total; 'none' skips it and relies on has_more",
+    ),
 ) -> PaginatedResponse[TransactionRead]:
     """List transactions with filters and pagination."""
     transaction_repo = TransactionRepository(db)
+    totals_service = TransactionTotalsService(read_session_maker)
+    
+    strategy = total or TotalStrategy(settings.transaction_count_strategy)
     
     # Calculate skip
     skip = (page - 1) * page_size
     
-    # Get transactions
-    transactions = await transaction_repo.get_by_user(
-        user_id=current_user.id,
-        skip=skip,
-        limit=page_size,
-        transaction_type=type,
-        category_id=category_id,
-        start_date=start_date,
-        end_date=end_date,
+    filters = {
+        "transaction_type": type,
+        "category_id": category_id,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    
+    # Fetch one extra row to learn whether another page exists, and count
+    # concurrently on a separate session
+    transactions, total_count = await asyncio.gather(
+        transaction_repo.get_by_user(
+            user_id=current_user.id,
+            skip=skip,
+            limit=page_size + 1,
+            **filters,
+        ),
+        totals_service.count(strategy, current_user.id, **filters),
     )
     
-    # Get total count
-    total = await transaction_repo.count_by_user(
+    has_more = len(transactions) > page_size
+    transactions = transactions[:page_size]
+    
+    # Calculate total pages
+    total_pages = None
+    if total_count is not None:
+        total_pages = (total_count + page_size - 1) // page_size
+    
+    return PaginatedResponse(
+        items=[TransactionRead.model_validate(t) for t in transactions],
+        total=total_count,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+        has_more=has_more,
+    )
+
+
+@router.get("/cursor", response_model=CursorPaginatedResponse[TransactionRead])
+async def list_transactions_by_cursor(
+    current_user: CurrentPrincipal,
+    db: ReadDB,
+    cursor: str | None = None,
+    page_size: int = Query(50, ge=1, le=100),
+    type: TransactionType | None = None,
+    category_id: uuid.UUID | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> CursorPaginatedResponse[TransactionRead]:
+    """List transactions with keyset (cursor) pagination.
+
+    Unlike offset pagination, every page costs the same no matter how deep it is,
+    and rows sharing a date are never repeated or skipped between pages.
+    """
+    transaction_repo = TransactionRepository(db)
+    
+    position = None
+    backwards = False
+    if cursor:
+        try:
+            position, backwards = _decode_transaction_cursor(cursor)
+        except ValueError:
+            raise BadRequestException("Invalid cursor")
+    
+    transactions, has_more = await transaction_repo.get_by_user_keyset(
         user_id=current_user.id,
+        limit=page_size,
+        position=position,
+        backwards=backwards,
         transaction_type=type,
         category_id=category_id,
         start_date=start_date,
         end_date=end_date,
     )
     
-    # Calculate total pages
-    total_pages = (total + page_size - 1) // page_size
+    # Coming from a cursor means there is a page on the side we came from
+    has_next = position is not None if backwards else has_more
+    has_prev = has_more if backwards else position is not None
     
-    return PaginatedResponse(
+    next_cursor = None
+    prev_cursor = None
+    if transactions:
+        if has_next:
+            next_cursor = _encode_transaction_cursor(transactions[-1], backwards=False)
+        if has_prev:
+            prev_cursor = _encode_transaction_cursor(transactions[0], backwards=True)
+    
+    return CursorPaginatedResponse(
         items=[TransactionRead.model_validate(t) for t in transactions],
-        total=total,
-        page=page,
         page_size=page_size,
-        total_pages=total_pages,
+        next_cursor=next_cursor,
+        prev_cursor=prev_cursor,
+    )
+
+
+@router.get("/export")
+async def export_transactions(
+    current_user: CurrentPrincipal,
+    read_session_maker: ReadSessionMaker,
+    format: ExportFormat = ExportFormat.CSV,
+    type: TransactionType | None = None,
+    category_id: uuid.UUID | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+) -> StreamingResponse:
+    """Export transactions as CSV or NDJSON, streamed with constant memory."""
+    media_type = "text/csv" if format == ExportFormat.CSV else "application/x-ndjson"
+    
+    return StreamingResponse(
+        _export_chunks(
+            read_session_maker,
+            current_user.id,
+            format,
+            transaction_type=type,
+            category_id=category_id,
+            start_date=start_date,
+            end_date=end_date,
+        ),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{format.value}"',
+        },
     )
 
 
 @router.get("/{transaction_id}", response_model=TransactionRead)
 async def get_transaction(
     transaction_id: uuid.UUID,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: ReadDB,
 ) -> TransactionRead:
     """Get a single transaction by ID."""
     transaction_repo = TransactionRepository(db)
@@ -109,8 +374,8 @@ async def get_transaction(
 async def update_transaction(
     transaction_id: uuid.UUID,
     transaction_data: TransactionUpdate,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> TransactionRead:
     """Update a transaction."""
     transaction_repo = TransactionRepository(db)
@@ -134,8 +399,8 @@ async def update_transaction(
 @router.delete("/{transaction_id}", response_model=MessageResponse)
 async def delete_transaction(
     transaction_id: uuid.UUID,
-    current_user: CurrentUser,
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> MessageResponse:
     """Delete a transaction."""
     transaction_repo = TransactionRepository(db)
@@ -1,11 +1,9 @@
 """Users API router."""
 from typing import Any
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter
 
-from app.api.deps import get_current_user, get_db
-from app.models.user import User
+from app.api.deps import DB, CurrentPrincipal
 from app.services.user_service import UserService
 
 router = APIRouter()
@@ -13,8 +11,8 @@ router = APIRouter()
 
 @router.post("/link/code")
 async def generate_link_code(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: CurrentPrincipal,
+    db: DB,
 ) -> dict[str, str]:
     """Generate a code to link Telegram account."""
     user_service = UserService(db)
@@ -1,9 +1,15 @@
 """Telegram bot application with backend integration."""
 
+import asyncio
+import functools
 import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable
 from decimal import Decimal
 from typing import Any
 
+from prometheus_client import start_http_server
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 from telegram.ext import (
     Application,
@@ -18,8 +24,14 @@ from app.bot.handlers.link import link_command
 from app.bot.parsers import ExpenseParser
 from app.bot.services import BotService
 from app.config import get_settings
-from app.db.session import async_session_maker
+from app.core.metrics import bot_handler_duration, category_assignments
+from app.core.redis import close_redis, init_redis
+from app.db.query_stats import track_queries
+from app.db.routing import read_session
+from app.db.session import async_session_maker, unit_of_work
 from app.models.transaction import TransactionType
+from app.repositories.category_keywords import category_keywords
+from app.repositories.system_categories import system_categories
 
 settings = get_settings()
 
@@ -31,7 +43,45 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Initialize parser
-expense_parser = ExpenseParser()
+expense_parser = ExpenseParser(category_keywords)
+
+
+Handler = Callable[[Update, ContextTypes.DEFAULT_TYPE], Awaitable[None]]
+
+
+def instrumented(handler: Handler) -> Handler:
+    """Measure each update a handler processes.
+
+    Latency goes to the handler histogram; the SQL query count and database
+    time are logged when query stats are enabled.
+    """
+    @functools.wraps(handler)
+    async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        outcome = "error"
+        started = time.perf_counter()
+        with track_queries() as stats:
+            try:
+                await handler(update, context)
+                outcome = "ok"
+            finally:
+                duration = time.perf_counter() - started
+                bot_handler_duration.labels(handler.__name__, outcome).observe(duration)
+                if settings.query_stats_enabled:
+                    fields = stats.as_log_fields()
+                    logger.info(
+                        "%s: %d queries, %.1f ms in db",
+                        handler.__name__,
+                        fields["db_queries"],
+                        fields["db_time_ms"],
+                        extra={
+                            "handler": handler.__name__,
+                            "update_id": update.update_id,
+                            "duration_ms": round(duration * 1000, 3),
+                            **fields,
+                        },
+                    )
+    
+    return wrapper
 
 
 async def get_bot_service() -> BotService:
@@ -47,7 +97,7 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     # Register/get user
     async with async_session_maker() as session:
         bot_service = BotService(session)
-        db_user = await bot_service.get_or_create_user(
+        await bot_service.resolve_user_id(
             telegram_id=user.id,
             username=user.username,
             first_name=user.first_name,
@@ -82,6 +132,7 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         "*Quick Tips:*\n"
         "• Send `50 lunch` to log \\$50 expense\n"
         "• Use `\\+100 salary` for income\n"
+        "• Send several lines to log one transaction per line\n"
         "• Currency: MXN\n"
     )
     
@@ -97,13 +148,14 @@ async def report_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     
     async with async_session_maker() as session:
         bot_service = BotService(session)
-        db_user = await bot_service.get_or_create_user(
+        user_id = await bot_service.resolve_user_id(
             telegram_id=user.id,
             username=user.username,
             first_name=user.first_name,
         )
         
-        summary = await bot_service.get_month_summary(db_user.id)
+        async with read_session(user_id) as read_db:
+            summary = await BotService(session, read_db).get_month_summary(user_id)
     
     # Helper function to escape for MarkdownV2
     def escape_md(text: str) -> str:
@@ -148,13 +200,14 @@ async def categories_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     
     async with async_session_maker() as session:
         bot_service = BotService(session)
-        db_user = await bot_service.get_or_create_user(
+        user_id = await bot_service.resolve_user_id(
             telegram_id=user.id,
             username=user.username,
             first_name=user.first_name,
         )
         
-        categories = await bot_service.get_categories(db_user.id)
+        async with read_session(user_id) as read_db:
+            categories = await BotService(session, read_db).get_categories(user_id)
     
     # Group by type
     expense_cats = [c for c in categories if c.type == TransactionType.EXPENSE]
@@ -190,11 +243,16 @@ async def settings_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     
     async with async_session_maker() as session:
         bot_service = BotService(session)
-        db_user = await bot_service.get_or_create_user(
+        user_id = await bot_service.resolve_user_id(
             telegram_id=user.id,
             username=user.username,
             first_name=user.first_name,
         )
+        db_user = await bot_service.get_user(user_id)
+    
+    if db_user is None:
+        await update.message.reply_text("❌ Could not load your settings. Please try again.")
+        return
     
     settings_text = (
         f"*⚙️ Your Settings*\n\n"
@@ -215,6 +273,12 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     user = update.effective_user
     text = update.message.text
     
+    # One transaction per line
+    lines = [line for line in text.splitlines() if line.strip()]
+    if len(lines) > 1:
+        await handle_lines(update, lines)
+        return
+    
     # Parse message
     parsed = expense_parser.parse(text)
     
@@ -227,103 +291,81 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_text(response, parse_mode="MarkdownV2")
         return
     
-    # Get/create user
+    # Resolve the user and category from caches, then write and commit; replies
+    # are sent after the block so no transaction stays open across Telegram calls
     async with async_session_maker() as session:
-        bot_service = BotService(session)
-        db_user = await bot_service.get_or_create_user(
+        ingestion = await BotService(session).ingest(
             telegram_id=user.id,
             username=user.username,
             first_name=user.first_name,
+            parsed=parsed,
+            raw_message=text,
         )
+    logger.debug(
+        "Ingested message: %s",
+        ingestion.timings,
+        extra={
+            "update_id": update.update_id,
+            "source": ingestion.source,
+            "stages_ms": ingestion.timings,
+        },
+    )
+    categories = ingestion.choices
+    matched_category = ingestion.category
+    
+    # Show category picker if no match
+    if ingestion.transaction_id is None:
+        # Store transaction data for callback
+        context.user_data['pending_transaction'] = {
+            'type': parsed.type.value,
+            'amount': str(parsed.amount),
+            'description': parsed.description,
+            'raw_message': text,
+        }
         
-        # Try to find category if hint exists
-        category_id = None
-        matched_category = None
-        
-        if parsed.category_hint:
-            matched_category = await bot_service.find_category_by_keyword(
-                user_id=db_user.id,
-                keyword=parsed.category_hint,
-                transaction_type=parsed.type,
-            )
-            if matched_category:
-                category_id = matched_category.id
-        
-        # Show category picker if no match
-        if not category_id:
-            categories = await bot_service.get_categories(db_user.id, parsed.type)
-            
-            if not categories:
-                # No categories available, create without category
-                transaction = await bot_service.create_transaction(
-                    user_id=db_user.id,
-                    transaction_type=parsed.type,
-                    amount=parsed.amount,
-                    description=parsed.description,
-                    category_id=None,
-                    raw_message=text,
-                )
-                
-                type_emoji = "💸" if parsed.type == TransactionType.EXPENSE else "💰"
-                safe_desc = parsed.description.replace('-', '\\-').replace('.', '\\.')
-                response = (
-                    f"✅ {type_emoji} Logged\\!\n\n"
-                    f"Amount: \\${parsed.amount}\n"
-                    f"Description: {safe_desc}\n"
-                    f"Type: {parsed.type.value}\n"
-                    f"⚠️ No category \\(run /start to load categories\\)"
-                )
-                await update.message.reply_text(response, parse_mode="MarkdownV2")
-                return
-            
-            # Store transaction data for callback
-            context.user_data['pending_transaction'] = {
-                'type': parsed.type.value,
-                'amount': str(parsed.amount),
-                'description': parsed.description,
-                'raw_message': text,
-            }
-            
-            # Create inline keyboard (limit to 20 for better UX)
-            keyboard = []
-            for cat in categories[:20]:
-                keyboard.append([
-                    InlineKeyboardButton(
-                        f"{cat.icon} {cat.name}",
-                        callback_data=f"cat_{cat.id}"
-                    )
-                ])
-            
-            # Add "No category" option
+        # Create inline keyboard (limit to 20 for better UX)
+        keyboard = []
+        for cat in categories[:20]:
             keyboard.append([
-                InlineKeyboardButton("🚫 No category", callback_data="cat_none")
+                InlineKeyboardButton(
+                    f"{cat.icon} {cat.name}",
+                    callback_data=f"cat_{cat.id}"
+                )
             ])
-            
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            type_emoji = "💸" if parsed.type == TransactionType.EXPENSE else "💰"
-            await update.message.reply_text(
-                f"{type_emoji} Select category for:\n"
-                f"${parsed.amount} - {parsed.description}",
-                reply_markup=reply_markup,
-            )
-            return
         
-        # Create transaction with auto-detected category
-        transaction = await bot_service.create_transaction(
-            user_id=db_user.id,
-            transaction_type=parsed.type,
-            amount=parsed.amount,
-            description=parsed.description,
-            category_id=category_id,
-            raw_message=text,
+        # Add "No category" option
+        keyboard.append([
+            InlineKeyboardButton("🚫 No category", callback_data="cat_none")
+        ])
+        
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        type_emoji = "💸" if parsed.type == TransactionType.EXPENSE else "💰"
+        await update.message.reply_text(
+            f"{type_emoji} Select category for:\n"
+            f"${parsed.amount} - {parsed.description}",
+            reply_markup=reply_markup,
         )
+        return
+    
+    if not matched_category:
+        # No categories available, logged without category
+        type_emoji = "💸" if parsed.type == TransactionType.EXPENSE else "💰"
+        safe_desc = parsed.description.replace('-', '\\-').replace('.', '\\.')
+        response = (
+            f"✅ {type_emoji} Logged\\!\n\n"
+            f"Amount: \\${parsed.amount}\n"
+            f"Description: {safe_desc}\n"
+            f"Type: {parsed.type.value}\n"
+            f"⚠️ No category \\(run /start to load categories\\)"
+        )
+        await update.message.reply_text(response, parse_mode="MarkdownV2")
+        return
     
     # Send confirmation
     type_emoji = "💸" if parsed.type == TransactionType.EXPENSE else "💰"
     safe_desc = parsed.description.replace('-', '\\-').replace('.', '\\.')
-    cat_name = matched_category.name if matched_category else "None"
-    safe_cat = cat_name.replace('-', '\\-').replace('.', '\\.')
+    safe_cat = matched_category.name.replace('-', '\\-').replace('.', '\\.')
     
     response = (
         f"✅ {type_emoji} Logged\\!\n\n"
@@ -335,6 +377,71 @@ async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     await update.message.reply_text(response, parse_mode="MarkdownV2")
 
 
+async def handle_lines(update: Update, lines: list[str]) -> None:
+    """Log a multi-line message, one transaction per line, in a single INSERT.
+
+    Lines are categorized from their keywords, or else from confident
+    suggestions learned from the user's history; there is no picker, so
+    the rest are logged without a category. Lines that can't be parsed
+    are skipped and reported.
+    """
+    user = update.effective_user
+    parsed_lines = expense_parser.parse_many(lines)
+    
+    async with unit_of_work() as session:
+        bot_service = BotService(session, autocommit=False)
+        
+        async def log_lines(user_id: uuid.UUID) -> list[dict]:
+            rows = []
+            categories = await bot_service.get_category_snapshots(user_id)
+            for line, parsed in zip(lines, parsed_lines):
+                if not parsed:
+                    continue
+                candidates = [c for c in categories if c.type == parsed.type]
+                category = None
+                source = "keyword"
+                if parsed.category_hint:
+                    category = bot_service.match_category(candidates, parsed.category_hint)
+                if not category and candidates:
+                    suggestion = await bot_service.suggest_categories(
+                        user_id, parsed.description, candidates
+                    )
+                    category = suggestion.confident
+                    source = "learned"
+                category_assignments.labels(source if category else "none").inc()
+                rows.append({
+                    "type": parsed.type,
+                    "amount": parsed.amount,
+                    "description": parsed.description,
+                    "category_id": category.id if category else None,
+                    "raw_message": line,
+                })
+            
+            if rows:
+                await bot_service.create_transactions(user_id, rows)
+            return rows
+        
+        rows = await bot_service.as_telegram_user(
+            telegram_id=user.id,
+            username=user.username,
+            first_name=user.first_name,
+            work=log_lines,
+        )
+    
+    skipped = [line for line, parsed in zip(lines, parsed_lines) if not parsed]
+    response = [f"✅ Logged {len(rows)} of {len(lines)} transactions"]
+    response += [
+        f"{'💸' if row['type'] == TransactionType.EXPENSE else '💰'} "
+        f"${row['amount']} - {row['description']}"
+        for row in rows
+    ]
+    if skipped:
+        response.append("\n❌ Couldn't understand:")
+        response += skipped
+    
+    await update.message.reply_text("\n".join(response))
+
+
 async def category_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handle category selection from inline keyboard."""
     query = update.callback_query
@@ -352,24 +459,23 @@ async def category_callback(update: Update, context: ContextTypes.DEFAULT_TYPE)
     # Handle "no category" selection
     category_id = None
     if callback_data != "cat_none":
-        category_id = callback_data.replace("cat_", "")
+        category_id = uuid.UUID(callback_data.removeprefix("cat_"))
     
-    # Create transaction
-    async with async_session_maker() as session:
-        bot_service = BotService(session)
-        db_user = await bot_service.get_or_create_user(
+    # Create the transaction in one commit
+    async with unit_of_work() as session:
+        bot_service = BotService(session, autocommit=False)
+        await bot_service.as_telegram_user(
             telegram_id=user.id,
             username=user.username,
             first_name=user.first_name,
-        )
-        
-        transaction = await bot_service.create_transaction(
-            user_id=db_user.id,
-            transaction_type=TransactionType(pending['type']),
-            amount=Decimal(pending['amount']),
-            description=pending['description'],
-            category_id=category_id,
-            raw_message=pending.get('raw_message'),
+            work=functools.partial(
+                bot_service.create_transaction,
+                transaction_type=TransactionType(pending['type']),
+                amount=Decimal(pending['amount']),
+                description=pending['description'],
+                category_id=category_id,
+                raw_message=pending.get('raw_message'),
+            ),
         )
     
     # Clear pending data
@@ -404,19 +510,19 @@ def create_application() -> Application:
     )
     
     # Add command handlers
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("help", help_command))
-    application.add_handler(CommandHandler("report", report_command))
-    application.add_handler(CommandHandler("categories", categories_command))
-    application.add_handler(CommandHandler("settings", settings_command))
-    application.add_handler(CommandHandler("link", link_command))
+    application.add_handler(CommandHandler("start", instrumented(start_command)))
+    application.add_handler(CommandHandler("help", instrumented(help_command)))
+    application.add_handler(CommandHandler("report", instrumented(report_command)))
+    application.add_handler(CommandHandler("categories", instrumented(categories_command)))
+    application.add_handler(CommandHandler("settings", instrumented(settings_command)))
+    application.add_handler(CommandHandler("link", instrumented(link_command)))
     
     # Add callback query handler for category selection
-    application.add_handler(CallbackQueryHandler(category_callback, pattern=r"^cat_"))
+    application.add_handler(CallbackQueryHandler(instrumented(category_callback), pattern=r"^cat_"))
     
     # Add message handler for regular text
     application.add_handler(
-        MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message)
+        MessageHandler(filters.TEXT & ~filters.COMMAND, instrumented(handle_message))
     )
     
     # Add error handler
@@ -432,8 +538,16 @@ async def run_polling():
     
     logger.info("Starting bot with polling...")
     
+    if settings.metrics_enabled and settings.bot_metrics_port:
+        start_http_server(settings.bot_metrics_port)
+        logger.info("Serving metrics on port %d", settings.bot_metrics_port)
+    
     # Run the application with polling
     async with application:
+        await init_redis()
+        await system_categories.preload()
+        await category_keywords.refresh()
+        keyword_watcher = asyncio.create_task(category_keywords.watch())
         await application.start()
         logger.info("✅ Bot is running! Press Ctrl+C to stop.")
         await application.updater.start_polling()
@@ -450,9 +564,12 @@ async def run_polling():
         signal.signal(signal.SIGTERM, signal_handler)
         
         await stop.wait()
+        
+        keyword_watcher.cancel()
+        await application.updater.stop()
+        await application.stop()
+        await close_redis()
 
 
 if __name__ == "__main__":
-    import asyncio
-    
     asyncio.run(run_polling())
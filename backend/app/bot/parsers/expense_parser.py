@@ -1,12 +1,28 @@
 """Natural language expense parser."""
 
+import functools
 import re
+from collections import Counter
+from collections.abc import Iterable
 from dataclasses import dataclass
-from datetime import date
 from decimal import Decimal
 
+from app.core.keyword_index import BUNDLED_KEYWORDS_FILE, KeywordSource, StaticKeywords
+from app.core.metrics import parsed_messages
 from app.models.transaction import TransactionType
 
+# Counters by parse result, resolved once instead of per message
+_RESULT_COUNTERS = {
+    result: parsed_messages.labels(result.value if result else "failed")
+    for result in (TransactionType.INCOME, TransactionType.EXPENSE, None)
+}
+
+
+@functools.cache
+def bundled_keywords() -> StaticKeywords:
+    """The bundled keyword dictionary, for parsers not given a live one."""
+    return StaticKeywords.from_file(BUNDLED_KEYWORDS_FILE)
+
 
 @dataclass
 class ParsedTransaction:
@@ -20,120 +36,85 @@ class ParsedTransaction:
 
 
 class ExpenseParser:
-    """Parse natural language expense/income messages."""
-
-    # Expense patterns (English)
-    EXPENSE_PATTERNS_EN = [
-        r"^(\d+(?:\.\d{2})?)\s+(.+)$",  # "50 lunch"
-        r"^\$(\d+(?:\.\d{2})?)\s+(.+)$",  # "$50 lunch"
-        r"^spent\s+(\d+(?:\.\d{2})?)\s+(?:on\s+)?(.+)$",  # "spent 50 on lunch"
-    ]
-
-    # Expense patterns (Spanish)
-    EXPENSE_PATTERNS_ES = [
-        r"^(\d+(?:\.\d{2})?)\s+(.+)$",  # "50 comida"
-        r"^\$(\d+(?:\.\d{2})?)\s+(.+)$",  # "$50 comida"
-        r"^gasté\s+(\d+(?:\.\d{2})?)\s+(?:en\s+)?(.+)$",  # "gasté 50 en comida"
-    ]
-
-    # Income patterns (English)
-    INCOME_PATTERNS_EN = [
-        r"^\+(\d+(?:\.\d{2})?)\s+(.+)$",  # "+1000 salary"
-        r"^income\s+(\d+(?:\.\d{2})?)\s+(.+)$",  # "income 1000 salary"
-        r"^earned\s+(\d+(?:\.\d{2})?)\s+(?:from\s+)?(.+)$",  # "earned 1000 from salary"
-    ]
-
-    # Income patterns (Spanish)
-    INCOME_PATTERNS_ES = [
-        r"^\+(\d+(?:\.\d{2})?)\s+(.+)$",  # "+1000 salario"
-        r"^ingreso\s+(\d+(?:\.\d{2})?)\s+(.+)$",  # "ingreso 1000 salario"
-        r"^gané\s+(\d+(?:\.\d{2})?)\s+(?:de\s+)?(.+)$",  # "gané 1000 de salario"
-    ]
-
-    # Category keywords (English)
-    CATEGORY_KEYWORDS_EN = {
-        "food": ["lunch", "dinner", "breakfast", "food", "restaurant", "cafe"],
-        "transport": ["uber", "taxi", "bus", "metro", "gas", "fuel"],
-        "shopping": ["shopping", "clothes", "amazon", "store"],
-        "entertainment": ["movie", "cinema", "game", "concert", "netflix"],
-    }
-
-    # Category keywords (Spanish)
-    CATEGORY_KEYWORDS_ES = {
-        "food": ["almuerzo", "cena", "desayuno", "comida", "restaurante", "café"],
-        "transport": ["uber", "taxi", "autobús", "metro", "gasolina"],
-        "shopping": ["compras", "ropa", "tienda"],
-        "entertainment": ["película", "cine", "juego", "concierto"],
-    }
+    """Parse natural language expense/income messages.
+
+    All message forms share one precompiled pattern, so parsing is a single
+    regex match however many forms (and languages) are supported:
+
+    - expenses: "50 lunch", "$50 lunch", "spent 50 on lunch", "gasté 50 en comida"
+    - income: "+1000 salary", "income 1000 salary", "ingreso 1000 salario",
+      "earned 1000 from salary", "gané 1000 de salario"
+    """
+
+    # The prefix decides the type; a preposition is only skipped after the
+    # verb it belongs to ("spent 50 on lunch", but "50 on the way" keeps it)
+    PATTERN = re.compile(
+        r"""
+        ^(?:
+            (?P<plus>\+)
+          | (?P<dollar>\$)
+          | (?P<income>income|ingreso)\s+
+          | (?P<earned>earned)\s+
+          | (?P<gane>gané)\s+
+          | (?P<spent>spent)\s+
+          | (?P<gaste>gasté)\s+
+        )?
+        (?P<amount>\d+(?:\.\d{2})?)\s+
+        (?(earned)(?:from\s+)?)
+        (?(gane)(?:de\s+)?)
+        (?(spent)(?:on\s+)?)
+        (?(gaste)(?:en\s+)?)
+        (?P<description>.+)$
+        """,
+        re.IGNORECASE | re.VERBOSE,
+    )
+
+    # Prefix groups that make a message income
+    INCOME_GROUPS = ("plus", "income", "earned", "gane")
+
+    def __init__(self, keywords: KeywordSource | None = None):
+        # Read the index on every use, so a reloadable dictionary's updates
+        # take effect immediately
+        self.keywords = keywords or bundled_keywords()
 
     def parse(self, message: str) -> ParsedTransaction | None:
         """Parse a message into a transaction."""
-        message = message.strip().lower()
+        transaction = self._parse(message)
+        _RESULT_COUNTERS[transaction.type if transaction else None].inc()
+        return transaction
 
-        # Try income patterns first
-        transaction = self._try_parse_income(message)
-        if transaction:
-            return transaction
-
-        # Try expense patterns
-        transaction = self._try_parse_expense(message)
-        if transaction:
-            return transaction
-
-        return None
-
-    def _try_parse_income(self, message: str) -> ParsedTransaction | None:
-        """Try to parse as income."""
-        all_patterns = self.INCOME_PATTERNS_EN + self.INCOME_PATTERNS_ES
-
-        for pattern in all_patterns:
-            match = re.match(pattern, message, re.IGNORECASE)
-            if match:
-                amount_str, description = match.groups()
-                amount = Decimal(amount_str)
-
-                return ParsedTransaction(
-                    type=TransactionType.INCOME,
-                    amount=amount,
-                    description=description.strip(),
-                    category_hint=self._detect_category(description),
-                    raw_message=message,
-                )
-
-        return None
-
-    def _try_parse_expense(self, message: str) -> ParsedTransaction | None:
-        """Try to parse as expense."""
-        all_patterns = self.EXPENSE_PATTERNS_EN + self.EXPENSE_PATTERNS_ES
-
-        for pattern in all_patterns:
-            match = re.match(pattern, message, re.IGNORECASE)
-            if match:
-                amount_str, description = match.groups()
-                amount = Decimal(amount_str)
-
-                return ParsedTransaction(
-                    type=TransactionType.EXPENSE,
-                    amount=amount,
-                    description=description.strip(),
-                    category_hint=self._detect_category(description),
-                    raw_message=message,
-                )
-
-        return None
+    def parse_many(self, messages: Iterable[str]) -> list[ParsedTransaction | None]:
+        """Parse several messages (e.g. the lines of one message), keeping their order.
 
-    def _detect_category(self, description: str) -> str | None:
-        """Detect category from description keywords."""
-        description_lower = description.lower()
+        Messages that can't be parsed give None at their position.
+        """
+        transactions = [self._parse(message) for message in messages]
 
-        # Check English keywords
-        for category, keywords in self.CATEGORY_KEYWORDS_EN.items():
-            if any(keyword in description_lower for keyword in keywords):
-                return category
+        results = Counter(transaction.type if transaction else None for transaction in transactions)
+        for result, count in results.items():
+            _RESULT_COUNTERS[result].inc(count)
 
-        # Check Spanish keywords
-        for category, keywords in self.CATEGORY_KEYWORDS_ES.items():
-            if any(keyword in description_lower for keyword in keywords):
-                return category
+        return transactions
 
-        return None
+    def _parse(self, message: str) -> ParsedTransaction | None:
+        """Parse one message without recording metrics."""
+        message = message.strip().lower()
+
+        match = self.PATTERN.match(message)
+        if not match:
+            return None
+
+        is_income = any(match.group(name) for name in self.INCOME_GROUPS)
+        description = match.group("description")
+
+        return ParsedTransaction(
+            type=TransactionType.INCOME if is_income else TransactionType.EXPENSE,
+            amount=Decimal(match.group("amount")),
+            description=description.strip(),
+            category_hint=self._detect_category(description),
+            raw_message=message,
+        )
+
+    def _detect_category(self, description: str) -> str | None:
+        """Detect category from description keywords (the longest one found wins)."""
+        return self.keywords.index.best(description)
@@ -1,50 +1,225 @@
 """Bot service for backend API integration."""
 
 import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from functools import partial
+from typing import Any, TypeVar
 
 from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.bot.parsers import ParsedTransaction
+from app.core.metrics import StageTimer, bot_ingestion_stage_duration, category_assignments
+from app.db.events import on_commit
 from app.models.category import Category
 from app.models.transaction import Transaction, TransactionType
-from app.models.user import User
 from app.repositories.category_repo import CategoryRepository
+from app.repositories.category_snapshots import CategorySnapshot
 from app.repositories.transaction_repo import TransactionRepository
-from app.repositories.user_repo import UserRepository
+from app.repositories.user_repo import (
+    UserRepository,
+    forget_telegram_user,
+    resolve_telegram_user,
+)
+from app.schemas.user import UserRead
+from app.services.analytics_service import AnalyticsService
+from app.services.suggestion_service import Suggestion, SuggestionService
+
+C = TypeVar("C", Category, CategorySnapshot)
+T = TypeVar("T")
+
+# SQLSTATE of foreign key violations
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def is_missing_user(exc: IntegrityError) -> bool:
+    """Whether a write failed because the user it was for no longer exists."""
+    return (
+        getattr(exc.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION
+        and "user_id" in str(exc.orig)
+    )
+
+# Every transaction logged through the bot is in this currency
+BOT_CURRENCY = "MXN"
+
+
+@dataclass
+class Ingestion:
+    """Outcome of logging a parsed message.
+
+    ``transaction_id`` is None when no category was found and the user has
+    to pick one of ``choices``, ranked by likelihood. ``source`` tells how
+    the category was chosen: keyword, learned, picker or none.
+    """
+
+    user_id: uuid.UUID
+    source: str
+    transaction_id: uuid.UUID | None = None
+    category: CategorySnapshot | None = None
+    choices: list[CategorySnapshot] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
 
 
 class BotService:
-    """Service for bot operations with backend."""
+    """Service for bot operations with backend.
 
-    def __init__(self, db: AsyncSession):
+    Read-only lookups run on ``read_db`` when given (e.g. a replica session),
+    writes always on ``db``. With ``autocommit=False`` writes are only flushed
+    and the caller's unit of work commits them.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: AsyncSession | None = None,
+        autocommit: bool = True,
+    ):
         self.db = db
+        self.read_db = read_db or db
+        self.autocommit = autocommit
         self.user_repo = UserRepository(db)
         self.transaction_repo = TransactionRepository(db)
-        self.category_repo = CategoryRepository(db)
+        self.category_repo = CategoryRepository(self.read_db)
+        self.read_transaction_repo = TransactionRepository(self.read_db)
+        self.analytics_service = AnalyticsService(self.read_db)
+        self.suggestion_service = SuggestionService(self.read_db)
+
+    async def _commit(self) -> None:
+        """Commit unless the caller owns the transaction."""
+        if self.autocommit:
+            await self.db.commit()
 
-    async def get_or_create_user(
+    def _learn_on_commit(
+        self, user_id: uuid.UUID, ids: list[uuid.UUID], rows: list[dict[str, Any]]
+    ) -> None:
+        """Add the categorized rows to the user's suggestion index once they commit."""
+        entries = [(row["description"], row["category_id"]) for row in rows if row.get("category_id")]
+        if entries:
+            on_commit(
+                self.db,
+                ("category_suggestions", *ids),
+                partial(SuggestionService.learn, user_id, entries),
+            )
+
+    async def resolve_user_id(
         self, telegram_id: int, username: str | None, first_name: str | None
-    ) -> User:
-        """Get or create user by Telegram ID."""
-        # Try to get existing user
-        user = await self.user_repo.get_by_telegram_id(telegram_id)
+    ) -> uuid.UUID:
+        """Get the ID of the user with a Telegram ID, creating the user if new.
+
+        Resolved IDs are cached and a new user is committed right away, in its
+        own transaction, so the ID can be used by any session.
+        """
+        display_name = first_name or username or f"User{telegram_id}"
+        return await resolve_telegram_user(telegram_id, display_name)
+
+    async def get_user(self, user_id: uuid.UUID) -> UserRead | None:
+        """Get a user's profile, from the cache when possible."""
+        return await self.user_repo.get_principal(user_id)
+
+    async def as_telegram_user(
+        self,
+        telegram_id: int,
+        username: str | None,
+        first_name: str | None,
+        work: Callable[[uuid.UUID], Awaitable[T]],
+    ) -> T:
+        """Resolve a Telegram user and run ``work`` with their ID.
+
+        Resolutions are checked before use, but the check reads the principal
+        cache, whose local copy can still show a user that another process
+        merged away or deleted moments ago. Writes for that user fail on its
+        foreign key; the session is then rolled back, the resolution dropped
+        and ``work`` runs once more for the user resolved afresh.
+        """
+        user_id = await self.resolve_user_id(telegram_id, username, first_name)
+        try:
+            return await work(user_id)
+        except IntegrityError as exc:
+            if not is_missing_user(exc):
+                raise
         
-        if user:
-            return user
+        await self.db.rollback()
+        await forget_telegram_user(telegram_id, user_id)
+        user_id = await self.resolve_user_id(telegram_id, username, first_name)
+        return await work(user_id)
+
+    async def ingest(
+        self,
+        telegram_id: int,
+        username: str | None,
+        first_name: str | None,
+        parsed: ParsedTransaction,
+        raw_message: str,
+    ) -> Ingestion:
+        """Log a parsed message for a Telegram user, with as few round trips as possible.
+
+        The user and the category come from caches: the Telegram resolution
+        cache, category snapshots and the user's suggestion index. The
+        transaction and its rollup are then written by one statement. When no
+        category is found nothing is written and the ranked choices are
+        returned for the user to pick from. Stage timings are observed in the
+        ingestion histogram and returned in ``timings``.
+        """
+        timer = StageTimer(bot_ingestion_stage_duration)
+        log = partial(self._ingest, parsed=parsed, raw_message=raw_message, timer=timer)
+        return await self.as_telegram_user(telegram_id, username, first_name, log)
+
+    async def _ingest(
+        self,
+        user_id: uuid.UUID,
+        parsed: ParsedTransaction,
+        raw_message: str,
+        timer: StageTimer,
+    ) -> Ingestion:
+        """Categorize and write a parsed message for a resolved user."""
+        timer.mark("resolve_user")
         
-        # Create new user
-        display_name = first_name or username or f"User{telegram_id}"
-        user = await self.user_repo.create_user(
-            email=None,
-            hashed_password=None,
-            display_name=display_name,
-            telegram_id=telegram_id,
-        )
+        categories = await self.category_repo.get_user_category_snapshots(user_id, parsed.type)
+        category = None
+        source = "keyword"
+        choices: list[CategorySnapshot] = []
+        if parsed.category_hint:
+            category = self.match_category(categories, parsed.category_hint)
+        if not category and categories:
+            suggestion = await self.suggestion_service.suggest(user_id, parsed.description, categories)
+            category = suggestion.confident
+            source = "learned"
+            choices = suggestion.ranked
+        timer.mark("categorize")
+        
+        if not category and choices:
+            category_assignments.labels("picker").inc()
+            return Ingestion(user_id=user_id, source="picker", choices=choices, timings=timer.timings)
+        
+        row = {
+            "user_id": user_id,
+            "type": parsed.type,
+            "amount": parsed.amount,
+            "currency": BOT_CURRENCY,
+            "description": parsed.description,
+            "category_id": category.id if category else None,
+            "raw_message": raw_message,
+        }
+        transaction_id = await self.transaction_repo.insert_returning_id(row)
+        self._learn_on_commit(user_id, [transaction_id], [row])
+        timer.mark("insert")
         
-        await self.db.commit()
-        return user
+        await self._commit()
+        timer.mark("commit")
+        
+        source = source if category else "none"
+        category_assignments.labels(source).inc()
+        return Ingestion(
+            user_id=user_id,
+            source=source,
+            transaction_id=transaction_id,
+            category=category,
+            timings=timer.timings,
+        )
 
     async def create_transaction(
         self,
@@ -60,69 +235,75 @@ class BotService:
             user_id=user_id,
             transaction_type=transaction_type,
             amount=float(amount),
-            currency="MXN",
+            currency=BOT_CURRENCY,
             description=description,
             category_id=category_id,
             transaction_date=date.today(),
             raw_message=raw_message,
         )
+        self._learn_on_commit(
+            user_id, [transaction.id], [{"description": description, "category_id": category_id}]
+        )
         
-        await self.db.commit()
-        await self.db.refresh(transaction)
+        await self._commit()
         return transaction
 
+    async def create_transactions(self, user_id: uuid.UUID, rows: list[dict[str, Any]]) -> int:
+        """Create several transactions with one multi-row INSERT.
+
+        Each row holds ``type``, ``amount``, ``description`` and optionally
+        ``category_id`` and ``raw_message``; all are dated today in BOT_CURRENCY.
+        """
+        ids = await self.transaction_repo.bulk_create(
+            [{**row, "user_id": user_id, "currency": BOT_CURRENCY} for row in rows]
+        )
+        self._learn_on_commit(user_id, ids, rows)
+        await self._commit()
+        return len(rows)
+
     async def get_categories(
         self, user_id: uuid.UUID, transaction_type: TransactionType | None = None
     ) -> list[Category]:
         """Get categories for user."""
         return await self.category_repo.get_user_categories(user_id, transaction_type)
 
+    async def get_category_snapshots(
+        self, user_id: uuid.UUID, transaction_type: TransactionType | None = None
+    ) -> list[CategorySnapshot]:
+        """Get snapshots of the user's categories, straight from the caches."""
+        return await self.category_repo.get_user_category_snapshots(user_id, transaction_type)
+
+    async def suggest_categories(
+        self, user_id: uuid.UUID, description: str, categories: list[CategorySnapshot]
+    ) -> Suggestion:
+        """Rank categories by how the user categorized similar descriptions before."""
+        return await self.suggestion_service.suggest(user_id, description, categories)
+
     async def get_month_summary(self, user_id: uuid.UUID) -> dict:
         """Get current month summary."""
         # Get start of current month
         now = datetime.now()
         start_of_month = date(now.year, now.month, 1)
         
-        # Get transactions for this month
-        transactions = await self.transaction_repo.get_by_user(
-            user_id=user_id,
-            start_date=start_of_month,
-            skip=0,
-            limit=1000,
+        # Totals and category breakdown come from one aggregate query, in the
+        # currency the bot logs in
+        summary = await self.analytics_service.get_summary(
+            user_id, BOT_CURRENCY, start_date=start_of_month
         )
         
-        # Calculate totals
-        total_expenses = Decimal(0)
-        total_income = Decimal(0)
-        
-        for t in transactions:
-            if t.type == TransactionType.EXPENSE:
-                total_expenses += Decimal(str(t.amount))
-            elif t.type == TransactionType.INCOME:
-                total_income += Decimal(str(t.amount))
-        
-        # Get category breakdown for expenses
-        expense_by_category = {}
-        for t in transactions:
-            if t.type == TransactionType.EXPENSE and t.category:
-                cat_name = t.category.name
-                expense_by_category[cat_name] = (
-                    expense_by_category.get(cat_name, Decimal(0)) + Decimal(str(t.amount))
-                )
-        
-        # Sort by amount
-        top_categories = sorted(
-            expense_by_category.items(),
-            key=lambda x: x[1],
-            reverse=True,
-        )[:5]
+        # Categories are already sorted by amount
+        top_categories = [
+            (category.name, float(category.total))
+            for category in summary.categories
+            if category.type == TransactionType.EXPENSE and category.name
+        ][:5]
         
         return {
-            "total_expenses": float(total_expenses),
-            "total_income": float(total_income),
-            "balance": float(total_income - total_expenses),
-            "transaction_count": len(transactions),
-            "top_categories": [(name, float(amt)) for name, amt in top_categories],
+            "total_expenses": float(summary.total_expenses),
+            "total_income": float(summary.total_income),
+            "balance": float(summary.balance),
+            "transaction_count": summary.transaction_count,
+            "top_categories": top_categories,
             "period": f"{now.strftime('%B %Y')}",
         }
 
@@ -130,20 +311,15 @@ class BotService:
         self, user_id: uuid.UUID, limit: int = 5
     ) -> list[Transaction]:
         """Get recent transactions."""
-        return await self.transaction_repo.get_by_user(
+        return await self.read_transaction_repo.get_by_user(
             user_id=user_id,
             skip=0,
             limit=limit,
         )
 
-    async def find_category_by_keyword(
-        self, user_id: uuid.UUID, keyword: str, transaction_type: TransactionType
-    ) -> Category | None:
-        """Find category by keyword match."""
-        categories = await self.category_repo.get_user_categories(
-            user_id, transaction_type
-        )
-        
+    @staticmethod
+    def match_category(categories: list[C], keyword: str) -> C | None:
+        """Pick the category whose name matches a keyword, exactly or else partially."""
         keyword_lower = keyword.lower()
         
         # First try exact name match
@@ -31,8 +31,87 @@ class Settings(pydantic_settings.BaseSettings):
     )
     database_echo: bool = False
 
+    # Optional read replica for read-only endpoints; a user's reads stay on the
+    # primary for this long after they write, to cover replication lag
+    database_replica_url: pydantic.PostgresDsn | None = None
+    database_replica_lag_window_seconds: int = 5
+
+    # Connection pool, sized per process (API and bot each get their own)
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30
+    database_pool_recycle_seconds: int = 1800
+    database_pool_pre_ping: bool = True
+
+    # Driver and server session tuning
+    database_statement_cache_size: int = 100
+    database_statement_timeout_ms: int | None = None
+    database_application_name: str | None = None  # defaults to app_name
+
+    # Behind PgBouncer in transaction mode: no prepared statement caching, and
+    # statement_timeout is applied with SET LOCAL at the start of each transaction
+    database_pgbouncer: bool = False
+
+    # Per-request query count and DB time: a Server-Timing header in debug,
+    # structured log fields otherwise
+    query_stats_enabled: bool = True
+
+    # Prometheus metrics, served on side ports away from the public API
+    metrics_enabled: bool = True
+    api_metrics_port: int | None = 9101
+    bot_metrics_port: int | None = 9100
+
+    # Transaction listing totals: exact, estimated, cached or none
+    transaction_count_strategy: Literal["exact", "estimated", "cached", "none"] = "exact"
+    transaction_count_cache_ttl_seconds: int = 300
+    transaction_count_exact_threshold: int = 1000
+
+    # Budget status: cached briefly, dropped on transaction and category writes
+    budget_status_cache_ttl_seconds: int = 60
+
+    # How often each process checks whether system categories were changed
+    system_category_check_interval_seconds: float = 30
+
+    # Keyword dictionary for category hints in bot messages: a JSON file
+    # (the bundled one by default) plus the category_keywords table
+    category_keywords_file: str | None = None
+    category_keywords_reload_seconds: float = 60
+
+    # Per-user category suggestions learned from past transactions: the index
+    # covers the latest history_size categorized ones, and a match is assigned
+    # without asking when its category has min_support uses and min_share of
+    # the votes for the description's words
+    category_suggestion_history_size: int = 500
+    category_suggestion_max_tokens: int = 2000
+    category_suggestion_min_support: int = 3
+    category_suggestion_min_share: float = 0.8
+    category_suggestion_cache_ttl_seconds: int = 86400
+    category_suggestion_local_ttl_seconds: float = 300
+    category_suggestion_local_maxsize: int = 1024
+
+    # Per-user category snapshots: shared in Redis, with a short-lived local copy
+    category_snapshot_cache_ttl_seconds: int = 600
+    category_snapshot_local_ttl_seconds: float = 5
+    category_snapshot_local_maxsize: int = 1024
+
+    # Authenticated-user principals; the local TTL bounds how long a
+    # deactivation made by another process can go unnoticed
+    principal_cache_ttl_seconds: int = 300
+    principal_local_ttl_seconds: float = 10
+    principal_local_maxsize: int = 4096
+    principal_cache_redis: bool = True
+
+    # Telegram ID → user ID for bot updates; dropped when accounts are linked
+    telegram_user_cache_ttl_seconds: int = 86400
+    telegram_user_local_ttl_seconds: float = 60
+    telegram_user_local_maxsize: int = 4096
+
     # Redis
     redis_url: pydantic.RedisDsn = pydantic.Field(default="redis://localhost:6379/0")
+    redis_max_connections: int = 50
+    redis_pool_timeout_seconds: float = 5
+    redis_socket_timeout_seconds: float = 5
+    redis_health_check_interval_seconds: int = 30
 
     # JWT
     jwt_secret_key: str = pydantic.Field(..., min_length=32)
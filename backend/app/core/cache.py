@@ -0,0 +1,276 @@
+"""Cache primitives shared by the application's read paths."""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+import pydantic
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+from app.core.metrics import record_cache_lookup
+from app.core.redis import get_redis_client
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# Cached values belong to a user, known by their ID or, before the user is
+# resolved, by their Telegram ID
+OwnerId = uuid.UUID | int
+
+
+class LocalTTLCache(Generic[K, V]):
+    """Small in-process LRU whose entries also expire after a TTL.
+
+    Meant to sit in front of Redis for hot data. Entries are private to the
+    process, so the TTL bounds how long a write made by another process can go
+    unseen; writes made by this process should ``pop`` the entry directly.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Get a live entry, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """Store an entry, evicting the least recently used one when full."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """Drop an entry if present."""
+        self._entries.pop(key, None)
+
+
+class SingleFlight(Generic[K, V]):
+    """Collapse concurrent loads of the same key into one.
+
+    The first caller for a key runs the load; callers arriving while it is in
+    flight await the same result, or the same exception. Nothing is kept once
+    the load finishes, so this only deduplicates, it does not cache.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[K, asyncio.Future[V]] = {}
+
+    async def run(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        """Return ``load()``'s result, sharing a load already running for ``key``."""
+        future = self._in_flight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+        
+        future = asyncio.ensure_future(load())
+        self._in_flight[key] = future
+        # Forget the load once it finishes, even if our caller is cancelled
+        # first; the load itself goes on for everyone else awaiting it
+        future.add_done_callback(lambda _: self._forget(key, future))
+        return await asyncio.shield(future)
+
+    def _forget(self, key: K, future: asyncio.Future[V]) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+
+
+# Stores a field only if the user's generation is still the one the caller
+# read before computing the value; KEYS: hash, generation; ARGV: generation,
+# field, value, TTL
+_SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+
+class UserScopedCache:
+    """Redis cache whose entries belong to a user and are invalidated together.
+
+    Each user gets one hash per namespace, so a lookup is a single HGET and
+    invalidating everything cached for the user is a single DEL. Redis errors
+    are logged and treated as cache misses so callers fall back to the database.
+
+    Invalidating also bumps a per-user generation. A value computed from the
+    database should be stored with the generation read before computing it, so
+    a value read before a concurrent write committed is not cached after that
+    write's invalidation already ran.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, user_id: OwnerId) -> str:
+        return f"{self.namespace}:{user_id}"
+
+    def _generation_key(self, user_id: OwnerId) -> str:
+        return f"{self.namespace}:{user_id}:generation"
+
+    async def get(self, user_id: OwnerId, field: str) -> Any | None:
+        """Get a cached value, or None on a miss."""
+        try:
+            redis = await get_redis_client()
+            raw = await redis.hget(self._key(user_id), field)
+        except RedisError:
+            logger.warning("Cache read failed for %s", self.namespace, exc_info=True)
+            record_cache_lookup(self.namespace, "redis", hit=False)
+            return None
+        
+        record_cache_lookup(self.namespace, "redis", hit=raw is not None)
+        return json.loads(raw) if raw is not None else None
+
+    async def generation(self, user_id: OwnerId) -> int | None:
+        """The user's current generation, or None if Redis can't be read."""
+        try:
+            redis = await get_redis_client()
+            raw = await redis.get(self._generation_key(user_id))
+        except RedisError:
+            logger.warning("Cache read failed for %s", self.namespace, exc_info=True)
+            return None
+        
+        return int(raw) if raw is not None else 0
+
+    async def set(
+        self, user_id: OwnerId, field: str, value: Any, generation: int | None = None
+    ) -> None:
+        """Store a JSON-serializable value.
+
+        With ``generation``, the value is only stored if the user's entries
+        were not invalidated since that generation was read.
+        """
+        key = self._key(user_id)
+        try:
+            redis = await get_redis_client()
+            if generation is not None:
+                await redis.eval(
+                    _SET_IF_GENERATION,
+                    2,
+                    key,
+                    self._generation_key(user_id),
+                    str(generation),
+                    field,
+                    json.dumps(value),
+                    self.ttl_seconds,
+                )
+                return
+            
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.hset(key, field, json.dumps(value))
+                pipe.expire(key, self.ttl_seconds)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Cache write failed for %s", self.namespace, exc_info=True)
+
+    async def invalidate(self, user_id: OwnerId) -> None:
+        """Drop every entry cached for the user and start a new generation."""
+        generation_key = self._generation_key(user_id)
+        try:
+            redis = await get_redis_client()
+            async with redis.pipeline(transaction=True) as pipe:
+                pipe.delete(self._key(user_id))
+                pipe.incr(generation_key)
+                # Outlives any count still running against the old generation
+                pipe.expire(generation_key, self.ttl_seconds)
+                await pipe.execute()
+        except RedisError:
+            logger.warning("Cache invalidation failed for %s", self.namespace, exc_info=True)
+
+
+class LayeredUserCache(Generic[V]):
+    """One value per user in a local LRU, optionally backed by Redis.
+
+    ``adapter`` converts values to and from JSON for Redis. Invalidating drops
+    Redis and this process's local copy; other processes keep theirs for up
+    to ``local_ttl_seconds``.
+    """
+
+    FIELD = "value"
+
+    def __init__(
+        self,
+        namespace: str,
+        adapter: pydantic.TypeAdapter[V],
+        ttl_seconds: int,
+        local_ttl_seconds: float,
+        local_maxsize: int,
+        shared: bool = True,
+    ):
+        self.namespace = namespace
+        self.adapter = adapter
+        self.local: LocalTTLCache[OwnerId, V] = LocalTTLCache(
+            maxsize=local_maxsize,
+            ttl_seconds=local_ttl_seconds,
+        )
+        self.shared = UserScopedCache(namespace, ttl_seconds=ttl_seconds) if shared else None
+
+    async def get(self, user_id: OwnerId) -> V | None:
+        """Get the user's value, or None on a miss."""
+        value = self.local.get(user_id)
+        record_cache_lookup(self.namespace, "local", hit=value is not None)
+        if value is not None or self.shared is None:
+            return value
+        
+        cached = await self.shared.get(user_id, self.FIELD)
+        if cached is None:
+            return None
+        
+        value = self.adapter.validate_python(cached)
+        self.local.set(user_id, value)
+        return value
+
+    async def set(self, user_id: OwnerId, value: V) -> None:
+        """Store the user's value locally and in Redis."""
+        self.local.set(user_id, value)
+        if self.shared is not None:
+            await self.shared.set(user_id, self.FIELD, self.adapter.dump_python(value, mode="json"))
+
+    async def invalidate(self, user_id: OwnerId) -> None:
+        """Drop the user's value."""
+        self.local.pop(user_id)
+        if self.shared is not None:
+            await self.shared.invalidate(user_id)
+
+
+# Listing totals, dropped whenever the user's transactions change
+transaction_count_cache = UserScopedCache(
+    "transaction_count",
+    ttl_seconds=settings.transaction_count_cache_ttl_seconds,
+)
+
+# Budget status per month, dropped on transaction and category writes
+budget_status_cache = UserScopedCache(
+    "budget_status",
+    ttl_seconds=settings.budget_status_cache_ttl_seconds,
+)
+
+
+async def invalidate_transaction_caches(user_id: uuid.UUID) -> None:
+    """Drop everything cached from a user's transactions."""
+    await transaction_count_cache.invalidate(user_id)
+    await budget_status_cache.invalidate(user_id)
@@ -0,0 +1,135 @@
+"""Multi-keyword index for detecting categories in descriptions."""
+
+import json
+import unicodedata
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+# Shipped with the app: category hint → keywords
+BUNDLED_KEYWORDS_FILE = Path(__file__).with_name("category_keywords.json")
+
+
+def normalize(text: str) -> str:
+    """Casefold and strip accents, so "Café" and "cafe" compare equal."""
+    if text.isascii():
+        return text.lower()
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@dataclass(frozen=True)
+class KeywordHit:
+    """A keyword found in a text."""
+
+    start: int
+    end: int
+    keyword: str
+    category: str
+
+
+class KeywordIndex:
+    """Aho-Corasick automaton over a keyword → category dictionary.
+
+    One pass over a text finds every keyword in it, however many keywords the
+    index holds. Matching is accent- and case-insensitive and only whole words
+    count: "bus" matches "bus ticket" but not "business". Keywords may span
+    several words ("uber eats").
+
+    The index is immutable; build a new one to change the dictionary.
+    """
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]]):
+        # Per state: transitions, failure link, and (keyword, category) outputs
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[str, str]]] = [[]]
+        self.size = 0
+
+        for category, words in keywords.items():
+            for word in words:
+                key = normalize(word.strip())
+                if key:
+                    self._add(key, category)
+
+        self._link()
+
+    def _add(self, key: str, category: str) -> None:
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+
+        # The first category listed for a keyword wins
+        if not any(keyword == key for keyword, _ in self._out[state]):
+            self._out[state].append((key, category))
+            self.size += 1
+
+    def _link(self) -> None:
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(char, 0)
+                self._fail[child] = link if link != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> list[KeywordHit]:
+        """Every whole-word keyword occurrence, in the order they end."""
+        normalized = normalize(text)
+        hits = []
+        state = 0
+        for position, char in enumerate(normalized):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            for keyword, category in self._out[state]:
+                start = position - len(keyword) + 1
+                end = position + 1
+                if _is_boundary(normalized, start - 1) and _is_boundary(normalized, end):
+                    hits.append(KeywordHit(start, end, keyword, category))
+        return hits
+
+    def best(self, text: str) -> str | None:
+        """Category of the longest keyword in the text, the leftmost on ties."""
+        hits = self.find_all(text)
+        if not hits:
+            return None
+        return min(hits, key=lambda hit: (hit.start - hit.end, hit.start)).category
+
+
+def _is_boundary(text: str, index: int) -> bool:
+    """Whether the character at ``index`` (or the edge of the text) ends a word."""
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class KeywordSource(Protocol):
+    """Holder of the current keyword index, read on every use."""
+
+    index: KeywordIndex
+
+
+@dataclass(frozen=True)
+class StaticKeywords:
+    """A keyword index that never changes."""
+
+    index: KeywordIndex
+
+    @classmethod
+    def from_file(cls, path: Path) -> "StaticKeywords":
+        """Index a JSON file mapping each category hint to its keywords."""
+        return cls(KeywordIndex(json.loads(path.read_text(encoding="utf-8"))))
@@ -0,0 +1,92 @@
+"""Prometheus metrics shared by the API and the bot.
+
+Each process keeps its own registry and serves it on a side port, away from
+the public API: ``API_METRICS_PORT`` for the API, ``BOT_METRICS_PORT`` for
+the bot.
+"""
+
+import time
+
+from prometheus_client import Counter, Histogram
+
+# Latency buckets in seconds, from cache hits up to slow imports
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Redis commands are expected to be well under a millisecond
+REDIS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+# Stages of one operation, from in-memory lookups up to a slow commit
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+http_request_duration = Histogram(
+    "centavo_http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+bot_handler_duration = Histogram(
+    "centavo_bot_handler_duration_seconds",
+    "Telegram update handling latency by handler.",
+    ["handler", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+
+redis_command_duration = Histogram(
+    "centavo_redis_command_duration_seconds",
+    "Redis round-trip latency by command; pipelines count as one.",
+    ["command"],
+    buckets=REDIS_BUCKETS,
+)
+
+bot_ingestion_stage_duration = Histogram(
+    "centavo_bot_ingestion_stage_duration_seconds",
+    "Time spent in each stage of logging a bot message.",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+
+cache_requests = Counter(
+    "centavo_cache_requests_total",
+    "Cache lookups by cache, layer (local or redis) and result (hit or miss).",
+    ["cache", "layer", "result"],
+)
+
+parsed_messages = Counter(
+    "centavo_parsed_messages_total",
+    "Messages run through the expense parser, by result.",
+    ["result"],
+)
+
+category_assignments = Counter(
+    "centavo_category_assignments_total",
+    "Bot transactions by how their category was chosen: keyword, learned, picker or none.",
+    ["source"],
+)
+
+
+def record_cache_lookup(cache: str, layer: str, hit: bool) -> None:
+    """Count one cache lookup."""
+    cache_requests.labels(cache, layer, "hit" if hit else "miss").inc()
+
+
+class StageTimer:
+    """Time the consecutive stages of one operation.
+
+    Each ``mark`` closes the stage running since the previous mark (or since
+    the timer was created), observes it in ``histogram`` and keeps it in
+    ``timings``, in milliseconds.
+    """
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.timings: dict[str, float] = {}
+        self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """End a stage."""
+        now = time.perf_counter()
+        seconds = now - self._last
+        self._last = now
+        self.histogram.labels(stage).observe(seconds)
+        self.timings[stage] = round(seconds * 1000, 3)
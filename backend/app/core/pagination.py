@@ -0,0 +1,26 @@
+"""Opaque cursor helpers for keyset pagination."""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+def encode_cursor(payload: dict[str, Any]) -> str:
+    """Encode a cursor payload into an opaque, URL-safe token."""
+    raw = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a cursor token produced by encode_cursor."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+
+    return payload
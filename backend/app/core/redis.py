@@ -1,15 +1,92 @@
 """Redis client configuration."""
-from redis.asyncio import Redis, from_url
+import logging
+import time
+from typing import Any
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import RedisError
 
 from app.config import get_settings
+from app.core.metrics import redis_command_duration
 
 settings = get_settings()
 
+logger = logging.getLogger(__name__)
 
-async def get_redis_client() -> Redis:
-    """Get Redis client instance."""
-    return from_url(
+# One client (and connection pool) per process
+_client: Redis | None = None
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline whose round trip is timed as a single PIPELINE command."""
+
+    async def execute(self, raise_on_error: bool = True) -> list[Any]:
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            redis_command_duration.labels("PIPELINE").observe(time.perf_counter() - started)
+
+
+class InstrumentedRedis(Redis):
+    """Client that records the latency of every command."""
+
+    async def execute_command(self, *args: Any, **options: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            redis_command_duration.labels(str(args[0]).upper()).observe(
+                time.perf_counter() - started
+            )
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> Pipeline:
+        return InstrumentedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+
+
+def _create_client() -> Redis:
+    """Create a client over a bounded pool that waits for a free connection."""
+    pool = BlockingConnectionPool.from_url(
         str(settings.redis_url),
         encoding="utf-8",
         decode_responses=True,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout_seconds,
+        socket_timeout=settings.redis_socket_timeout_seconds,
+        socket_connect_timeout=settings.redis_socket_timeout_seconds,
+        health_check_interval=settings.redis_health_check_interval_seconds,
     )
+    return InstrumentedRedis(connection_pool=pool)
+
+
+async def get_redis_client() -> Redis:
+    """Get Redis client instance.
+
+    Returns the process-wide client, creating it on first use for code that
+    runs outside the application lifespan (scripts, background jobs).
+    """
+    global _client
+    if _client is None:
+        _client = _create_client()
+    return _client
+
+
+async def init_redis() -> None:
+    """Create the shared client at startup and check that Redis answers."""
+    client = await get_redis_client()
+    try:
+        await client.ping()
+    except RedisError:
+        # Caches fail open, so the process can still serve without Redis
+        logger.warning("Redis is not reachable at startup", exc_info=True)
+
+
+async def close_redis() -> None:
+    """Close the shared client and its pool."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
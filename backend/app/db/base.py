@@ -7,9 +7,13 @@ from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
 class Base(DeclarativeBase):
-    """Base class for all database models."""
+    """Base class for all database models.
 
-    pass
+    Server-generated columns (timestamps, SQL defaults) are fetched with
+    RETURNING on INSERT and UPDATE, so writes never need a refresh.
+    """
+
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class TimestampMixin:
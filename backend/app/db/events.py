@@ -0,0 +1,63 @@
+"""Session lifecycle hooks."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+_AFTER_COMMIT_KEY = "after_commit_callbacks"
+
+# Strong references to scheduled callbacks so they are not garbage collected mid-flight
+_background_tasks: set[asyncio.Task[None]] = set()
+
+
+def on_commit(
+    session: AsyncSession,
+    key: Hashable,
+    callback: Callable[[], Awaitable[None]],
+) -> None:
+    """Run a coroutine once the session's current transaction commits.
+
+    Callbacks are deduplicated by ``key`` and discarded on rollback, so a write
+    path can register the same invalidation many times within one transaction.
+    """
+    callbacks = session.sync_session.info.setdefault(_AFTER_COMMIT_KEY, {})
+    callbacks[key] = callback
+
+
+async def _run_callback(callback: Callable[[], Awaitable[None]]) -> None:
+    """Run a commit callback, logging instead of propagating failures."""
+    try:
+        await callback()
+    except Exception:
+        logger.exception("After-commit callback failed")
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_after_commit(session: Session) -> None:
+    """Schedule the callbacks registered for the committed transaction."""
+    callbacks = session.info.pop(_AFTER_COMMIT_KEY, None)
+    if not callbacks:
+        return
+    
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Synchronous sessions (scripts, migrations) never register callbacks
+        return
+    
+    for callback in callbacks.values():
+        task = loop.create_task(_run_callback(callback))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit(session: Session) -> None:
+    """Drop callbacks registered by a transaction that was rolled back."""
+    session.info.pop(_AFTER_COMMIT_KEY, None)
@@ -0,0 +1,104 @@
+"""Connection pool instrumentation."""
+
+import time
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.registry import Collector
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
+
+
+@dataclass
+class CheckoutStats:
+    """Time spent waiting for pooled connections."""
+
+    checkouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    timeouts: int = 0
+
+    def record(self, wait_seconds: float) -> None:
+        """Record one checkout."""
+        self.checkouts += 1
+        self.total_wait_seconds += wait_seconds
+        self.max_wait_seconds = max(self.max_wait_seconds, wait_seconds)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that measures how long each checkout waits.
+
+    The measured time covers queueing for a free connection and, on overflow,
+    opening a new one; pre-ping runs afterwards and is not included.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = CheckoutStats()
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_stats.timeouts += 1
+            raise
+        self.checkout_stats.record(time.perf_counter() - started)
+        return entry
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats
+        return pool
+
+
+class PoolCollector(Collector):
+    """Expose pool usage and checkout waits of named engines as Prometheus metrics."""
+
+    def __init__(self, engines: Mapping[str, AsyncEngine]):
+        self.engines = engines
+
+    def collect(self) -> Iterator[Metric]:
+        size = GaugeMetricFamily(
+            "centavo_db_pool_size", "Configured pool size.", labels=["pool"]
+        )
+        in_use = GaugeMetricFamily(
+            "centavo_db_pool_checked_out", "Connections currently in use.", labels=["pool"]
+        )
+        overflow = GaugeMetricFamily(
+            "centavo_db_pool_overflow", "Connections open beyond the pool size.", labels=["pool"]
+        )
+        max_wait = GaugeMetricFamily(
+            "centavo_db_pool_checkout_max_wait_seconds",
+            "Longest checkout wait since the process started.",
+            labels=["pool"],
+        )
+        checkouts = CounterMetricFamily(
+            "centavo_db_pool_checkouts", "Connection checkouts.", labels=["pool"]
+        )
+        wait = CounterMetricFamily(
+            "centavo_db_pool_checkout_wait_seconds",
+            "Total time spent waiting for connections.",
+            labels=["pool"],
+        )
+        timeouts = CounterMetricFamily(
+            "centavo_db_pool_checkout_timeouts", "Checkouts that timed out.", labels=["pool"]
+        )
+        
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            if not isinstance(pool, InstrumentedQueuePool):
+                continue
+            stats = pool.checkout_stats
+            size.add_metric([name], pool.size())
+            in_use.add_metric([name], pool.checkedout())
+            overflow.add_metric([name], max(pool.overflow(), 0))
+            max_wait.add_metric([name], stats.max_wait_seconds)
+            checkouts.add_metric([name], stats.checkouts)
+            wait.add_metric([name], stats.total_wait_seconds)
+            timeouts.add_metric([name], stats.timeouts)
+        
+        yield from (size, in_use, overflow, max_wait, checkouts, wait, timeouts)
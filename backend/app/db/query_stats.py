@@ -0,0 +1,102 @@
+"""Per-request SQL query counts and timings."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Long statements are cut down before they end up in headers and logs
+STATEMENT_MAX_LENGTH = 500
+
+_START_KEY = "query_stats_started"
+
+
+@dataclass
+class QueryStats:
+    """Queries run while handling one request or Telegram update."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Record one executed statement."""
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def as_log_fields(self) -> dict[str, Any]:
+        """Stats as flat, prefixed fields for structured logging."""
+        slowest = self.slowest_statement
+        if slowest is not None:
+            slowest = " ".join(slowest.split())[:STATEMENT_MAX_LENGTH]
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_seconds * 1000, 3),
+            "db_slowest_ms": round(self.slowest_seconds * 1000, 3),
+            "db_slowest_statement": slowest,
+        }
+
+    def server_timing(self) -> str:
+        """Stats as a ``Server-Timing`` header value."""
+        return (
+            f'db;dur={self.total_seconds * 1000:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.1f}"
+        )
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect stats for every query run inside the block.
+
+    The stats object is shared with tasks started inside the block, since
+    they copy the context with a reference to the same object.
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _before_cursor_execute(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    stats = _current.get()
+    started = conn.info.get(_START_KEY)
+    if stats is not None and started:
+        stats.record(statement, time.perf_counter() - started.pop())
+
+
+def _handle_error(context: ExceptionContext) -> None:
+    # A failed statement never reaches after_cursor_execute
+    started = context.connection.info.get(_START_KEY) if context.connection else None
+    if started:
+        started.pop()
+
+
+def install_query_hooks(engine: AsyncEngine) -> None:
+    """Time every statement an engine runs while stats are being tracked."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
@@ -0,0 +1,66 @@
+"""Routing of reads between the primary and the read replica."""
+
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import partial
+
+import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.core.cache import LayeredUserCache
+from app.db.events import on_commit
+from app.db.session import (
+    async_primary_read_session_maker,
+    async_read_session_maker,
+    replica_engine,
+)
+
+settings = get_settings()
+
+# Users who wrote within the replication lag window
+recent_writers: LayeredUserCache[bool] = LayeredUserCache(
+    "recent_write",
+    pydantic.TypeAdapter(bool),
+    ttl_seconds=settings.database_replica_lag_window_seconds,
+    local_ttl_seconds=settings.database_replica_lag_window_seconds,
+    local_maxsize=4096,
+)
+
+
+async def note_write(user_id: uuid.UUID) -> None:
+    """Keep the user's reads on the primary for the lag window."""
+    if replica_engine is not None:
+        await recent_writers.set(user_id, True)
+
+
+def track_write(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """Note a write by the user once the session's transaction commits."""
+    if replica_engine is not None:
+        on_commit(session, ("recent_write", user_id), partial(note_write, user_id))
+
+
+async def read_session_maker_for(
+    user_id: uuid.UUID, force_primary: bool = False
+) -> async_sessionmaker[AsyncSession]:
+    """Pick the read-only session factory for a user's reads.
+
+    Reads go to the replica unless none is configured, the caller asks for the
+    primary, or the user wrote recently and the replica may not have caught up.
+    """
+    if replica_engine is None or force_primary:
+        return async_primary_read_session_maker
+    
+    if await recent_writers.get(user_id):
+        return async_primary_read_session_maker
+    
+    return async_read_session_maker
+
+
+@asynccontextmanager
+async def read_session(user_id: uuid.UUID, force_primary: bool = False) -> AsyncIterator[AsyncSession]:
+    """Open a session for a user's reads (see ``read_session_maker_for``)."""
+    session_maker = await read_session_maker_for(user_id, force_primary)
+    async with session_maker() as session:
+        yield session
@@ -1,19 +1,81 @@
 """Database session management."""
 
-from collections.abc import AsyncGenerator
+import uuid
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from prometheus_client import REGISTRY
+from sqlalchemy import Connection, event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from app.config import get_settings
+from app.db.pool import InstrumentedQueuePool, PoolCollector
+from app.db.query_stats import install_query_hooks
 
 settings = get_settings()
 
+
+def _connect_args() -> dict[str, Any]:
+    """asyncpg connection arguments from the tuning settings."""
+    server_settings = {
+        "application_name": settings.database_application_name or settings.app_name,
+    }
+    
+    if settings.database_pgbouncer:
+        # Transaction pooling hands each transaction a different server
+        # connection, so prepared statements can't be cached or reused by name
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            "server_settings": server_settings,
+        }
+    
+    if settings.database_statement_timeout_ms is not None:
+        server_settings["statement_timeout"] = str(settings.database_statement_timeout_ms)
+    
+    return {
+        "statement_cache_size": settings.database_statement_cache_size,
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+        "server_settings": server_settings,
+    }
+
+
+def _set_statement_timeout(conn: Connection) -> None:
+    """Apply the statement timeout to the transaction that is starting."""
+    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.database_statement_timeout_ms)}")
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """Create an engine using the pool and driver settings."""
+    engine = create_async_engine(
+        url,
+        echo=settings.database_echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout_seconds,
+        pool_recycle=settings.database_pool_recycle_seconds,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        connect_args=_connect_args(),
+    )
+    if settings.database_pgbouncer and settings.database_statement_timeout_ms is not None:
+        # PgBouncer drops startup parameters it doesn't track, so set the
+        # timeout per transaction instead, where it stays with the server connection
+        event.listen(engine.sync_engine, "begin", _set_statement_timeout)
+    if settings.query_stats_enabled:
+        install_query_hooks(engine)
+    return engine
+
+
 # Create async engine
-engine = create_async_engine(
-    str(settings.database_url),
-    echo=settings.database_echo,
-    pool_pre_ping=True,
-)
+engine = build_engine(str(settings.database_url))
 
 # Create session factory
 async_session_maker = async_sessionmaker(
@@ -22,15 +84,60 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Read replica, if configured; reads fall back to the primary otherwise
+replica_engine = (
+    build_engine(str(settings.database_replica_url)) if settings.database_replica_url else None
+)
+
+# Pool gauges for the metrics port
+pools = {"primary": engine}
+if replica_engine is not None:
+    pools["replica"] = replica_engine
+REGISTRY.register(PoolCollector(pools))
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting async database sessions."""
-    async with async_session_maker() as session:
+
+def read_only(engine: AsyncEngine) -> AsyncEngine:
+    """The same engine and pool, opening every transaction READ ONLY."""
+    return engine.execution_options(postgresql_readonly=True)
+
+
+# Session factories for reads: READ ONLY transactions that are never committed
+async_primary_read_session_maker = async_sessionmaker(
+    read_only(engine),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+async_read_session_maker = async_sessionmaker(
+    read_only(replica_engine or engine),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+@asynccontextmanager
+async def unit_of_work(
+    session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+) -> AsyncIterator[AsyncSession]:
+    """A session whose writes are committed once, when the block exits.
+
+    Repositories only flush; the unit of work commits on success and rolls
+    back if the block raises.
+    """
+    async with session_maker() as session:
         try:
             yield session
             await session.commit()
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
+
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database sessions.
+
+    The session is a unit of work committed when the dependency exits; use it
+    through ``app.api.deps.DB`` so that happens before the response is sent.
+    """
+    async with unit_of_work() as session:
+        yield session
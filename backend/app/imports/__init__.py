@@ -0,0 +1,5 @@
+"""Bank statement import package."""
+
+from app.imports.parsers import StatementParseError, StatementRecord, parse_statement
+
+__all__ = ["StatementParseError", "StatementRecord", "parse_statement"]
@@ -0,0 +1,254 @@
+"""Streaming bank-statement parsers.
+
+Every parser is a generator over a text stream, so a statement is never held in
+memory as a whole. Rows that cannot be parsed are yielded as
+StatementParseError values instead of aborting the import.
+"""
+
+import csv
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import TextIO
+
+from app.models.transaction import TransactionType
+from app.schemas.statement_import import CsvColumnMapping, ImportFormat
+
+MAX_DESCRIPTION_LENGTH = 500
+MAX_AMOUNT = Decimal("9999999999.99")
+DEFAULT_DESCRIPTION = "Imported transaction"
+
+# Values accepted in a CSV type column
+TYPE_ALIASES = {
+    "expense": TransactionType.EXPENSE,
+    "debit": TransactionType.EXPENSE,
+    "gasto": TransactionType.EXPENSE,
+    "income": TransactionType.INCOME,
+    "credit": TransactionType.INCOME,
+    "ingreso": TransactionType.INCOME,
+}
+
+OFX_TAG_PATTERN = re.compile(r"<(/?[A-Za-z0-9.]+)>([^<\r\n]*)")
+QIF_DATE_PATTERN = re.compile(r"^(\d{1,2})[/-](\d{1,2})['/-](\d{2,4})$")
+
+
+@dataclass
+class StatementRecord:
+    """A transaction read from a statement, before category resolution."""
+
+    transaction_date: date
+    type: TransactionType
+    amount: Decimal
+    description: str
+    category: str | None = None
+    # Currency stated by the file, if any
+    currency: str | None = None
+    # Identifies the entry within its file: the bank's FITID when the
+    # format has one, otherwise the line it starts on
+    reference: str = ""
+
+
+@dataclass
+class StatementParseError:
+    """A statement entry that could not be parsed."""
+
+    line: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"Line {self.line}: {self.message}"
+
+
+ParsedEntry = StatementRecord | StatementParseError
+
+
+def parse_statement(
+    stream: TextIO,
+    file_format: ImportFormat,
+    mapping: CsvColumnMapping | None = None,
+) -> Iterator[ParsedEntry]:
+    """Parse a statement stream in the given format."""
+    if file_format == ImportFormat.CSV:
+        return parse_csv(stream, mapping or CsvColumnMapping())
+    if file_format == ImportFormat.OFX:
+        return parse_ofx(stream)
+    return parse_qif(stream)
+
+
+def _parse_amount(value: str, decimal_separator: str = ".") -> Decimal:
+    """Parse a signed amount, tolerating currency symbols and separators."""
+    cleaned = value.strip().replace(" ", "")
+    negative = cleaned.startswith("(") and cleaned.endswith(")")
+    cleaned = cleaned.strip("()").lstrip("$€£")
+    
+    if decimal_separator == ",":
+        cleaned = cleaned.replace(".", "").replace(",", ".")
+    else:
+        cleaned = cleaned.replace(",", "")
+    
+    try:
+        amount = Decimal(cleaned)
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount '{value}'")
+    
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount '{value}'")
+    
+    return -amount if negative else amount
+
+
+def _build_record(
+    transaction_date: date,
+    amount: Decimal,
+    description: str,
+    category: str | None = None,
+    transaction_type: TransactionType | None = None,
+    currency: str | None = None,
+    reference: str = "",
+) -> StatementRecord:
+    """Normalize parsed fields into a record; the sign decides the type if unknown."""
+    if amount == 0:
+        raise ValueError("Amount must not be zero")
+    
+    if transaction_type is None:
+        transaction_type = TransactionType.EXPENSE if amount < 0 else TransactionType.INCOME
+    
+    amount = abs(amount).quantize(Decimal("0.01"))
+    if amount > MAX_AMOUNT:
+        raise ValueError("Amount is too large")
+    
+    return StatementRecord(
+        transaction_date=transaction_date,
+        type=transaction_type,
+        amount=amount,
+        description=(description.strip() or DEFAULT_DESCRIPTION)[:MAX_DESCRIPTION_LENGTH],
+        category=(category or "").strip() or None,
+        currency=(currency or "").strip().upper()[:3] or None,
+        reference=reference,
+    )
+
+
+def parse_csv(stream: TextIO, mapping: CsvColumnMapping) -> Iterator[ParsedEntry]:
+    """Parse a CSV statement with a header row."""
+    reader = csv.DictReader(stream, delimiter=mapping.delimiter)
+    
+    required = [mapping.date, mapping.amount, mapping.description]
+    missing = [column for column in required if column not in (reader.fieldnames or [])]
+    if missing:
+        yield StatementParseError(1, f"Missing columns: {', '.join(missing)}")
+        return
+    
+    for row in reader:
+        line = reader.line_num
+        try:
+            transaction_date = datetime.strptime(
+                (row[mapping.date] or "").strip(), mapping.date_format
+            ).date()
+            amount = _parse_amount(row[mapping.amount] or "", mapping.decimal_separator)
+            
+            transaction_type = mapping.default_type
+            if mapping.type and row.get(mapping.type):
+                alias = row[mapping.type].strip().lower()
+                if alias not in TYPE_ALIASES:
+                    raise ValueError(f"Unknown type '{row[mapping.type]}'")
+                transaction_type = TYPE_ALIASES[alias]
+            if transaction_type is not None:
+                amount = abs(amount)
+            
+            yield _build_record(
+                transaction_date,
+                amount,
+                row[mapping.description] or "",
+                category=row.get(mapping.category) if mapping.category else None,
+                transaction_type=transaction_type,
+                reference=f"line:{line}",
+            )
+        except ValueError as exc:
+            yield StatementParseError(line, str(exc))
+
+
+def _iter_ofx_tags(lines: Iterable[str]) -> Iterator[tuple[int, str, str]]:
+    """Yield (line, tag, value) for every tag in an OFX (SGML or XML) document."""
+    for line_number, line in enumerate(lines, start=1):
+        for tag, value in OFX_TAG_PATTERN.findall(line):
+            yield line_number, tag.upper(), value.strip()
+
+
+def parse_ofx(stream: TextIO) -> Iterator[ParsedEntry]:
+    """Parse the STMTTRN entries of an OFX statement."""
+    fields: dict[str, str] | None = None
+    start_line = 0
+    currency = None
+    
+    for line_number, tag, value in _iter_ofx_tags(stream):
+        if tag == "CURDEF" and fields is None:
+            currency = value
+        elif tag == "STMTTRN":
+            fields = {}
+            start_line = line_number
+        elif tag == "/STMTTRN" and fields is not None:
+            try:
+                posted = fields.get("DTPOSTED", "")
+                transaction_date = datetime.strptime(posted[:8], "%Y%m%d").date()
+                description = " - ".join(
+                    part for part in (fields.get("NAME"), fields.get("MEMO")) if part
+                )
+                yield _build_record(
+                    transaction_date,
+                    _parse_amount(fields.get("TRNAMT", "")),
+                    description,
+                    currency=currency,
+                    reference=f"fitid:{fields['FITID']}" if fields.get("FITID") else f"line:{start_line}",
+                )
+            except ValueError as exc:
+                yield StatementParseError(start_line, str(exc))
+            fields = None
+        elif fields is not None and not tag.startswith("/"):
+            fields[tag] = value
+
+
+def _parse_qif_date(value: str) -> date:
+    """Parse a Quicken date (month first, e.g. 01/31/2024 or 1/31'24)."""
+    match = QIF_DATE_PATTERN.match(value.strip())
+    if not match:
+        raise ValueError(f"Invalid date '{value}'")
+    
+    month, day, year = (int(part) for part in match.groups())
+    if year < 100:
+        year += 2000
+    return date(year, month, day)
+
+
+def parse_qif(stream: TextIO) -> Iterator[ParsedEntry]:
+    """Parse a QIF bank statement."""
+    fields: dict[str, str] = {}
+    start_line = 1
+    
+    for line_number, raw_line in enumerate(stream, start=1):
+        line = raw_line.rstrip("\r\n")
+        if not line or line.startswith("!"):
+            continue
+        
+        code, value = line[0], line[1:]
+        if code != "^":
+            if not fields:
+                start_line = line_number
+            # Split transactions repeat codes; the first occurrence wins
+            fields.setdefault(code, value)
+            continue
+        
+        try:
+            amount = fields.get("T") or fields.get("U") or ""
+            description = " - ".join(part for part in (fields.get("P"), fields.get("M")) if part)
+            yield _build_record(
+                _parse_qif_date(fields.get("D", "")),
+                _parse_amount(amount),
+                description,
+                category=fields.get("L"),
+                reference=f"line:{start_line}",
+            )
+        except ValueError as exc:
+            yield StatementParseError(start_line, str(exc))
+        fields = {}
@@ -5,9 +5,13 @@ from collections.abc import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import start_http_server
 
+from app.api.middleware import MetricsMiddleware, QueryStatsMiddleware
 from app.api.v1.router import router as api_v1_router
 from app.config import get_settings
+from app.core.redis import close_redis, init_redis
+from app.repositories.system_categories import system_categories
 
 settings = get_settings()
 
@@ -17,9 +21,21 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan events."""
     # Startup
     print(f"🚀 {settings.app_name} starting up...")
+    await init_redis()
+    await system_categories.preload()
+    
+    # Metrics, pool gauges included, are served on a side port rather than
+    # on the public API
+    metrics_server = None
+    if settings.metrics_enabled and settings.api_metrics_port:
+        metrics_server, _ = start_http_server(settings.api_metrics_port)
+        print(f"📈 Serving metrics on port {settings.api_metrics_port}")
     yield
     # Shutdown
     print(f"👋 {settings.app_name} shutting down...")
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    await close_redis()
 
 
 # Create FastAPI app
@@ -40,6 +56,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request query stats: a Server-Timing header in debug, log fields otherwise
+if settings.query_stats_enabled:
+    app.add_middleware(QueryStatsMiddleware, server_timing=settings.debug)
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_v1_router, prefix="/api")
 
@@ -1,6 +1,8 @@
 """Models package."""
 
 from app.models.category import Category
+from app.models.category_keyword import CategoryKeyword
+from app.models.monthly_rollup import MonthlyRollup
 from app.models.recurring_transaction import RecurringFrequency, RecurringTransaction
 from app.models.transaction import Transaction, TransactionType
 from app.models.user import User
@@ -10,6 +12,8 @@ __all__ = [
     "Transaction",
     "TransactionType",
     "Category",
+    "CategoryKeyword",
+    "MonthlyRollup",
     "RecurringTransaction",
     "RecurringFrequency",
 ]
@@ -0,0 +1,25 @@
+"""Category keyword model."""
+
+import uuid
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base, TimestampMixin
+
+
+class CategoryKeyword(Base, TimestampMixin):
+    """A word or merchant name that hints at a category in bot messages.
+
+    Extends the keyword file bundled with the parser; entries here win over
+    the file when both list the same keyword.
+    """
+
+    __tablename__ = "category_keywords"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    keyword: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    category_hint: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CategoryKeyword(keyword={self.keyword}, category_hint={self.category_hint})>"
@@ -0,0 +1,57 @@
+"""Monthly rollup model."""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Index, Integer, Numeric, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.models.transaction import TransactionType
+
+
+class MonthlyRollup(Base):
+    """Precomputed sum and count of a user's transactions per month.
+
+    One row per (user, month, type, category, currency), maintained in the same
+    database transaction as every write to ``transactions``.
+    """
+
+    __tablename__ = "monthly_rollups"
+
+    # Generated server-side: rows are only ever written with INSERT ... SELECT/VALUES upserts
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, server_default=func.gen_random_uuid())
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    month: Mapped[date] = mapped_column(nullable=False)  # first day of the month
+    type: Mapped[TransactionType] = mapped_column(nullable=False)
+    category_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("categories.id", ondelete="CASCADE"),
+        nullable=True,  # NULL = uncategorized
+    )
+    currency: Mapped[str] = mapped_column(String(3), nullable=False)
+    total: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=0, nullable=False)
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    # Uncategorized rows must collide too, hence NULLS NOT DISTINCT
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id",
+            "month",
+            "type",
+            "category_id",
+            "currency",
+            name="uq_monthly_rollup_key",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_monthly_rollups_category_id", "category_id"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<MonthlyRollup(user_id={self.user_id}, month={self.month}, "
+            f"type={self.type}, total={self.total} {self.currency})>"
+        )
@@ -29,16 +29,14 @@ class BaseRepository(Generic[ModelType]):
         return list(result.scalars().all())
 
     async def create(self, obj: ModelType) -> ModelType:
-        """Create a new record."""
+        """Create a new record; server defaults come back with the INSERT."""
         self.db.add(obj)
         await self.db.flush()
-        await self.db.refresh(obj)
         return obj
 
     async def update(self, obj: ModelType) -> ModelType:
-        """Update a record."""
+        """Update a record; onupdate values come back with the UPDATE."""
         await self.db.flush()
-        await self.db.refresh(obj)
         return obj
 
     async def delete(self, obj: ModelType) -> None:
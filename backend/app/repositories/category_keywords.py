@@ -0,0 +1,121 @@
+"""Hot-reloadable keyword dictionary for category detection."""
+
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.config import get_settings
+from app.core.keyword_index import BUNDLED_KEYWORDS_FILE, KeywordIndex, normalize
+from app.db.session import async_session_maker
+from app.models.category_keyword import CategoryKeyword
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+Keywords = dict[str, list[str]]
+
+
+class KeywordDictionary:
+    """Keyword → category hint dictionary, from a JSON file and the database.
+
+    The file maps each category hint to its keywords; rows of
+    ``category_keywords`` add to it and win on conflicts. ``refresh``
+    rebuilds the index when the file's mtime or the table's row count and
+    latest update changed; ``watch`` calls it periodically. A rebuilt index
+    replaces the old one in a single assignment, so parsers never see a
+    half-built one.
+    """
+
+    def __init__(self, path: Path, reload_interval_seconds: float):
+        self.path = path
+        self.reload_interval_seconds = reload_interval_seconds
+        self._file_keywords: Keywords = {}
+        self._file_mtime: float | None = None
+        self._db_keywords: Keywords = {}
+        self._db_fingerprint: tuple | None = None
+        self._reload_file()
+        self.index = self._build()
+
+    def _reload_file(self) -> bool:
+        """Read the file if it changed; True when it did."""
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            logger.warning("Keyword file %s not found", self.path)
+            return False
+        if mtime == self._file_mtime:
+            return False
+
+        try:
+            keywords = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            logger.warning("Could not read keyword file %s", self.path, exc_info=True)
+            return False
+
+        self._file_keywords = keywords
+        self._file_mtime = mtime
+        return True
+
+    async def _reload_db(self) -> bool:
+        """Read the table if it changed; True when it did."""
+        async with async_session_maker() as session:
+            fingerprint = tuple(
+                (
+                    await session.execute(
+                        select(func.count(), func.max(CategoryKeyword.updated_at))
+                    )
+                ).one()
+            )
+            if fingerprint == self._db_fingerprint:
+                return False
+
+            result = await session.execute(
+                select(CategoryKeyword.keyword, CategoryKeyword.category_hint)
+            )
+            keywords: Keywords = {}
+            for keyword, category_hint in result.all():
+                keywords.setdefault(category_hint, []).append(keyword)
+
+        self._db_keywords = keywords
+        self._db_fingerprint = fingerprint
+        return True
+
+    def _build(self) -> KeywordIndex:
+        # Database entries override file entries for the same keyword
+        overridden = {normalize(k.strip()) for keywords in self._db_keywords.values() for k in keywords}
+        merged: Keywords = {category: list(keywords) for category, keywords in self._db_keywords.items()}
+        for category, keywords in self._file_keywords.items():
+            merged.setdefault(category, []).extend(
+                keyword for keyword in keywords if normalize(keyword.strip()) not in overridden
+            )
+        return KeywordIndex(merged)
+
+    async def refresh(self) -> None:
+        """Rebuild the index if the file or the table changed."""
+        changed = self._reload_file()
+        try:
+            changed = await self._reload_db() or changed
+        except SQLAlchemyError:
+            logger.warning("Could not load category keywords from the database", exc_info=True)
+
+        if changed:
+            self.index = self._build()
+            logger.info("Loaded %d category keywords", self.index.size)
+
+    async def watch(self) -> None:
+        """Refresh every ``reload_interval_seconds`` until cancelled."""
+        while True:
+            await asyncio.sleep(self.reload_interval_seconds)
+            await self.refresh()
+
+
+# The bundled file unless CATEGORY_KEYWORDS_FILE points elsewhere
+category_keywords = KeywordDictionary(
+    Path(settings.category_keywords_file) if settings.category_keywords_file else BUNDLED_KEYWORDS_FILE,
+    reload_interval_seconds=settings.category_keywords_reload_seconds,
+)
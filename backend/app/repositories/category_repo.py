@@ -1,13 +1,28 @@
 """Category repository."""
 
 import uuid
+from datetime import date
+from functools import partial
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import Row, select, and_, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import budget_status_cache
+from app.db.events import on_commit
+from app.db.routing import track_write
 from app.models.category import Category
+from app.models.monthly_rollup import MonthlyRollup
 from app.models.transaction import TransactionType
 from app.repositories.base import BaseRepository
+from app.repositories.category_snapshots import CategorySnapshot, user_category_snapshots
+from app.repositories.monthly_rollup_repo import MonthlyRollupRepository
+from app.repositories.system_categories import system_categories
+
+
+async def invalidate_category_caches(user_id: uuid.UUID) -> None:
+    """Drop everything cached from a user's categories."""
+    await user_category_snapshots.invalidate(user_id)
+    await budget_status_cache.invalidate(user_id)
 
 
 class CategoryRepository(BaseRepository[Category]):
@@ -16,43 +31,85 @@ class CategoryRepository(BaseRepository[Category]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, Category)
 
+    def _track_change(self, user_id: uuid.UUID) -> None:
+        """Invalidate the user's cached categories and budgets once the write commits."""
+        on_commit(
+            self.db,
+            ("categories", user_id),
+            partial(invalidate_category_caches, user_id),
+        )
+        track_write(self.db, user_id)
+
+    async def _attach(self, category: Category) -> Category:
+        """Add a cached category to the session without querying it."""
+        return await self.db.merge(category, load=False)
+
+    async def _get_own_snapshots(self, user_id: uuid.UUID) -> list[CategorySnapshot]:
+        """Get snapshots of the user's custom categories, ordered by name."""
+        snapshots = await user_category_snapshots.get(user_id)
+        if snapshots is not None:
+            return snapshots
+        
+        result = await self.db.execute(
+            select(Category).where(Category.user_id == user_id).order_by(Category.name)
+        )
+        snapshots = [CategorySnapshot.model_validate(c) for c in result.scalars().all()]
+        await user_category_snapshots.set(user_id, snapshots)
+        return snapshots
+
+    async def get_user_category_snapshots(
+        self,
+        user_id: uuid.UUID,
+        transaction_type: TransactionType | None = None,
+    ) -> list[CategorySnapshot]:
+        """Get snapshots of all categories for a user, ordered like ``get_user_categories``.
+
+        Served from the category caches without touching the session, for
+        read paths that only need column values.
+        """
+        own = [
+            snapshot
+            for snapshot in await self._get_own_snapshots(user_id)
+            if transaction_type is None or snapshot.type == transaction_type
+        ]
+        return await system_categories.snapshots(transaction_type) + own
+
     async def get_user_categories(
         self,
         user_id: uuid.UUID,
         transaction_type: TransactionType | None = None,
     ) -> list[Category]:
-        """Get all categories for a user (including system categories)."""
-        query = select(Category).where(
-            or_(
-                Category.user_id == user_id,
-                Category.is_system == True,  # noqa: E712
-            )
-        )
-        
-        if transaction_type:
-            query = query.where(Category.type == transaction_type)
-        
-        query = query.order_by(Category.is_system.desc(), Category.name)
-        
-        result = await self.db.execute(query)
-        return list(result.scalars().all())
+        """Get all categories for a user (system categories first, then the user's)."""
+        snapshots = await self.get_user_category_snapshots(user_id, transaction_type)
+        return [await self._attach(snapshot.restore()) for snapshot in snapshots]
 
     async def get_user_category(
         self, category_id: uuid.UUID, user_id: uuid.UUID
     ) -> Category | None:
         """Get a category only if it's system or belongs to the user."""
-        result = await self.db.execute(
-            select(Category).where(
-                and_(
-                    Category.id == category_id,
-                    or_(
-                        Category.user_id == user_id,
-                        Category.is_system == True,  # noqa: E712
-                    ),
-                )
+        category = await system_categories.get(category_id)
+        if category is None:
+            category = next(
+                (
+                    snapshot.restore()
+                    for snapshot in await self._get_own_snapshots(user_id)
+                    if snapshot.id == category_id
+                ),
+                None,
             )
-        )
-        return result.scalar_one_or_none()
+        
+        return await self._attach(category) if category else None
+
+    async def get_accessible_ids(
+        self, category_ids: set[uuid.UUID], user_id: uuid.UUID
+    ) -> set[uuid.UUID]:
+        """Return the subset of category IDs that are system or belong to the user."""
+        accessible = category_ids & await system_categories.ids()
+        if accessible == category_ids:
+            return accessible
+        
+        own_ids = {snapshot.id for snapshot in await self._get_own_snapshots(user_id)}
+        return accessible | (category_ids & own_ids)
 
     async def get_by_name(
         self, name: str, user_id: uuid.UUID, transaction_type: TransactionType
@@ -87,7 +144,63 @@ class CategoryRepository(BaseRepository[Category]):
             type=transaction_type,
             is_system=is_system,
         )
-        return await self.create(category)
+        category = await self.create(category)
+        if user_id:
+            self._track_change(user_id)
+        if is_system:
+            on_commit(self.db, "system_categories", system_categories.bump)
+        return category
+
+    async def update_user_category(self, category: Category, user_id: uuid.UUID) -> Category:
+        """Save changes a user made to a system or custom category."""
+        category = await self.update(category)
+        self._track_change(user_id)
+        if category.is_system:
+            on_commit(self.db, "system_categories", system_categories.bump)
+        return category
+
+    async def get_budget_usage(self, user_id: uuid.UUID, month: date) -> list[Row]:
+        """Get spending for a month against every limited expense category.
+
+        Spent, remaining and percent used are computed in one query over the
+        monthly rollups; categories with no spending yet report zero.
+        """
+        spent = func.coalesce(func.sum(MonthlyRollup.total), 0)
+        
+        result = await self.db.execute(
+            select(
+                Category.id,
+                Category.name,
+                Category.icon,
+                Category.color,
+                Category.monthly_limit,
+                spent.label("spent"),
+                (Category.monthly_limit - spent).label("remaining"),
+                func.round(spent * 100 / Category.monthly_limit, 1).label("percent_used"),
+            )
+            .outerjoin(
+                MonthlyRollup,
+                and_(
+                    MonthlyRollup.category_id == Category.id,
+                    MonthlyRollup.user_id == user_id,
+                    MonthlyRollup.month == month,
+                    MonthlyRollup.type == TransactionType.EXPENSE,
+                ),
+            )
+            .where(
+                and_(
+                    or_(
+                        Category.user_id == user_id,
+                        Category.is_system == True,  # noqa: E712
+                    ),
+                    Category.type == TransactionType.EXPENSE,
+                    Category.monthly_limit > 0,
+                )
+            )
+            .group_by(Category.id)
+            .order_by(Category.is_system.desc(), Category.name)
+        )
+        return list(result.all())
 
     async def delete_user_category(
         self, category_id: uuid.UUID, user_id: uuid.UUID
@@ -107,5 +220,8 @@ class CategoryRepository(BaseRepository[Category]):
         if not category:
             return False
         
+        # Its transactions become uncategorized (ON DELETE SET NULL)
+        await MonthlyRollupRepository(self.db).uncategorize(category.id)
         await self.delete(category)
+        self._track_change(user_id)
         return True
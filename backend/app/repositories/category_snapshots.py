@@ -0,0 +1,48 @@
+"""Session-independent snapshots of categories and their caches."""
+
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+import pydantic
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import get_settings
+from app.core.cache import LayeredUserCache
+from app.models.category import Category
+from app.models.transaction import TransactionType
+
+settings = get_settings()
+
+
+class CategorySnapshot(pydantic.BaseModel):
+    """Column values of a category, detached from any session."""
+
+    model_config = pydantic.ConfigDict(from_attributes=True, frozen=True)
+
+    id: uuid.UUID
+    user_id: uuid.UUID | None
+    name: str
+    icon: str
+    color: str
+    type: TransactionType
+    monthly_limit: Decimal | None
+    is_system: bool
+    created_at: datetime
+    updated_at: datetime
+
+    def restore(self) -> Category:
+        """Build a detached Category that can be merged into a session without a query."""
+        category = Category(**self.model_dump())
+        make_transient_to_detached(category)
+        return category
+
+
+# A user's own categories, dropped by every write to them
+user_category_snapshots: LayeredUserCache[list[CategorySnapshot]] = LayeredUserCache(
+    "category_snapshot",
+    pydantic.TypeAdapter(list[CategorySnapshot]),
+    ttl_seconds=settings.category_snapshot_cache_ttl_seconds,
+    local_ttl_seconds=settings.category_snapshot_local_ttl_seconds,
+    local_maxsize=settings.category_snapshot_local_maxsize,
+)
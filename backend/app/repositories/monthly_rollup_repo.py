@@ -0,0 +1,243 @@
+"""Monthly rollup repository."""
+
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import (
+    Date,
+    FromClause,
+    Insert,
+    Row,
+    Select,
+    Uuid,
+    cast,
+    delete,
+    func,
+    literal,
+    literal_column,
+    null,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.models.category import Category
+from app.models.monthly_rollup import MonthlyRollup
+from app.models.transaction import Transaction, TransactionType
+
+ROLLUP_KEY_COLUMNS = ["user_id", "month", "type", "category_id", "currency"]
+ROLLUP_COLUMNS = [*ROLLUP_KEY_COLUMNS, "total", "count"]
+
+
+def month_of(column: ColumnElement[date]) -> ColumnElement[date]:
+    """First day of the month of a date column.
+
+    The unit is inlined rather than bound so the expression is textually
+    identical wherever it appears in SELECT and GROUP BY.
+    """
+    return cast(func.date_trunc(literal_column("'month'"), column), Date)
+
+
+@dataclass(frozen=True)
+class RollupKey:
+    """Identifies one rollup row."""
+
+    user_id: uuid.UUID
+    month: date
+    type: TransactionType
+    category_id: uuid.UUID | None
+    currency: str
+
+    @classmethod
+    def for_transaction(
+        cls,
+        user_id: uuid.UUID,
+        transaction_date: date,
+        transaction_type: TransactionType,
+        category_id: uuid.UUID | None,
+        currency: str,
+    ) -> "RollupKey":
+        """Key of the rollup row a transaction contributes to."""
+        return cls(
+            user_id=user_id,
+            month=transaction_date.replace(day=1),
+            type=transaction_type,
+            category_id=category_id,
+            currency=currency,
+        )
+
+
+# Change to apply to a rollup row: (amount, count)
+RollupDelta = tuple[Decimal, int]
+
+
+class MonthlyRollupRepository:
+    """Repository maintaining and reading monthly rollups."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _on_conflict_add(statement: Insert) -> Insert:
+        """Turn an insert into an upsert that adds to existing rows."""
+        return statement.on_conflict_do_update(
+            constraint="uq_monthly_rollup_key",
+            set_={
+                "total": MonthlyRollup.total + statement.excluded.total,
+                "count": MonthlyRollup.count + statement.excluded.count,
+            },
+        )
+
+    @classmethod
+    def upsert_from_select(cls, source: Select) -> Insert:
+        """Build an upsert adding the rows of a select in ROLLUP_COLUMNS order."""
+        return cls._on_conflict_add(pg_insert(MonthlyRollup).from_select(ROLLUP_COLUMNS, source))
+
+    @staticmethod
+    def aggregate(source: FromClause) -> Select:
+        """Aggregate transaction-shaped rows into rollup rows.
+
+        ``source`` needs user_id, transaction_date, type, category_id, currency
+        and amount columns: the transactions table, or a CTE returning them.
+        """
+        columns = source.c
+        month = month_of(columns.transaction_date)
+        return select(
+            columns.user_id,
+            month,
+            columns.type,
+            columns.category_id,
+            columns.currency,
+            func.sum(columns.amount),
+            func.count(),
+        ).group_by(
+            columns.user_id,
+            month,
+            columns.type,
+            columns.category_id,
+            columns.currency,
+        )
+
+    async def apply_deltas(self, deltas: Mapping[RollupKey, RollupDelta]) -> None:
+        """Add amount/count deltas to rollup rows with one multi-row upsert."""
+        rows = [
+            {
+                "user_id": key.user_id,
+                "month": key.month,
+                "type": key.type,
+                "category_id": key.category_id,
+                "currency": key.currency,
+                "total": total,
+                "count": count,
+            }
+            for key, (total, count) in deltas.items()
+            if total or count
+        ]
+        if not rows:
+            return
+        
+        await self.db.execute(self._on_conflict_add(pg_insert(MonthlyRollup).values(rows)))
+
+    async def merge_user(self, source_user_id: uuid.UUID, target_user_id: uuid.UUID) -> None:
+        """Fold one user's rollups into another's, e.g. when accounts are merged."""
+        source = select(
+            literal(target_user_id, Uuid),
+            MonthlyRollup.month,
+            MonthlyRollup.type,
+            MonthlyRollup.category_id,
+            MonthlyRollup.currency,
+            MonthlyRollup.total,
+            MonthlyRollup.count,
+        ).where(MonthlyRollup.user_id == source_user_id)
+        
+        await self.db.execute(self.upsert_from_select(source))
+        await self.db.execute(delete(MonthlyRollup).where(MonthlyRollup.user_id == source_user_id))
+
+    async def uncategorize(self, category_id: uuid.UUID) -> None:
+        """Fold a category's rollups into the uncategorized rows before it is deleted."""
+        source = select(
+            MonthlyRollup.user_id,
+            MonthlyRollup.month,
+            MonthlyRollup.type,
+            null(),
+            MonthlyRollup.currency,
+            MonthlyRollup.total,
+            MonthlyRollup.count,
+        ).where(MonthlyRollup.category_id == category_id)
+        
+        await self.db.execute(self.upsert_from_select(source))
+        await self.db.execute(delete(MonthlyRollup).where(MonthlyRollup.category_id == category_id))
+
+    async def rebuild(self, user_id: uuid.UUID | None = None) -> None:
+        """Recompute rollups from transactions, for one user or everyone.
+
+        The table lock holds back concurrent rollup upserts until the rebuild
+        commits, so writes racing with it are neither lost nor counted twice.
+        """
+        await self.db.execute(text("LOCK TABLE monthly_rollups IN EXCLUSIVE MODE"))
+        
+        clear = delete(MonthlyRollup)
+        source = self.aggregate(Transaction.__table__)
+        if user_id:
+            clear = clear.where(MonthlyRollup.user_id == user_id)
+            source = source.where(Transaction.user_id == user_id)
+        
+        await self.db.execute(clear)
+        await self.db.execute(self.upsert_from_select(source))
+
+    async def summarize(
+        self,
+        user_id: uuid.UUID,
+        start_month: date | None = None,
+        end_month: date | None = None,
+    ) -> list[Row]:
+        """Aggregate rollups for whole months in a single pass.
+
+        Returns rows shaped like TransactionRepository.summarize: totals per
+        type, per (type, category) and per (type, month), each split by
+        currency and told apart by the ``grouping_set`` column, with category
+        name, icon and color joined in.
+        """
+        query = select(
+            MonthlyRollup.type,
+            MonthlyRollup.currency,
+            MonthlyRollup.category_id,
+            MonthlyRollup.month,
+            func.sum(MonthlyRollup.total).label("total"),
+            func.sum(MonthlyRollup.count).label("count"),
+            func.grouping(MonthlyRollup.category_id, MonthlyRollup.month).label("grouping_set"),
+        ).where(MonthlyRollup.user_id == user_id)
+        
+        if start_month:
+            query = query.where(MonthlyRollup.month >= start_month)
+        if end_month:
+            query = query.where(MonthlyRollup.month <= end_month)
+        
+        aggregates = (
+            query.group_by(
+                func.grouping_sets(
+                    tuple_(MonthlyRollup.type, MonthlyRollup.currency),
+                    tuple_(MonthlyRollup.type, MonthlyRollup.currency, MonthlyRollup.category_id),
+                    tuple_(MonthlyRollup.type, MonthlyRollup.currency, MonthlyRollup.month),
+                )
+            )
+            # Rows emptied by deletes linger until the next rebuild
+            .having(func.sum(MonthlyRollup.count) > 0)
+            .subquery()
+        )
+        
+        result = await self.db.execute(
+            select(
+                aggregates,
+                Category.name,
+                Category.icon,
+                Category.color,
+            ).outerjoin(Category, Category.id == aggregates.c.category_id)
+        )
+        return list(result.all())
@@ -5,6 +5,7 @@ import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.routing import track_write
 from app.models.recurring_transaction import RecurringTransaction
 
 
@@ -38,17 +39,18 @@ class RecurringTransactionRepository:
     async def create(self, recurring_transaction: RecurringTransaction) -> RecurringTransaction:
         """Create a new recurring transaction."""
         self.db.add(recurring_transaction)
-        await self.db.commit()
-        await self.db.refresh(recurring_transaction)
+        track_write(self.db, recurring_transaction.user_id)
+        await self.db.flush()
         return recurring_transaction
 
     async def update(self, recurring_transaction: RecurringTransaction) -> RecurringTransaction:
         """Update an existing recurring transaction."""
-        await self.db.commit()
-        await self.db.refresh(recurring_transaction)
+        track_write(self.db, recurring_transaction.user_id)
+        await self.db.flush()
         return recurring_transaction
 
     async def delete(self, recurring_transaction: RecurringTransaction) -> None:
         """Delete a recurring transaction."""
         await self.db.delete(recurring_transaction)
-        await self.db.commit()
+        track_write(self.db, recurring_transaction.user_id)
+        await self.db.flush()
@@ -0,0 +1,131 @@
+"""Process-wide cache of system categories."""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from redis.exceptions import RedisError
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.core.redis import get_redis_client
+from app.db.session import async_session_maker
+from app.models.category import Category
+from app.models.transaction import TransactionType
+from app.repositories.category_snapshots import CategorySnapshot
+
+settings = get_settings()
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "system_categories:version"
+
+
+class SystemCategoryCache:
+    """In-memory copy of the categories shared by every user.
+
+    System categories are seeded once and rarely change, so each process keeps
+    them in memory instead of OR-ing them into every per-user query. Writers
+    bump a version counter in Redis; readers compare it with the loaded version
+    at most every ``check_interval_seconds`` and reload when it moved.
+
+    Categories are kept as snapshots and handed out as fresh detached instances,
+    so no ORM object is ever shared between sessions.
+    """
+
+    def __init__(self, check_interval_seconds: float):
+        self.check_interval_seconds = check_interval_seconds
+        self._rows: list[CategorySnapshot] | None = None
+        self._by_id: dict[uuid.UUID, CategorySnapshot] = {}
+        self._version: str | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _read_version(self) -> str | None:
+        redis = await get_redis_client()
+        return await redis.get(VERSION_KEY)
+
+    async def load(self) -> None:
+        """Load system categories from the database, ordered by name."""
+        # Read the version first: a bump racing with the load triggers another one
+        try:
+            version = await self._read_version()
+        except RedisError:
+            logger.warning("Could not read system category version", exc_info=True)
+            version = self._version
+
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Category)
+                .where(Category.is_system == True)  # noqa: E712
+                .order_by(Category.name)
+            )
+            rows = [CategorySnapshot.model_validate(category) for category in result.scalars().all()]
+
+        self._rows = rows
+        self._by_id = {row.id: row for row in rows}
+        self._version = version
+        self._checked_at = time.monotonic()
+        logger.info("Loaded %d system categories (version %s)", len(rows), version)
+
+    async def preload(self) -> None:
+        """Load at startup; on failure the first read tries again."""
+        try:
+            await self.load()
+        except Exception:
+            logger.warning("Could not preload system categories", exc_info=True)
+
+    async def _ensure_fresh(self) -> None:
+        """Load on first use and reload once the version has been bumped."""
+        if self._rows is not None and time.monotonic() - self._checked_at < self.check_interval_seconds:
+            return
+
+        async with self._lock:
+            if self._rows is None:
+                await self.load()
+                return
+            if time.monotonic() - self._checked_at < self.check_interval_seconds:
+                return  # another reader refreshed while we waited
+
+            try:
+                version = await self._read_version()
+            except RedisError:
+                logger.warning("Could not read system category version", exc_info=True)
+                version = self._version
+
+            if version != self._version:
+                await self.load()
+            else:
+                self._checked_at = time.monotonic()
+
+    async def bump(self) -> None:
+        """Signal every process that system categories changed."""
+        redis = await get_redis_client()
+        await redis.incr(VERSION_KEY)
+        self._checked_at = 0.0  # this process rechecks on its next read
+
+    async def snapshots(self, transaction_type: TransactionType | None = None) -> list[CategorySnapshot]:
+        """Get snapshots of system categories, ordered by name."""
+        await self._ensure_fresh()
+        return [row for row in self._rows if transaction_type is None or row.type == transaction_type]
+
+    async def get_all(self, transaction_type: TransactionType | None = None) -> list[Category]:
+        """Get system categories, ordered by name."""
+        return [row.restore() for row in await self.snapshots(transaction_type)]
+
+    async def get(self, category_id: uuid.UUID) -> Category | None:
+        """Get a system category by ID."""
+        await self._ensure_fresh()
+        row = self._by_id.get(category_id)
+        return row.restore() if row else None
+
+    async def ids(self) -> set[uuid.UUID]:
+        """IDs of all system categories."""
+        await self._ensure_fresh()
+        return set(self._by_id)
+
+
+system_categories = SystemCategoryCache(
+    check_interval_seconds=settings.system_category_check_interval_seconds,
+)
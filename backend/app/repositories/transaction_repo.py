@@ -1,14 +1,60 @@
 """Transaction repository."""
 
 import uuid
-from datetime import date
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from functools import partial
+from typing import Any
 
-from sqlalchemy import select, func, and_
+from sqlalchemy import (
+    Row,
+    Select,
+    and_,
+    func,
+    insert,
+    inspect,
+    select,
+    tuple_,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import invalidate_transaction_caches
+from app.db.events import on_commit
+from app.db.routing import track_write
+from app.models.category import Category
 from app.models.transaction import Transaction, TransactionType
 from app.repositories.base import BaseRepository
+from app.repositories.monthly_rollup_repo import (
+    MonthlyRollupRepository,
+    RollupDelta,
+    RollupKey,
+    month_of,
+)
+
+# Keyset ordering: newest first, with created_at and id as tie-breakers so
+# rows sharing a transaction_date have a stable, total order.
+KEYSET_COLUMNS = (Transaction.transaction_date, Transaction.created_at, Transaction.id)
+
+TransactionKey = tuple[date, datetime, uuid.UUID]
+
+# Rows per multi-row INSERT in bulk writes
+BULK_INSERT_CHUNK_SIZE = 1000
+
+# Rows fetched per round trip when streaming from a server-side cursor
+STREAM_BATCH_SIZE = 1000
+
+# Transaction fields that determine its monthly rollup contribution
+ROLLUP_FIELDS = ("user_id", "transaction_date", "type", "category_id", "currency", "amount")
+
+# First day of the transaction's month
+TRANSACTION_MONTH = month_of(Transaction.transaction_date)
+
+# Bitmask values of GROUPING(category_id, month) in summarize()
+GROUPING_TYPE_TOTAL = 3
+GROUPING_BY_CATEGORY = 1
+GROUPING_BY_MONTH = 2
 
 
 class TransactionRepository(BaseRepository[Transaction]):
@@ -16,21 +62,85 @@ class TransactionRepository(BaseRepository[Transaction]):
 
     def __init__(self, db: AsyncSession):
         super().__init__(db, Transaction)
+        self.rollup_repo = MonthlyRollupRepository(db)
 
-    async def get_by_user(
-        self,
+    def _track_change(self, user_id: uuid.UUID) -> None:
+        """Invalidate the user's cached transaction data once the write commits.
+
+        Also keeps the user's reads on the primary while the replica catches up.
+        """
+        on_commit(
+            self.db,
+            ("transactions", user_id),
+            partial(invalidate_transaction_caches, user_id),
+        )
+        track_write(self.db, user_id)
+
+    @staticmethod
+    def _rollup_entry(values: Any, sign: int = 1) -> tuple[RollupKey, RollupDelta]:
+        """Rollup key and delta for a transaction (or a mapping of its values)."""
+        get = values.get if isinstance(values, dict) else partial(getattr, values)
+        key = RollupKey.for_transaction(
+            user_id=get("user_id"),
+            transaction_date=get("transaction_date"),
+            transaction_type=get("type"),
+            category_id=get("category_id"),
+            currency=get("currency"),
+        )
+        # Amounts may still be the float or str the caller assigned
+        return key, (sign * Decimal(str(get("amount"))), sign)
+
+    @staticmethod
+    def _previous_values(obj: Transaction) -> dict[str, Any]:
+        """Values of the rollup-relevant fields as last loaded from the database."""
+        state = inspect(obj)
+        values = {}
+        for field in ROLLUP_FIELDS:
+            history = state.attrs[field].history
+            values[field] = history.deleted[0] if history.deleted else getattr(obj, field)
+        return values
+
+    async def create(self, obj: Transaction) -> Transaction:
+        """Create a new transaction."""
+        obj = await super().create(obj)
+        await self.rollup_repo.apply_deltas(dict([self._rollup_entry(obj)]))
+        self._track_change(obj.user_id)
+        return obj
+
+    async def update(self, obj: Transaction) -> Transaction:
+        """Update a transaction."""
+        old_key, old_delta = self._rollup_entry(self._previous_values(obj), sign=-1)
+        obj = await super().update(obj)
+        
+        new_key, new_delta = self._rollup_entry(obj)
+        deltas: dict[RollupKey, RollupDelta] = {old_key: old_delta}
+        total, count = deltas.get(new_key, (Decimal(0), 0))
+        deltas[new_key] = (total + new_delta[0], count + new_delta[1])
+        await self.rollup_repo.apply_deltas(deltas)
+        
+        self._track_change(old_key.user_id)
+        self._track_change(obj.user_id)
+        return obj
+
+    async def delete(self, obj: Transaction) -> None:
+        """Delete a transaction."""
+        user_id = obj.user_id
+        await self.rollup_repo.apply_deltas(dict([self._rollup_entry(obj, sign=-1)]))
+        await super().delete(obj)
+        self._track_change(user_id)
+
+    @staticmethod
+    def _apply_filters(
+        query: Select,
         user_id: uuid.UUID,
-        skip: int = 0,
-        limit: int = 100,
         transaction_type: TransactionType | None = None,
         category_id: uuid.UUID | None = None,
         start_date: date | None = None,
         end_date: date | None = None,
-    ) -> list[Transaction]:
-        """Get transactions for a user with filters."""
-        query = select(Transaction).where(Transaction.user_id == user_id)
+    ) -> Select:
+        """Restrict a query to a user's transactions matching the filters."""
+        query = query.where(Transaction.user_id == user_id)
         
-        # Apply filters
         if transaction_type:
             query = query.where(Transaction.type == transaction_type)
         if category_id:
@@ -40,11 +150,33 @@ class TransactionRepository(BaseRepository[Transaction]):
         if end_date:
             query = query.where(Transaction.transaction_date <= end_date)
         
+        return query
+
+    async def get_by_user(
+        self,
+        user_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        transaction_type: TransactionType | None = None,
+        category_id: uuid.UUID | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[Transaction]:
+        """Get transactions for a user with filters."""
+        query = self._apply_filters(
+            select(Transaction),
+            user_id,
+            transaction_type=transaction_type,
+            category_id=category_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        
         # Eager load category relationship
         query = query.options(selectinload(Transaction.category))
         
         # Order by most recent first
-        query = query.order_by(Transaction.transaction_date.desc())
+        query = query.order_by(*(column.desc() for column in KEYSET_COLUMNS))
         
         # Pagination
         query = query.offset(skip).limit(limit)
@@ -52,6 +184,101 @@ class TransactionRepository(BaseRepository[Transaction]):
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def get_by_user_keyset(
+        self,
+        user_id: uuid.UUID,
+        limit: int = 50,
+        position: TransactionKey | None = None,
+        backwards: bool = False,
+        transaction_type: TransactionType | None = None,
+        category_id: uuid.UUID | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> tuple[list[Transaction], bool]:
+        """Get a page of transactions using keyset pagination.
+
+        Rows are ordered newest first by (transaction_date, created_at, id).
+        Rows after ``position`` are returned, or the rows before it when
+        ``backwards`` is set. The flag tells whether more rows exist beyond
+        the page in the direction of travel.
+        """
+        query = self._apply_filters(
+            select(Transaction),
+            user_id,
+            transaction_type=transaction_type,
+            category_id=category_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        
+        if position:
+            key = tuple_(*KEYSET_COLUMNS)
+            # The plain date bound lets Postgres seek idx_user_date directly;
+            # the row comparison then resolves ties within that date.
+            if backwards:
+                query = query.where(
+                    Transaction.transaction_date >= position[0],
+                    key > tuple_(*position),
+                )
+            else:
+                query = query.where(
+                    Transaction.transaction_date <= position[0],
+                    key < tuple_(*position),
+                )
+        
+        order = [column.asc() if backwards else column.desc() for column in KEYSET_COLUMNS]
+        query = (
+            query.options(selectinload(Transaction.category))
+            .order_by(*order)
+            .limit(limit + 1)
+        )
+        
+        result = await self.db.execute(query)
+        transactions = list(result.scalars().all())
+        
+        has_more = len(transactions) > limit
+        transactions = transactions[:limit]
+        if backwards:
+            transactions.reverse()
+        
+        return transactions, has_more
+
+    async def stream_by_user(
+        self,
+        user_id: uuid.UUID,
+        transaction_type: TransactionType | None = None,
+        category_id: uuid.UUID | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Stream a user's transactions in batches from a server-side cursor.
+
+        Yields plain rows (with the category name joined in) rather than ORM
+        objects, so memory stays bounded by the batch size.
+        """
+        query = self._apply_filters(
+            select(
+                Transaction.id,
+                Transaction.transaction_date,
+                Transaction.type,
+                Transaction.amount,
+                Transaction.currency,
+                Transaction.description,
+                Category.name.label("category"),
+                Transaction.created_at,
+            ).outerjoin(Category, Transaction.category_id == Category.id),
+            user_id,
+            transaction_type=transaction_type,
+            category_id=category_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        query = query.order_by(*(column.desc() for column in KEYSET_COLUMNS))
+        
+        result = await self.db.stream(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        async for partition in result.partitions():
+            yield partition
+
     async def count_by_user(
         self,
         user_id: uuid.UUID,
@@ -61,21 +288,63 @@ class TransactionRepository(BaseRepository[Transaction]):
         end_date: date | None = None,
     ) -> int:
         """Count transactions for a user with filters."""
-        query = select(func.count(Transaction.id)).where(Transaction.user_id == user_id)
-        
-        # Apply same filters
-        if transaction_type:
-            query = query.where(Transaction.type == transaction_type)
-        if category_id:
-            query = query.where(Transaction.category_id == category_id)
-        if start_date:
-            query = query.where(Transaction.transaction_date >= start_date)
-        if end_date:
-            query = query.where(Transaction.transaction_date <= end_date)
+        query = self._apply_filters(
+            select(func.count(Transaction.id)),
+            user_id,
+            transaction_type=transaction_type,
+            category_id=category_id,
+            start_date=start_date,
+            end_date=end_date,
+        )
         
         result = await self.db.execute(query)
         return result.scalar_one()
 
+    async def summarize(
+        self,
+        user_id: uuid.UUID,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[Row]:
+        """Aggregate sums and counts for a date range in a single pass.
+
+        Uses grouping sets to return, in one round trip, totals per type, per
+        (type, category) and per (type, month), each split by currency so
+        amounts in different currencies are never added up. The ``grouping_set``
+        column tells them apart (see the GROUPING_* constants). Category rows
+        carry the category's name, icon and color.
+        """
+        aggregates = self._apply_filters(
+            select(
+                Transaction.type,
+                Transaction.currency,
+                Transaction.category_id,
+                TRANSACTION_MONTH.label("month"),
+                func.sum(Transaction.amount).label("total"),
+                func.count().label("count"),
+                func.grouping(Transaction.category_id, TRANSACTION_MONTH).label("grouping_set"),
+            ),
+            user_id,
+            start_date=start_date,
+            end_date=end_date,
+        ).group_by(
+            func.grouping_sets(
+                tuple_(Transaction.type, Transaction.currency),
+                tuple_(Transaction.type, Transaction.currency, Transaction.category_id),
+                tuple_(Transaction.type, Transaction.currency, TRANSACTION_MONTH),
+            )
+        ).subquery()
+        
+        query = select(
+            aggregates,
+            Category.name,
+            Category.icon,
+            Category.color,
+        ).outerjoin(Category, Category.id == aggregates.c.category_id)
+        
+        result = await self.db.execute(query)
+        return list(result.all())
+
     async def get_user_transaction(
         self, transaction_id: uuid.UUID, user_id: uuid.UUID
     ) -> Transaction | None:
@@ -92,6 +361,21 @@ class TransactionRepository(BaseRepository[Transaction]):
         )
         return result.scalar_one_or_none()
 
+    async def get_categorized_descriptions(
+        self, user_id: uuid.UUID, limit: int
+    ) -> list[Row[tuple[str, uuid.UUID]]]:
+        """Description and category of the user's latest categorized transactions."""
+        result = await self.db.execute(
+            select(Transaction.description, Transaction.category_id)
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.category_id.is_not(None),
+            )
+            .order_by(*(column.desc() for column in KEYSET_COLUMNS))
+            .limit(limit)
+        )
+        return list(result.all())
+
     async def create_transaction(
         self,
         user_id: uuid.UUID,
@@ -115,3 +399,65 @@ class TransactionRepository(BaseRepository[Transaction]):
             raw_message=raw_message,
         )
         return await self.create(transaction)
+
+    async def insert_returning_id(self, row: dict[str, Any]) -> uuid.UUID:
+        """Insert one transaction and update its monthly rollup in a single statement.
+
+        Unlike ``create`` nothing is loaded into the session: the rollup upsert
+        runs off the INSERT's RETURNING in a CTE and only the ID comes back.
+        """
+        row.setdefault("id", uuid.uuid4())
+        row.setdefault("transaction_date", date.today())
+        row.setdefault("currency", "MXN")
+        
+        inserted = (
+            insert(Transaction)
+            .values(row)
+            .returning(
+                Transaction.id,
+                Transaction.user_id,
+                Transaction.transaction_date,
+                Transaction.type,
+                Transaction.category_id,
+                Transaction.currency,
+                Transaction.amount,
+            )
+            .cte("inserted")
+        )
+        rolled_up = MonthlyRollupRepository.upsert_from_select(
+            MonthlyRollupRepository.aggregate(inserted)
+        ).cte("rolled_up")
+        
+        result = await self.db.execute(select(inserted.c.id).add_cte(rolled_up))
+        self._track_change(row["user_id"])
+        return result.scalar_one()
+
+    async def bulk_create(self, rows: list[dict[str, Any]]) -> list[uuid.UUID]:
+        """Insert many transactions with multi-row INSERTs, without reloading them.
+
+        IDs are generated client-side so nothing has to be returned from the
+        database, and monthly rollups are updated with one aggregated upsert.
+        Returns the new IDs in input order.
+        """
+        ids = []
+        for row in rows:
+            row.setdefault("id", uuid.uuid4())
+            row.setdefault("transaction_date", date.today())
+            row.setdefault("currency", "MXN")
+            ids.append(row["id"])
+        
+        deltas: dict[RollupKey, RollupDelta] = {}
+        for row in rows:
+            key, (amount, count) = self._rollup_entry(row)
+            total, existing = deltas.get(key, (Decimal(0), 0))
+            deltas[key] = (total + amount, existing + count)
+        
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            await self.db.execute(insert(Transaction), rows[start:start + BULK_INSERT_CHUNK_SIZE])
+        
+        await self.rollup_repo.apply_deltas(deltas)
+        
+        for user_id in {row["user_id"] for row in rows}:
+            self._track_change(user_id)
+        
+        return ids
@@ -1,12 +1,99 @@
 """User repository."""
 
 import uuid
+from functools import partial
 
+import pydantic
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.core.cache import LayeredUserCache, SingleFlight
+from app.db.events import on_commit
+from app.db.routing import track_write
+from app.db.session import async_primary_read_session_maker, unit_of_work
 from app.models.user import User
 from app.repositories.base import BaseRepository
+from app.schemas.user import UserRead
+
+settings = get_settings()
+
+# Authenticated-user principals, so auth does not need the users table
+principal_cache: LayeredUserCache[UserRead] = LayeredUserCache(
+    "principal",
+    pydantic.TypeAdapter(UserRead),
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    local_ttl_seconds=settings.principal_local_ttl_seconds,
+    local_maxsize=settings.principal_local_maxsize,
+    shared=settings.principal_cache_redis,
+)
+
+
+# Telegram ID → user ID, so bot updates do not need the users table
+telegram_users: LayeredUserCache[uuid.UUID] = LayeredUserCache(
+    "telegram_user",
+    pydantic.TypeAdapter(uuid.UUID),
+    ttl_seconds=settings.telegram_user_cache_ttl_seconds,
+    local_ttl_seconds=settings.telegram_user_local_ttl_seconds,
+    local_maxsize=settings.telegram_user_local_maxsize,
+)
+
+# Resolutions in flight, so a burst of first updates creates the user once
+_telegram_resolutions: SingleFlight[int, uuid.UUID] = SingleFlight()
+
+
+async def invalidate_principal(user_id: uuid.UUID) -> None:
+    """Drop the cached principal of an edited, deactivated or deleted user."""
+    await principal_cache.invalidate(user_id)
+
+
+async def invalidate_telegram_user(telegram_id: int) -> None:
+    """Drop the cached user of a Telegram ID that was linked, unlinked or deleted."""
+    await telegram_users.invalidate(telegram_id)
+
+
+async def forget_telegram_user(telegram_id: int, user_id: uuid.UUID) -> None:
+    """Drop a cached resolution found to name a user that no longer exists."""
+    await telegram_users.invalidate(telegram_id)
+    await principal_cache.invalidate(user_id)
+
+
+async def _user_exists(user_id: uuid.UUID) -> bool:
+    """Whether a user exists, from the principal cache when possible."""
+    # The session only connects on a principal cache miss
+    async with async_primary_read_session_maker() as session:
+        return await UserRepository(session).get_principal(user_id) is not None
+
+
+async def resolve_telegram_user(telegram_id: int, display_name: str) -> uuid.UUID:
+    """ID of the user with a Telegram ID, created with ``display_name`` if new.
+
+    Served from the cache when possible. Otherwise the user is looked up, or
+    created, in a transaction of its own that commits before returning, so
+    the ID is safe to use from any session; concurrent calls for the same
+    Telegram ID in this process share one lookup.
+
+    Another process can merge the cached user away (``/link``) or delete it
+    while this process's local copy lives on, so a cached ID is checked
+    against the principal cache, which those writes also invalidate, and
+    resolved again if the user is gone.
+    """
+    user_id = await telegram_users.get(telegram_id)
+    if user_id is not None:
+        if await _user_exists(user_id):
+            return user_id
+        await forget_telegram_user(telegram_id, user_id)
+    
+    async def load() -> uuid.UUID:
+        async with unit_of_work() as session:
+            user_id = await UserRepository(session).get_or_create_by_telegram_id(
+                telegram_id, display_name
+            )
+        await telegram_users.set(telegram_id, user_id)
+        return user_id
+    
+    return await _telegram_resolutions.run(telegram_id, load)
 
 
 class UserRepository(BaseRepository[User]):
@@ -15,6 +102,49 @@ class UserRepository(BaseRepository[User]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, User)
 
+    def track_change(self, user_id: uuid.UUID, telegram_id: int | None = None) -> None:
+        """Invalidate the user's cached principal once the write commits.
+
+        Pass ``telegram_id`` when the write changes which user it resolves to.
+        """
+        on_commit(
+            self.db,
+            ("users", user_id),
+            partial(invalidate_principal, user_id),
+        )
+        if telegram_id is not None:
+            on_commit(
+                self.db,
+                ("telegram_user", telegram_id),
+                partial(invalidate_telegram_user, telegram_id),
+            )
+        track_write(self.db, user_id)
+
+    async def get_principal(self, user_id: uuid.UUID) -> UserRead | None:
+        """Get a user as a read-only principal, from the cache when possible."""
+        principal = await principal_cache.get(user_id)
+        if principal is not None:
+            return principal
+        
+        user = await self.get_by_id(user_id)
+        if not user:
+            return None
+        
+        principal = UserRead.model_validate(user)
+        await principal_cache.set(user_id, principal)
+        return principal
+
+    async def update(self, obj: User) -> User:
+        """Update a user."""
+        obj = await super().update(obj)
+        self.track_change(obj.id)
+        return obj
+
+    async def delete(self, obj: User) -> None:
+        """Delete a user."""
+        await super().delete(obj)
+        self.track_change(obj.id, obj.telegram_id)
+
     async def get_by_email(self, email: str) -> User | None:
         """Get user by email."""
         result = await self.db.execute(select(User).where(User.email == email))
@@ -27,6 +157,27 @@ class UserRepository(BaseRepository[User]):
         )
         return result.scalar_one_or_none()
 
+    async def get_or_create_by_telegram_id(self, telegram_id: int, display_name: str) -> uuid.UUID:
+        """ID of the user with a Telegram ID, inserting a bot-only user if there is none.
+
+        The insert skips on conflict, so a user created concurrently by another
+        process is found instead of failing on the unique constraint.
+        """
+        user_id = (
+            await self.db.execute(
+                pg_insert(User)
+                .values(display_name=display_name, telegram_id=telegram_id)
+                .on_conflict_do_nothing(index_elements=[User.telegram_id])
+                .returning(User.id)
+            )
+        ).scalar_one_or_none()
+        if user_id is not None:
+            return user_id
+        
+        return (
+            await self.db.execute(select(User.id).where(User.telegram_id == telegram_id))
+        ).scalar_one()
+
     async def create_user(
         self,
         email: str | None,
@@ -0,0 +1,63 @@
+"""Analytics Pydantic schemas."""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pydantic
+
+from app.models.transaction import TransactionType
+
+
+class CategorySummary(pydantic.BaseModel):
+    """Totals for one category and type."""
+
+    category_id: uuid.UUID | None
+    name: str | None
+    icon: str | None
+    color: str | None
+    type: TransactionType
+    total: Decimal
+    count: int
+
+
+class MonthlySummary(pydantic.BaseModel):
+    """Totals for one calendar month."""
+
+    month: date
+    income: Decimal = Decimal(0)
+    expense: Decimal = Decimal(0)
+    count: int = 0
+
+
+class CurrencyTotals(pydantic.BaseModel):
+    """Income/expense totals in one currency."""
+
+    currency: str
+    total_income: Decimal = Decimal(0)
+    total_expenses: Decimal = Decimal(0)
+    balance: Decimal = Decimal(0)
+    income_count: int = 0
+    expense_count: int = 0
+
+
+class AnalyticsSummary(pydantic.BaseModel):
+    """Income/expense summary for a date range.
+
+    Totals, categories and months only cover transactions in ``currency``,
+    the user's default; transactions in other currencies are totalled
+    separately in ``other_currencies``.
+    """
+
+    start_date: date | None
+    end_date: date | None
+    currency: str
+    total_income: Decimal = Decimal(0)
+    total_expenses: Decimal = Decimal(0)
+    balance: Decimal = Decimal(0)
+    income_count: int = 0
+    expense_count: int = 0
+    transaction_count: int = 0
+    categories: list[CategorySummary] = pydantic.Field(default_factory=list)
+    months: list[MonthlySummary] = pydantic.Field(default_factory=list)
+    other_currencies: list[CurrencyTotals] = pydantic.Field(default_factory=list)
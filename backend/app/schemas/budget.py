@@ -0,0 +1,31 @@
+"""Budget Pydantic schemas."""
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pydantic
+
+
+class CategoryBudgetStatus(pydantic.BaseModel):
+    """Spending against one category's monthly limit."""
+
+    category_id: uuid.UUID
+    name: str
+    icon: str
+    color: str
+    monthly_limit: Decimal
+    spent: Decimal
+    remaining: Decimal
+    percent_used: Decimal
+    is_over_budget: bool
+
+
+class BudgetStatus(pydantic.BaseModel):
+    """Spending against every category with a monthly limit."""
+
+    month: date
+    total_limit: Decimal = Decimal(0)
+    total_spent: Decimal = Decimal(0)
+    total_remaining: Decimal = Decimal(0)
+    categories: list[CategoryBudgetStatus] = pydantic.Field(default_factory=list)
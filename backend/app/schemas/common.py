@@ -11,10 +11,20 @@ class PaginatedResponse(pydantic.BaseModel, Generic[T]):
     """Paginated response schema."""
 
     items: list[T]
-    total: int
+    total: int | None
     page: int = pydantic.Field(..., ge=1)
     page_size: int = pydantic.Field(..., ge=1, le=100)
-    total_pages: int
+    total_pages: int | None
+    has_more: bool = False
+
+
+class CursorPaginatedResponse(pydantic.BaseModel, Generic[T]):
+    """Cursor (keyset) paginated response schema."""
+
+    items: list[T]
+    page_size: int = pydantic.Field(..., ge=1, le=100)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class MessageResponse(pydantic.BaseModel):
@@ -0,0 +1,59 @@
+"""Statement import Pydantic schemas."""
+
+import uuid
+from datetime import datetime
+from enum import Enum
+
+import pydantic
+
+from app.models.transaction import TransactionType
+
+
+class ImportFormat(str, Enum):
+    """Supported statement file formats."""
+
+    CSV = "csv"
+    OFX = "ofx"
+    QIF = "qif"
+
+
+class ImportJobStatus(str, Enum):
+    """Lifecycle of an import job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class CsvColumnMapping(pydantic.BaseModel):
+    """Maps CSV header names to transaction fields."""
+
+    date: str = "date"
+    amount: str = "amount"
+    description: str = "description"
+    category: str | None = "category"
+    type: str | None = None
+    date_format: str = "%Y-%m-%d"
+    decimal_separator: str = pydantic.Field(default=".", pattern=r"^[.,]$")
+    # When set, amounts are taken as absolute values of this type
+    default_type: TransactionType | None = None
+    delimiter: str = pydantic.Field(default=",", min_length=1, max_length=1)
+
+
+class ImportJobRead(pydantic.BaseModel):
+    """Progress and outcome of an import job."""
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    status: ImportJobStatus = ImportJobStatus.PENDING
+    format: ImportFormat
+    filename: str | None = None
+    processed: int = 0
+    imported: int = 0
+    duplicates: int = 0  # OFX entries already imported by an earlier upload
+    failed: int = 0
+    errors: list[str] = pydantic.Field(default_factory=list)
+    error: str | None = None
+    created_at: datetime
+    finished_at: datetime | None = None
@@ -3,12 +3,21 @@
 import uuid
 from datetime import date, datetime
 from decimal import Decimal
+from enum import Enum
+from typing import Any
 
 import pydantic
 
 from app.models.transaction import TransactionType
 
 
+class ExportFormat(str, Enum):
+    """Transaction export formats."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+
+
 class TransactionBase(pydantic.BaseModel):
     """Base transaction schema."""
 
@@ -46,3 +55,34 @@ class TransactionUpdate(pydantic.BaseModel):
     description: str | None = pydantic.Field(None, min_length=1, max_length=500)
     category_id: uuid.UUID | None = None
     transaction_date: date | None = None
+
+
+class TransactionBatchCreate(pydantic.BaseModel):
+    """Schema for creating transactions in bulk.
+
+    Items are validated one by one so a bad item is reported instead of
+    rejecting the whole batch.
+    """
+
+    items: list[dict[str, Any]] = pydantic.Field(..., min_length=1, max_length=5000)
+
+
+class TransactionBatchCreated(pydantic.BaseModel):
+    """A batch item that was created."""
+
+    index: int
+    id: uuid.UUID
+
+
+class TransactionBatchError(pydantic.BaseModel):
+    """A batch item that was rejected."""
+
+    index: int
+    errors: list[str]
+
+
+class TransactionBatchResult(pydantic.BaseModel):
+    """Outcome of a bulk creation, reported per item."""
+
+    created: list[TransactionBatchCreated]
+    errors: list[TransactionBatchError]
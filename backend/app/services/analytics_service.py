@@ -0,0 +1,110 @@
+"""Analytics service for aggregated transaction summaries."""
+
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.transaction import TransactionType
+from app.repositories.monthly_rollup_repo import MonthlyRollupRepository
+from app.repositories.transaction_repo import (
+    GROUPING_BY_CATEGORY,
+    GROUPING_BY_MONTH,
+    GROUPING_TYPE_TOTAL,
+    TransactionRepository,
+)
+from app.schemas.analytics import (
+    AnalyticsSummary,
+    CategorySummary,
+    CurrencyTotals,
+    MonthlySummary,
+)
+
+
+class AnalyticsService:
+    """Build summaries from SQL aggregates instead of transaction rows."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.transaction_repo = TransactionRepository(db)
+        self.rollup_repo = MonthlyRollupRepository(db)
+
+    @staticmethod
+    def _covers_whole_months(start_date: date | None, end_date: date | None) -> bool:
+        """Whether a range starts and ends on month boundaries (or is open)."""
+        starts_on_month = start_date is None or start_date.day == 1
+        ends_on_month = end_date is None or (end_date + timedelta(days=1)).day == 1
+        return starts_on_month and ends_on_month
+
+    @staticmethod
+    def _add_type_total(totals: AnalyticsSummary | CurrencyTotals, row: Row) -> None:
+        """Fill in the income or expense total from a per-type aggregate row."""
+        if row.type == TransactionType.INCOME:
+            totals.total_income = row.total
+            totals.income_count = row.count
+        else:
+            totals.total_expenses = row.total
+            totals.expense_count = row.count
+        totals.balance = totals.total_income - totals.total_expenses
+
+    async def get_summary(
+        self,
+        user_id: uuid.UUID,
+        currency: str,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> AnalyticsSummary:
+        """Summarize a user's transactions for a date range.
+
+        Ranges made of whole months are read from the monthly rollups; other
+        ranges are aggregated from the transactions themselves. The summary
+        is in ``currency``; other currencies only get their totals.
+        """
+        if self._covers_whole_months(start_date, end_date):
+            rows = await self.rollup_repo.summarize(
+                user_id,
+                start_month=start_date,
+                end_month=end_date.replace(day=1) if end_date else None,
+            )
+        else:
+            rows = await self.transaction_repo.summarize(user_id, start_date, end_date)
+        
+        summary = AnalyticsSummary(start_date=start_date, end_date=end_date, currency=currency)
+        months: dict[date, MonthlySummary] = {}
+        other_currencies: dict[str, CurrencyTotals] = {}
+        
+        for row in rows:
+            if row.currency != currency:
+                # Other currencies can't be added to these totals; report them apart
+                if row.grouping_set == GROUPING_TYPE_TOTAL:
+                    totals = other_currencies.setdefault(
+                        row.currency, CurrencyTotals(currency=row.currency)
+                    )
+                    self._add_type_total(totals, row)
+            elif row.grouping_set == GROUPING_TYPE_TOTAL:
+                self._add_type_total(summary, row)
+            elif row.grouping_set == GROUPING_BY_CATEGORY:
+                summary.categories.append(CategorySummary(
+                    category_id=row.category_id,
+                    name=row.name,
+                    icon=row.icon,
+                    color=row.color,
+                    type=row.type,
+                    total=row.total,
+                    count=row.count,
+                ))
+            elif row.grouping_set == GROUPING_BY_MONTH:
+                month = months.setdefault(row.month, MonthlySummary(month=row.month))
+                if row.type == TransactionType.INCOME:
+                    month.income = row.total
+                else:
+                    month.expense = row.total
+                month.count += row.count
+        
+        summary.transaction_count = summary.income_count + summary.expense_count
+        summary.categories.sort(key=lambda category: category.total, reverse=True)
+        summary.months = [months[key] for key in sorted(months)]
+        summary.other_currencies = [other_currencies[key] for key in sorted(other_currencies)]
+        
+        return summary
@@ -0,0 +1,53 @@
+"""Budget service for evaluating category monthly limits."""
+
+import uuid
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import budget_status_cache
+from app.repositories.category_repo import CategoryRepository
+from app.schemas.budget import BudgetStatus, CategoryBudgetStatus
+
+
+class BudgetService:
+    """Evaluate spending against category monthly limits."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.category_repo = CategoryRepository(db)
+
+    async def get_status(self, user_id: uuid.UUID, month: date | None = None) -> BudgetStatus:
+        """Get budget status for the month containing ``month`` (default: this month)."""
+        month = (month or date.today()).replace(day=1)
+        field = month.isoformat()
+        
+        cached = await budget_status_cache.get(user_id, field)
+        if cached is not None:
+            return BudgetStatus.model_validate(cached)
+        
+        generation = await budget_status_cache.generation(user_id)
+        rows = await self.category_repo.get_budget_usage(user_id, month)
+        
+        status = BudgetStatus(month=month)
+        for row in rows:
+            status.categories.append(
+                CategoryBudgetStatus(
+                    category_id=row.id,
+                    name=row.name,
+                    icon=row.icon,
+                    color=row.color,
+                    monthly_limit=row.monthly_limit,
+                    spent=row.spent,
+                    remaining=row.remaining,
+                    percent_used=row.percent_used,
+                    is_over_budget=row.spent > row.monthly_limit,
+                )
+            )
+            status.total_limit += row.monthly_limit
+            status.total_spent += row.spent
+        status.total_remaining = status.total_limit - status.total_spent
+        
+        if generation is not None:
+            await budget_status_cache.set(user_id, field, status.model_dump(mode="json"), generation)
+        return status
@@ -0,0 +1,310 @@
+"""Statement import jobs.
+
+An import streams the uploaded file through a parser, COPYs the rows into a
+temporary staging table in chunks, and merges the staging table into
+``transactions`` with a single INSERT ... SELECT that also updates monthly
+rollups. Job progress is tracked in Redis.
+
+Transaction IDs are derived from each entry's reference. An OFX FITID
+identifies the entry across downloads, so its ID is derived from the user
+and the FITID and re-uploading an overlapping statement skips the entries
+already imported. Other entries only have their line in the file, so their
+IDs are derived from the job: identical entries on different lines are all
+kept, and nothing is deduplicated across uploads.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import (
+    Column,
+    Date,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    Text,
+    Uuid,
+    cast,
+    func,
+    select,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
+
+from app.core.cache import invalidate_transaction_caches
+from app.core.redis import get_redis_client
+from app.db.routing import note_write
+from app.db.session import async_session_maker
+from app.imports.parsers import StatementParseError, StatementRecord, parse_statement
+from app.models.transaction import Transaction, TransactionType
+from app.repositories.category_repo import CategoryRepository
+from app.repositories.monthly_rollup_repo import MonthlyRollupRepository
+from app.repositories.user_repo import UserRepository
+from app.schemas.statement_import import (
+    CsvColumnMapping,
+    ImportFormat,
+    ImportJobRead,
+    ImportJobStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+IMPORT_JOB_PREFIX = "import_job:"
+IMPORT_JOB_EXPIRE_SECONDS = 86400  # 24 hours
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 50
+DEFAULT_CURRENCY = "MXN"  # for users that no longer exist
+STABLE_REFERENCE_PREFIX = "fitid:"  # references that identify an entry across uploads
+
+# Job status message for unexpected failures; details only go to the log
+IMPORT_FAILED_MESSAGE = "The import failed unexpectedly. Please try again."
+
+# Per-transaction staging table; dropped automatically when the import commits
+import_staging = Table(
+    "import_staging",
+    MetaData(),
+    Column("id", Uuid, nullable=False),
+    Column("user_id", Uuid, nullable=False),
+    Column("category_id", Uuid, nullable=True),
+    Column("type", Text, nullable=False),
+    Column("amount", Numeric(12, 2), nullable=False),
+    Column("currency", String(3), nullable=False),
+    Column("description", String(500), nullable=False),
+    Column("transaction_date", Date, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+STAGING_COLUMNS = [column.name for column in import_staging.columns]
+
+
+class ImportService:
+    """Service for statement import jobs."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.category_repo = CategoryRepository(db)
+
+    async def create_job(
+        self, user_id: uuid.UUID, file_format: ImportFormat, filename: str | None
+    ) -> ImportJobRead:
+        """Register a pending import job."""
+        job = ImportJobRead(
+            id=uuid.uuid4(),
+            user_id=user_id,
+            format=file_format,
+            filename=filename,
+            created_at=datetime.now(timezone.utc),
+        )
+        await self._save_job(job)
+        return job
+
+    @staticmethod
+    async def get_job(job_id: uuid.UUID, user_id: uuid.UUID) -> ImportJobRead | None:
+        """Get an import job if it belongs to the user."""
+        redis = await get_redis_client()
+        raw = await redis.get(f"{IMPORT_JOB_PREFIX}{job_id}")
+        if not raw:
+            return None
+        
+        job = ImportJobRead.model_validate_json(raw)
+        return job if job.user_id == user_id else None
+
+    async def run_job(
+        self,
+        job: ImportJobRead,
+        path: str,
+        mapping: CsvColumnMapping | None = None,
+    ) -> None:
+        """Import a statement file into the job owner's transactions."""
+        job.status = ImportJobStatus.RUNNING
+        await self._save_job(job)
+        
+        try:
+            staged = await self._stage(job, path, mapping)
+            job.imported = await self._merge(job.user_id)
+            job.duplicates = staged - job.imported
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            logger.exception("Import job %s failed", job.id)
+            job.status = ImportJobStatus.FAILED
+            job.error = IMPORT_FAILED_MESSAGE
+        else:
+            job.status = ImportJobStatus.COMPLETED
+            await invalidate_transaction_caches(job.user_id)
+            await note_write(job.user_id)
+        
+        job.finished_at = datetime.now(timezone.utc)
+        await self._save_job(job)
+
+    async def _stage(
+        self, job: ImportJobRead, path: str, mapping: CsvColumnMapping | None
+    ) -> int:
+        """Parse the file chunk by chunk and COPY valid rows into staging."""
+        category_ids = await self._category_lookup(job.user_id)
+        owner = await UserRepository(self.db).get_principal(job.user_id)
+        default_currency = owner.default_currency if owner else DEFAULT_CURRENCY
+        
+        connection = await self.db.connection()
+        await connection.execute(CreateTable(import_staging))
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        
+        staged = 0
+        with open(path, encoding="utf-8-sig", errors="replace", newline="") as stream:
+            entries = parse_statement(stream, job.format, mapping)
+            
+            while True:
+                # Parsing is CPU-bound; keep it off the event loop
+                chunk = await asyncio.to_thread(
+                    list, itertools.islice(entries, IMPORT_CHUNK_SIZE)
+                )
+                if not chunk:
+                    break
+                
+                records = []
+                for entry in chunk:
+                    if isinstance(entry, StatementParseError):
+                        job.failed += 1
+                        if len(job.errors) < MAX_REPORTED_ERRORS:
+                            job.errors.append(str(entry))
+                        continue
+                    records.append(
+                        self._staging_record(job, entry, category_ids, default_currency)
+                    )
+                
+                if records:
+                    await driver_connection.copy_records_to_table(
+                        import_staging.name, records=records, columns=STAGING_COLUMNS
+                    )
+                    staged += len(records)
+                
+                job.processed += len(chunk)
+                await self._save_job(job)
+        
+        return staged
+
+    async def _merge(self, user_id: uuid.UUID) -> int:
+        """Move staged rows into transactions, skipping IDs that were already imported."""
+        staged = import_staging.c
+        staged_type = cast(staged.type, Transaction.__table__.c.type.type)
+        
+        columns = [
+            "id",
+            "user_id",
+            "category_id",
+            "type",
+            "amount",
+            "currency",
+            "description",
+            "transaction_date",
+            "created_at",
+            "updated_at",
+        ]
+        source = select(
+            staged.id,
+            staged.user_id,
+            staged.category_id,
+            staged_type,
+            staged.amount,
+            staged.currency,
+            staged.description,
+            staged.transaction_date,
+            func.now(),
+            func.now(),
+        ).where(staged.user_id == user_id)
+        
+        # Monthly rollups are updated from the inserted rows in the same statement
+        inserted = (
+            pg_insert(Transaction)
+            .from_select(columns, source)
+            .on_conflict_do_nothing(index_elements=[Transaction.id])
+            .returning(
+                Transaction.user_id,
+                Transaction.transaction_date,
+                Transaction.type,
+                Transaction.category_id,
+                Transaction.currency,
+                Transaction.amount,
+            )
+            .cte("inserted")
+        )
+        rolled_up = MonthlyRollupRepository.upsert_from_select(
+            MonthlyRollupRepository.aggregate(inserted)
+        ).cte("rolled_up")
+        
+        result = await self.db.execute(
+            select(func.count()).select_from(inserted).add_cte(rolled_up)
+        )
+        return result.scalar_one()
+
+    async def _category_lookup(
+        self, user_id: uuid.UUID
+    ) -> dict[tuple[TransactionType, str], uuid.UUID]:
+        """Map (type, lowercase name) to category ID for the user's categories."""
+        categories = await self.category_repo.get_user_categories(user_id)
+        lookup: dict[tuple[TransactionType, str], uuid.UUID] = {}
+        for category in categories:
+            # User categories sort after system ones and take precedence
+            lookup[(category.type, category.name.lower())] = category.id
+        return lookup
+
+    @staticmethod
+    def _staging_record(
+        job: ImportJobRead,
+        record: StatementRecord,
+        category_ids: dict[tuple[TransactionType, str], uuid.UUID],
+        default_currency: str,
+    ) -> tuple:
+        """Build a staging row in STAGING_COLUMNS order.
+
+        The currency is the statement's, or else the user's default.
+        """
+        category_id = None
+        if record.category:
+            category_id = category_ids.get((record.type, record.category.lower()))
+        
+        # FITIDs are stable across downloads; line numbers only mean something in this file
+        if record.reference.startswith(STABLE_REFERENCE_PREFIX):
+            namespace = job.user_id
+        else:
+            namespace = job.id
+        
+        return (
+            uuid.uuid5(namespace, record.reference),
+            job.user_id,
+            category_id,
+            # Enum columns store member names
+            record.type.name,
+            record.amount,
+            record.currency or default_currency,
+            record.description,
+            record.transaction_date,
+        )
+
+    async def _save_job(self, job: ImportJobRead) -> None:
+        """Persist job state."""
+        redis = await get_redis_client()
+        await redis.set(
+            f"{IMPORT_JOB_PREFIX}{job.id}",
+            job.model_dump_json(),
+            ex=IMPORT_JOB_EXPIRE_SECONDS,
+        )
+
+
+async def run_import_job(
+    job: ImportJobRead, path: str, mapping: CsvColumnMapping | None = None
+) -> None:
+    """Run an import job on its own session and remove the uploaded file."""
+    try:
+        async with async_session_maker() as db:
+            await ImportService(db).run_job(job, path, mapping)
+    finally:
+        os.unlink(path)
@@ -0,0 +1,147 @@
+"""Category suggestions learned from each user's own history."""
+
+import re
+import uuid
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+
+import pydantic
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.core.cache import LayeredUserCache
+from app.core.keyword_index import normalize
+from app.repositories.category_snapshots import CategorySnapshot
+from app.repositories.transaction_repo import TransactionRepository
+
+settings = get_settings()
+
+WORD = re.compile(r"[^\W\d_]{2,}")
+
+# Words that say nothing about the category
+STOPWORDS = frozenset({
+    "a", "an", "and", "at", "for", "from", "in", "of", "on", "the", "to", "with",
+    "al", "con", "de", "del", "el", "en", "la", "las", "los", "para", "por", "un", "una", "y",
+})
+
+
+def tokenize(description: str) -> list[str]:
+    """Distinct normalized words of a description, in order."""
+    words = WORD.findall(normalize(description))
+    return list(dict.fromkeys(word for word in words if word not in STOPWORDS))
+
+
+class SuggestionIndex(pydantic.BaseModel):
+    """How often each description word went with each category, for one user."""
+
+    tokens: dict[str, dict[uuid.UUID, int]] = pydantic.Field(default_factory=dict)
+
+    def learn(self, description: str, category_id: uuid.UUID) -> None:
+        """Count one categorized description."""
+        for token in tokenize(description):
+            counts = self.tokens.setdefault(token, {})
+            counts[category_id] = counts.get(category_id, 0) + 1
+        
+        if len(self.tokens) > settings.category_suggestion_max_tokens:
+            # Forget the rarest words, with headroom so this doesn't run on every word
+            keep = settings.category_suggestion_max_tokens * 3 // 4
+            ranked = sorted(self.tokens.items(), key=lambda item: sum(item[1].values()), reverse=True)
+            self.tokens = dict(ranked[:keep])
+
+    def votes(self, description: str) -> dict[uuid.UUID, int]:
+        """Past uses of each category across the description's known words."""
+        votes: dict[uuid.UUID, int] = {}
+        for token in tokenize(description):
+            for category_id, count in self.tokens.get(token, {}).items():
+                votes[category_id] = votes.get(category_id, 0) + count
+        return votes
+
+
+@dataclass
+class Suggestion:
+    """Categories ranked by likelihood, and the one to assign if confident."""
+
+    ranked: list[CategorySnapshot]
+    confident: CategorySnapshot | None = None
+
+
+# Per-user indexes; bot writes update them in place, other edits show up when they expire
+suggestion_indexes: LayeredUserCache[SuggestionIndex] = LayeredUserCache(
+    "category_suggestions",
+    pydantic.TypeAdapter(SuggestionIndex),
+    ttl_seconds=settings.category_suggestion_cache_ttl_seconds,
+    local_ttl_seconds=settings.category_suggestion_local_ttl_seconds,
+    local_maxsize=settings.category_suggestion_local_maxsize,
+)
+
+
+class SuggestionService:
+    """Suggest categories for a description from the user's past transactions.
+
+    The index is built from the user's most recent categorized transactions
+    on first use and cached; transactions logged afterwards are added to the
+    cached index with ``learn`` instead of rebuilding it.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.transaction_repo = TransactionRepository(db)
+
+    async def get_index(self, user_id: uuid.UUID) -> SuggestionIndex:
+        """The user's index, built from their history on a cache miss."""
+        index = await suggestion_indexes.get(user_id)
+        if index is not None:
+            return index
+        
+        index = SuggestionIndex()
+        history = await self.transaction_repo.get_categorized_descriptions(
+            user_id, limit=settings.category_suggestion_history_size
+        )
+        for description, category_id in history:
+            index.learn(description, category_id)
+        
+        await suggestion_indexes.set(user_id, index)
+        return index
+
+    async def suggest(
+        self, user_id: uuid.UUID, description: str, categories: Sequence[CategorySnapshot]
+    ) -> Suggestion:
+        """Rank ``categories`` for a description, most likely first.
+
+        Categories the user never used for these words keep their order after
+        the scored ones. The top one is ``confident`` when it holds at least
+        ``category_suggestion_min_share`` of the votes and has been used for
+        these words at least ``category_suggestion_min_support`` times.
+        """
+        index = await self.get_index(user_id)
+        votes = index.votes(description)
+        
+        # Only categories still offered for this transaction count
+        candidates = {category.id: category for category in categories}
+        votes = {category_id: count for category_id, count in votes.items() if category_id in candidates}
+        if not votes:
+            return Suggestion(ranked=list(categories))
+        
+        ranked = sorted(categories, key=lambda category: -votes.get(category.id, 0))
+        best = ranked[0]
+        support = votes[best.id]
+        confident = (
+            support >= settings.category_suggestion_min_support
+            and support / sum(votes.values()) >= settings.category_suggestion_min_share
+        )
+        return Suggestion(ranked=ranked, confident=best if confident else None)
+
+    @staticmethod
+    async def learn(user_id: uuid.UUID, entries: Iterable[tuple[str, uuid.UUID]]) -> None:
+        """Add categorized descriptions to the user's cached index, if there is one.
+
+        Without a cached index there is nothing to do: the next ``suggest``
+        builds it from the database, new transactions included.
+        """
+        index = await suggestion_indexes.get(user_id)
+        if index is None:
+            return
+        
+        for description, category_id in entries:
+            index.learn(description, category_id)
+        await suggestion_indexes.set(user_id, index)
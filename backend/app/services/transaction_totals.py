@@ -0,0 +1,122 @@
+"""Strategies for counting a user's filtered transactions."""
+
+import json
+import uuid
+from datetime import date
+from enum import Enum
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.core.cache import transaction_count_cache
+from app.db.session import async_session_maker
+from app.models.transaction import Transaction, TransactionType
+from app.repositories.transaction_repo import TransactionRepository
+
+settings = get_settings()
+
+
+class TotalStrategy(str, Enum):
+    """How the total of a transaction listing is computed."""
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
+    NONE = "none"
+
+
+class TransactionTotalsService:
+    """Compute listing totals on a dedicated session.
+
+    Using its own session lets the count run concurrently with the page query,
+    which is bound to the request's session.
+    """
+
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession] = async_session_maker):
+        self.session_maker = session_maker
+
+    async def count(
+        self,
+        strategy: TotalStrategy,
+        user_id: uuid.UUID,
+        transaction_type: TransactionType | None = None,
+        category_id: uuid.UUID | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> int | None:
+        """Count transactions matching the filters using the given strategy."""
+        if strategy == TotalStrategy.NONE:
+            return None
+        
+        filters = {
+            "transaction_type": transaction_type,
+            "category_id": category_id,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        
+        if strategy == TotalStrategy.CACHED:
+            field = self._cache_field(**filters)
+            cached = await transaction_count_cache.get(user_id, field)
+            if cached is not None:
+                return cached
+            
+            # Read before counting, so a write that commits mid-count keeps
+            # this total out of the cache
+            generation = await transaction_count_cache.generation(user_id)
+            total = await self._exact(user_id, **filters)
+            if generation is not None:
+                await transaction_count_cache.set(user_id, field, total, generation)
+            return total
+        
+        if strategy == TotalStrategy.ESTIMATED:
+            estimate = await self._estimate(user_id, **filters)
+            # Planner estimates are coarse for small result sets, where an
+            # exact count is cheap anyway
+            if estimate >= settings.transaction_count_exact_threshold:
+                return estimate
+        
+        return await self._exact(user_id, **filters)
+
+    async def _exact(self, user_id: uuid.UUID, **filters: object) -> int:
+        """Run a full COUNT(*) for the filters."""
+        async with self.session_maker() as session:
+            return await TransactionRepository(session).count_by_user(user_id, **filters)
+
+    async def _estimate(self, user_id: uuid.UUID, **filters: object) -> int:
+        """Read the planner's row estimate for the filtered listing."""
+        query = TransactionRepository._apply_filters(
+            select(Transaction.id), user_id, **filters
+        )
+        async with self.session_maker() as session:
+            # Filter values are typed (UUID, enum, date), so rendering them
+            # inline is safe and keeps EXPLAIN a single statement
+            compiled = query.compile(
+                dialect=session.bind.dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+            result = await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+            plan = result.scalar_one()
+        
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @staticmethod
+    def _cache_field(
+        transaction_type: TransactionType | None,
+        category_id: uuid.UUID | None,
+        start_date: date | None,
+        end_date: date | None,
+    ) -> str:
+        """Build the cache field identifying a filter combination."""
+        return ":".join(
+            str(value) if value is not None else ""
+            for value in (
+                transaction_type.value if transaction_type else None,
+                category_id,
+                start_date,
+                end_date,
+            )
+        )
@@ -2,13 +2,19 @@
 import random
 import string
 import uuid
+from functools import partial
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.core.cache import invalidate_transaction_caches
 from app.core.redis import get_redis_client
+from app.db.events import on_commit
+from app.repositories.category_repo import invalidate_category_caches
+from app.repositories.monthly_rollup_repo import MonthlyRollupRepository
 from app.repositories.user_repo import UserRepository
 from app.repositories.transaction_repo import TransactionRepository
+from app.services.suggestion_service import suggestion_indexes
 
 LINK_CODE_PREFIX = "link_code:"
 LINK_CODE_EXPIRE_SECONDS = 300  # 5 minutes
@@ -19,6 +25,7 @@ class UserService:
         self.db = db
         self.user_repo = UserRepository(db)
         self.transaction_repo = TransactionRepository(db)
+        self.rollup_repo = MonthlyRollupRepository(db)
 
     async def generate_link_code(self, user_id: uuid.UUID) -> str:
         """Generate a short-lived code to link Telegram account."""
@@ -68,6 +75,7 @@ class UserService:
                 .where(Transaction.user_id == existing_bot_user.id)
                 .values(user_id=web_user.id)
             )
+            await self.rollup_repo.merge_user(existing_bot_user.id, web_user.id)
             
             # Delete the old bot user
             # Note: We might need to handle other relations like Categories. 
@@ -87,9 +95,34 @@ class UserService:
                 delete(existing_bot_user.__class__)
                 .where(existing_bot_user.__class__.id == existing_bot_user.id)
             )
+            
+            # Moved transactions and categories change the web user's cached data
+            on_commit(
+                self.db,
+                ("transactions", web_user.id),
+                partial(invalidate_transaction_caches, web_user.id),
+            )
+            on_commit(
+                self.db,
+                ("categories", web_user.id),
+                partial(invalidate_category_caches, web_user.id),
+            )
+            # Both users' suggestion indexes were learned from the moved transactions
+            for merged_user_id in (existing_bot_user.id, web_user.id):
+                on_commit(
+                    self.db,
+                    ("category_suggestions", merged_user_id),
+                    partial(suggestion_indexes.invalidate, merged_user_id),
+                )
+            self.user_repo.track_change(existing_bot_user.id, telegram_id)
 
-        # Update the web user with the telegram_id
+        # Update the web user with the telegram_id; a Telegram ID it was linked
+        # to before no longer resolves to it
+        previous_telegram_id = web_user.telegram_id
         web_user.telegram_id = telegram_id
+        self.user_repo.track_change(web_user.id, telegram_id)
+        if previous_telegram_id is not None:
+            self.user_repo.track_change(web_user.id, previous_telegram_id)
         await self.db.commit()
         
         # Invalidate code
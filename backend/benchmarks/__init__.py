@@ -0,0 +1 @@
+"""Benchmarks against a local Postgres filled with synthetic data."""
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Generate synthetic users and transactions for benchmarks.
+
+Usage: python -m benchmarks.generate_data [--users N] [--transactions M] [--months K] [--seed S] [--reset]
+
+Users get ``bench-<n>@bench.centavo.local`` emails and share one password, so
+the benchmark runner can log in as any of them and ``--reset`` can remove
+them (transactions and rollups go with them through ON DELETE CASCADE).
+Transactions are written with ``TransactionRepository.bulk_create``, which
+also keeps the monthly rollups in step.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import delete, insert, select
+
+from app.core.redis import close_redis
+from app.core.security import hash_password
+from app.db.session import async_session_maker
+from app.models.category import Category
+from app.models.transaction import TransactionType
+from app.models.user import User
+from app.repositories.transaction_repo import TransactionRepository
+
+EMAIL_DOMAIN = "bench.centavo.local"
+PASSWORD = "benchmark-password"
+
+# Rows per transaction (commit); bulk_create splits them into INSERTs itself
+COMMIT_BATCH_SIZE = 10_000
+
+# Share of expenses logged without a category
+UNCATEGORIZED_RATE = 0.03
+
+# Share of transactions that are income
+INCOME_RATE = 0.08
+
+# Weekends see more spending than weekdays
+WEEKEND_WEIGHT = 1.4
+
+
+@dataclass(frozen=True)
+class CategoryProfile:
+    """How often a system category is used and what amounts it sees."""
+
+    weight: float
+    median_amount: float
+    spread: float  # sigma of the log-normal amount distribution
+    descriptions: tuple[str, ...]
+
+
+EXPENSE_PROFILES = {
+    "Food & Dining": CategoryProfile(30, 180, 0.6, ("lunch", "dinner", "tacos", "coffee", "pizza")),
+    "Groceries": CategoryProfile(20, 650, 0.7, ("groceries", "supermarket", "market", "walmart")),
+    "Transportation": CategoryProfile(18, 90, 0.8, ("uber", "taxi", "metro", "gas", "parking")),
+    "Shopping": CategoryProfile(8, 450, 0.9, ("amazon", "clothes", "shoes", "store")),
+    "Entertainment": CategoryProfile(6, 250, 0.7, ("movie", "netflix", "concert", "games")),
+    "Bills & Utilities": CategoryProfile(5, 900, 0.5, ("electricity", "internet", "phone", "water")),
+    "Healthcare": CategoryProfile(3, 500, 0.9, ("pharmacy", "doctor", "dentist")),
+    "Education": CategoryProfile(2, 1200, 0.8, ("course", "books", "tuition")),
+    "Travel": CategoryProfile(1, 3500, 0.9, ("flight", "hotel", "bus tickets")),
+    "Other": CategoryProfile(4, 200, 1.0, ("misc", "gift", "donation")),
+}
+
+INCOME_PROFILES = {
+    "Salary": CategoryProfile(60, 18000, 0.2, ("salary", "payroll")),
+    "Freelance": CategoryProfile(20, 4000, 0.6, ("freelance", "client payment")),
+    "Investment": CategoryProfile(8, 800, 0.8, ("dividends", "interest")),
+    "Gift": CategoryProfile(4, 1000, 0.7, ("gift",)),
+    "Refund": CategoryProfile(8, 300, 0.8, ("refund", "cashback")),
+}
+
+
+def bench_email(index: int) -> str:
+    """Email of the n-th benchmark user."""
+    return f"bench-{index:05d}@{EMAIL_DOMAIN}"
+
+
+class TransactionFactory:
+    """Random transactions following the category profiles."""
+
+    def __init__(
+        self,
+        rng: random.Random,
+        categories: dict[tuple[str, TransactionType], uuid.UUID],
+        months: int,
+    ):
+        self.rng = rng
+        self.categories = categories
+
+        today = date.today()
+        start = today - timedelta(days=round(months * 30.4))
+        self.days = [start + timedelta(days=n) for n in range((today - start).days + 1)]
+        self.day_weights = [WEEKEND_WEIGHT if d.weekday() >= 5 else 1.0 for d in self.days]
+
+        self.expense_names = list(EXPENSE_PROFILES)
+        self.expense_weights = [p.weight for p in EXPENSE_PROFILES.values()]
+        self.income_names = list(INCOME_PROFILES)
+        self.income_weights = [p.weight for p in INCOME_PROFILES.values()]
+
+    def _amount(self, profile: CategoryProfile) -> Decimal:
+        value = self.rng.lognormvariate(math.log(profile.median_amount), profile.spread)
+        return Decimal(f"{max(value, 1):.2f}")
+
+    def make(self, user_id: uuid.UUID) -> dict[str, Any]:
+        """One transaction row for ``bulk_create``."""
+        if self.rng.random() < INCOME_RATE:
+            transaction_type = TransactionType.INCOME
+            name = self.rng.choices(self.income_names, self.income_weights)[0]
+            profile = INCOME_PROFILES[name]
+        else:
+            transaction_type = TransactionType.EXPENSE
+            name = self.rng.choices(self.expense_names, self.expense_weights)[0]
+            profile = EXPENSE_PROFILES[name]
+
+        category_id = self.categories.get((name, transaction_type))
+        if transaction_type == TransactionType.EXPENSE and self.rng.random() < UNCATEGORIZED_RATE:
+            category_id = None
+
+        return {
+            "user_id": user_id,
+            "type": transaction_type,
+            "amount": self._amount(profile),
+            "currency": "MXN",
+            "description": self.rng.choice(profile.descriptions),
+            "category_id": category_id,
+            "transaction_date": self.rng.choices(self.days, self.day_weights)[0],
+        }
+
+
+async def generate(users: int, transactions: int, months: int, seed: int, reset: bool) -> None:
+    """Create benchmark users and their transactions."""
+    rng = random.Random(seed)
+
+    async with async_session_maker() as session:
+        if reset:
+            result = await session.execute(
+                delete(User).where(User.email.like(f"%@{EMAIL_DOMAIN}"))
+            )
+            await session.commit()
+            print(f"Removed {result.rowcount} benchmark users")
+
+        result = await session.execute(
+            select(Category.id, Category.name, Category.type).where(
+                Category.is_system == True  # noqa: E712
+            )
+        )
+        categories = {(row.name, row.type): row.id for row in result.all()}
+        if not categories:
+            raise SystemExit("No system categories found, run scripts/seed_categories.py first")
+
+        existing = set(
+            (
+                await session.execute(
+                    select(User.email).where(User.email.like(f"%@{EMAIL_DOMAIN}"))
+                )
+            ).scalars()
+        )
+
+        # Argon2 is slow on purpose, so every benchmark user shares one hash
+        hashed_password = hash_password(PASSWORD)
+        new_users = [
+            {
+                "id": uuid.uuid4(),
+                "email": bench_email(index),
+                "hashed_password": hashed_password,
+                "display_name": f"Bench {index}",
+            }
+            for index in range(users)
+            if bench_email(index) not in existing
+        ]
+        if not new_users:
+            print("Benchmark users already exist, use --reset to regenerate them")
+            return
+
+        await session.execute(insert(User), new_users)
+        await session.commit()
+        print(f"Created {len(new_users)} users")
+
+        factory = TransactionFactory(rng, categories, months)
+        repo = TransactionRepository(session)
+        started = time.perf_counter()
+
+        batch: list[dict[str, Any]] = []
+        written = 0
+        for user in new_users:
+            for _ in range(transactions):
+                batch.append(factory.make(user["id"]))
+                if len(batch) >= COMMIT_BATCH_SIZE:
+                    await repo.bulk_create(batch)
+                    await session.commit()
+                    written += len(batch)
+                    batch = []
+                    print(f"  {written} transactions...", end="\r")
+
+        if batch:
+            await repo.bulk_create(batch)
+            await session.commit()
+            written += len(batch)
+
+        elapsed = time.perf_counter() - started
+        print(f"Created {written} transactions in {elapsed:.1f}s ({written / elapsed:.0f}/s)")
+
+    await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--transactions", type=int, default=5000, help="per user")
+    parser.add_argument("--months", type=int, default=12, help="how far back dates go")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reset", action="store_true", help="remove benchmark users first")
+    args = parser.parse_args()
+
+    asyncio.run(generate(args.users, args.transactions, args.months, args.seed, args.reset))
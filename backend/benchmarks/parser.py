@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""Throughput of ExpenseParser on a synthetic corpus of bot messages.
+
+Usage: python -m benchmarks.parser [--messages N] [--rounds R] [--seed S] [--keywords K]
+
+Needs no database. The corpus mixes English and Spanish expenses and income
+in every supported form, plus messages the parser should reject. Results
+are checked against ``ReferenceParser``, a frozen copy of the original
+loop-over-patterns implementation, which is also timed for comparison.
+
+Category detection is then timed on its own against a dictionary grown to
+``--keywords`` merchant names: a substring scan over every keyword versus
+the keyword index.
+"""
+
+import argparse
+import random
+import re
+import time
+from collections.abc import Callable
+from decimal import Decimal
+
+from app.bot.parsers import ExpenseParser, ParsedTransaction
+from app.core.keyword_index import KeywordIndex
+from app.models.transaction import TransactionType
+
+EXPENSE_TEMPLATES = (
+    "{amount} {description}",
+    "${amount} {description}",
+    "spent {amount} on {description}",
+    "spent {amount} {description}",
+    "gasté {amount} en {description}",
+    "Gasté {amount} {description}",
+)
+
+INCOME_TEMPLATES = (
+    "+{amount} {description}",
+    "income {amount} {description}",
+    "ingreso {amount} {description}",
+    "earned {amount} from {description}",
+    "gané {amount} de {description}",
+)
+
+DESCRIPTIONS = (
+    "lunch", "dinner with friends", "uber to work", "groceries", "netflix",
+    "comida", "cena", "gasolina", "ropa nueva", "cine con amigos",
+    "salary", "freelance project", "salario", "venta de garage", "coffee",
+    "on the way home", "de todo un poco", "Amazon order", "tienda", "metro card",
+)
+
+INVALID = (
+    "hello", "how much did I spend?", "lunch 50", "50", "spent on lunch",
+    "/start", "+ 100 salary", "50.5 coffee", "gracias", "👍",
+)
+
+# Share of messages the parser should reject
+INVALID_RATE = 0.1
+
+# Share of messages that are income
+INCOME_RATE = 0.15
+
+
+class ReferenceParser:
+    """The original parser: one uncompiled ``re.match`` per pattern, per call."""
+
+    EXPENSE_PATTERNS_EN = [
+        r"^(\d+(?:\.\d{2})?)\s+(.+)$",
+        r"^\$(\d+(?:\.\d{2})?)\s+(.+)$",
+        r"^spent\s+(\d+(?:\.\d{2})?)\s+(?:on\s+)?(.+)$",
+    ]
+    EXPENSE_PATTERNS_ES = [
+        r"^(\d+(?:\.\d{2})?)\s+(.+)$",
+        r"^\$(\d+(?:\.\d{2})?)\s+(.+)$",
+        r"^gasté\s+(\d+(?:\.\d{2})?)\s+(?:en\s+)?(.+)$",
+    ]
+    INCOME_PATTERNS_EN = [
+        r"^\+(\d+(?:\.\d{2})?)\s+(.+)$",
+        r"^income\s+(\d+(?:\.\d{2})?)\s+(.+)$",
+        r"^earned\s+(\d+(?:\.\d{2})?)\s+(?:from\s+)?(.+)$",
+    ]
+    INCOME_PATTERNS_ES = [
+        r"^\+(\d+(?:\.\d{2})?)\s+(.+)$",
+        r"^ingreso\s+(\d+(?:\.\d{2})?)\s+(.+)$",
+        r"^gané\s+(\d+(?:\.\d{2})?)\s+(?:de\s+)?(.+)$",
+    ]
+
+    def __init__(self, detect_category: Callable[[str], str | None]):
+        self._detect_category = detect_category
+
+    def parse(self, message: str) -> ParsedTransaction | None:
+        message = message.strip().lower()
+        for transaction_type, patterns in (
+            (TransactionType.INCOME, self.INCOME_PATTERNS_EN + self.INCOME_PATTERNS_ES),
+            (TransactionType.EXPENSE, self.EXPENSE_PATTERNS_EN + self.EXPENSE_PATTERNS_ES),
+        ):
+            for pattern in patterns:
+                match = re.match(pattern, message, re.IGNORECASE)
+                if match:
+                    amount_str, description = match.groups()
+                    return ParsedTransaction(
+                        type=transaction_type,
+                        amount=Decimal(amount_str),
+                        description=description.strip(),
+                        category_hint=self._detect_category(description),
+                        raw_message=message,
+                    )
+        return None
+
+
+def build_corpus(size: int, seed: int) -> list[str]:
+    """Messages in the proportions the bot sees them."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        roll = rng.random()
+        if roll < INVALID_RATE:
+            corpus.append(rng.choice(INVALID))
+            continue
+
+        templates = INCOME_TEMPLATES if roll < INVALID_RATE + INCOME_RATE else EXPENSE_TEMPLATES
+        amount = rng.choice((f"{rng.randint(1, 2000)}", f"{rng.randint(1, 500)}.{rng.randint(0, 99):02d}"))
+        corpus.append(rng.choice(templates).format(amount=amount, description=rng.choice(DESCRIPTIONS)))
+    return corpus
+
+
+def best_of(rounds: int, run: Callable[[], object]) -> float:
+    """Fastest of several timed runs, in seconds."""
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def build_keywords(size: int, seed: int) -> dict[str, list[str]]:
+    """A dictionary of made-up merchant names spread over a few categories."""
+    rng = random.Random(seed)
+    syllables = ("ca", "me", "ro", "sa", "li", "to", "na", "ve", "mo", "ri", "ta", "lo")
+    categories = ("food", "groceries", "transport", "shopping", "entertainment", "bills", "health")
+    keywords: dict[str, list[str]] = {category: [] for category in categories}
+    for _ in range(size):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(3, 5)))
+        keywords[rng.choice(categories)].append(name)
+    return keywords
+
+
+def substring_scan(keywords: dict[str, list[str]]) -> Callable[[str], str | None]:
+    """Category detection as the parser originally did it."""
+    def detect(description: str) -> str | None:
+        description = description.lower()
+        for category, words in keywords.items():
+            if any(word in description for word in words):
+                return category
+        return None
+    return detect
+
+
+def main(size: int, rounds: int, seed: int, keyword_count: int) -> None:
+    corpus = build_corpus(size, seed)
+    parser = ExpenseParser()
+    reference = ReferenceParser(parser._detect_category)
+
+    mismatches = [m for m in corpus if parser.parse(m) != reference.parse(m)]
+    if mismatches:
+        raise SystemExit(f"Parsers disagree on {len(mismatches)} messages, e.g. {mismatches[0]!r}")
+
+    timings = {
+        "reference": best_of(rounds, lambda: [reference.parse(m) for m in corpus]),
+        "parse": best_of(rounds, lambda: [parser.parse(m) for m in corpus]),
+        "parse_many": best_of(rounds, lambda: parser.parse_many(corpus)),
+    }
+
+    print(f"{len(corpus)} messages, best of {rounds} rounds")
+    for name, seconds in timings.items():
+        speedup = timings["reference"] / seconds
+        print(f"  {name:<12} {len(corpus) / seconds:>12,.0f} msg/s  {speedup:>5.2f}x")
+
+    keywords = build_keywords(keyword_count, seed)
+    descriptions = list(DESCRIPTIONS) * (size // len(DESCRIPTIONS))
+    scan = substring_scan(keywords)
+    index = KeywordIndex(keywords)
+    detection = {
+        "scan": best_of(rounds, lambda: [scan(d) for d in descriptions]),
+        "index": best_of(rounds, lambda: [index.best(d) for d in descriptions]),
+    }
+
+    print(f"\nCategory detection, {index.size} keywords, {len(descriptions)} descriptions")
+    for name, seconds in detection.items():
+        speedup = detection["scan"] / seconds
+        print(f"  {name:<12} {len(descriptions) / seconds:>12,.0f} desc/s  {speedup:>5.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keywords", type=int, default=5_000)
+    args = parser.parse_args()
+
+    main(args.messages, args.rounds, args.seed, args.keywords)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""Time repository calls and API endpoints against the benchmark dataset.
+
+Usage: python -m benchmarks.run [--iterations N] [--only PREFIX] [--save-baseline]
+
+Run ``python -m benchmarks.generate_data`` first. Results are compared with
+the baseline on disk (``benchmarks/baseline.json`` by default). A benchmark
+regresses when its median is more than ``--tolerance`` slower than the
+baseline and also slower by at least ``--min-delta-ms``. The exit status is
+1 if anything regressed. ``--save-baseline`` writes the current results as
+the new baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.bot.services import BotService
+from app.core.redis import close_redis
+from app.core.security import create_access_token, decode_token, verify_password
+from app.db.session import async_session_maker
+from app.main import app
+from app.models.user import User
+from app.repositories.category_repo import CategoryRepository
+from app.repositories.transaction_repo import TransactionRepository
+from app.repositories.user_repo import UserRepository
+from benchmarks.generate_data import PASSWORD, bench_email
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# get_by_user offsets; the ones past the user's row count are skipped
+OFFSETS = (0, 100, 1_000, 10_000)
+
+PAGE_SIZE = 50
+
+Benchmark = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class Result:
+    """Timings of one benchmark, in milliseconds."""
+
+    samples: list[float]
+
+    def as_dict(self) -> dict[str, float]:
+        ordered = sorted(self.samples)
+        p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+        return {
+            "median_ms": round(statistics.median(ordered), 3),
+            "p95_ms": round(p95, 3),
+            "min_ms": round(ordered[0], 3),
+            "mean_ms": round(statistics.fmean(ordered), 3),
+        }
+
+
+def in_session(call: Callable[[AsyncSession], Awaitable[Any]]) -> Benchmark:
+    """Run a call in a fresh session, as a request or bot update would."""
+    async def run() -> Any:
+        async with async_session_maker() as session:
+            return await call(session)
+    return run
+
+
+async def measure(benchmark: Benchmark, iterations: int, warmup: int) -> Result:
+    """Time a benchmark, after a few untimed runs to warm pools and caches."""
+    for _ in range(warmup):
+        await benchmark()
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await benchmark()
+        samples.append((time.perf_counter() - started) * 1000)
+    return Result(samples)
+
+
+async def load_user(index: int) -> tuple[User, int]:
+    """The benchmark user to query as, and how many transactions they have."""
+    async with async_session_maker() as session:
+        user = (
+            await session.execute(select(User).where(User.email == bench_email(index)))
+        ).scalar_one_or_none()
+        if user is None:
+            raise SystemExit("Benchmark user not found, run benchmarks.generate_data first")
+        count = await TransactionRepository(session).count_by_user(user.id)
+    return user, count
+
+
+def repository_benchmarks(user: User, count: int) -> dict[str, Benchmark]:
+    """Repository and service calls, each in its own session."""
+    token = create_access_token({"sub": str(user.id)})
+
+    async def login(session: AsyncSession) -> None:
+        found = await UserRepository(session).get_by_email(user.email)
+        verify_password(PASSWORD, found.hashed_password)
+        create_access_token({"sub": str(found.id)})
+
+    async def principal(session: AsyncSession) -> None:
+        await UserRepository(session).get_principal(uuid.UUID(decode_token(token)["sub"]))
+
+    benchmarks: dict[str, Benchmark] = {}
+    for offset in OFFSETS:
+        if offset < count:
+            benchmarks[f"repo.get_by_user.offset_{offset}"] = in_session(
+                lambda session, offset=offset: TransactionRepository(session).get_by_user(
+                    user.id, skip=offset, limit=PAGE_SIZE
+                )
+            )
+
+    benchmarks.update({
+        "repo.count_by_user": in_session(
+            lambda session: TransactionRepository(session).count_by_user(user.id)
+        ),
+        "repo.category_list": in_session(
+            lambda session: CategoryRepository(session).get_user_categories(user.id)
+        ),
+        "bot.get_month_summary": in_session(
+            lambda session: BotService(session).get_month_summary(user.id)
+        ),
+        "auth.login": in_session(login),
+        "auth.principal": in_session(principal),
+    })
+    return benchmarks
+
+
+def api_benchmarks(client: httpx.AsyncClient, user: User, count: int) -> dict[str, Benchmark]:
+    """Endpoints served in-process, through the full middleware and dependency stack."""
+    async def get(url: str, **params: Any) -> None:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+
+    async def login() -> None:
+        response = await client.post(
+            "/api/v1/auth/login", json={"email": user.email, "password": PASSWORD}
+        )
+        response.raise_for_status()
+
+    # Offset pagination gets slower with depth; capped to keep runs comparable
+    last_page = max(1, min(count // PAGE_SIZE, 200))
+    return {
+        "api.transactions.page_1": lambda: get("/api/v1/transactions", page=1, page_size=PAGE_SIZE),
+        "api.transactions.deep_page": lambda: get(
+            "/api/v1/transactions", page=last_page, page_size=PAGE_SIZE
+        ),
+        "api.transactions.cursor": lambda: get("/api/v1/transactions/cursor", limit=PAGE_SIZE),
+        "api.analytics.summary": lambda: get("/api/v1/analytics/summary"),
+        "api.categories": lambda: get("/api/v1/categories"),
+        "api.budgets.status": lambda: get("/api/v1/budgets/status"),
+        "api.auth.login": login,
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    tolerance: float,
+    min_delta_ms: float,
+) -> list[str]:
+    """Print results next to the baseline and return the names that regressed."""
+    regressions = []
+    print(f"\n{'benchmark':<40} {'median':>10} {'p95':>10} {'baseline':>10} {'change':>8}")
+    for name, result in results.items():
+        median = result["median_ms"]
+        line = f"{name:<40} {median:>10.2f} {result['p95_ms']:>10.2f}"
+        base = baseline.get(name)
+        if base:
+            change = median / base["median_ms"] - 1 if base["median_ms"] else 0.0
+            regressed = change > tolerance and median - base["median_ms"] > min_delta_ms
+            line += f" {base['median_ms']:>10.2f} {change:>+8.0%}"
+            if regressed:
+                line += "  REGRESSION"
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> int:
+    """Run the selected benchmarks and compare them with the baseline."""
+    user, count = await load_user(args.user)
+    print(f"Benchmarking as {user.email} ({count} transactions)")
+
+    token = create_access_token({"sub": str(user.id)})
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport,
+        base_url="http://benchmark",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as client:
+        benchmarks = repository_benchmarks(user, count) | api_benchmarks(client, user, count)
+
+        results = {}
+        for name, benchmark in benchmarks.items():
+            if args.only and not name.startswith(args.only):
+                continue
+            results[name] = (await measure(benchmark, args.iterations, args.warmup)).as_dict()
+
+    await close_redis()
+
+    baseline_data = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    regressions = compare(
+        results, baseline_data.get("results", {}), args.tolerance, args.min_delta_ms
+    )
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "iterations": args.iterations,
+            "transactions": count,
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed beyond {args.tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--user", type=int, default=0, help="index of the benchmark user")
+    parser.add_argument("--only", help="run benchmarks whose name starts with this")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=0.5)
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(run(args)))
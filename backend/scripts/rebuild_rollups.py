@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""Rebuild monthly rollups from the transactions table.
+
+Usage: rebuild_rollups.py [USER_ID]
+"""
+
+import asyncio
+import sys
+import uuid
+
+from app.db.session import async_session_maker
+from app.repositories.monthly_rollup_repo import MonthlyRollupRepository
+
+
+async def rebuild_rollups(user_id: uuid.UUID | None = None):
+    """Recompute rollups for one user, or for everyone."""
+    async with async_session_maker() as session:
+        scope = f"user {user_id}" if user_id else "all users"
+        print(f"Rebuilding monthly rollups for {scope}...")
+        
+        await MonthlyRollupRepository(session).rebuild(user_id)
+        await session.commit()
+        print("✅ Monthly rollups rebuilt!")
+
+
+if __name__ == "__main__":
+    user_id = uuid.UUID(sys.argv[1]) if len(sys.argv) > 1 else None
+    asyncio.run(rebuild_rollups(user_id))
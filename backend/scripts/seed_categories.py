@@ -7,9 +7,11 @@ import uuid
 from sqlalchemy import select
 
 from app.core.constants import DEFAULT_EXPENSE_CATEGORIES, DEFAULT_INCOME_CATEGORIES
+from app.core.redis import close_redis
 from app.db.session import async_session_maker
 from app.models.category import Category
 from app.models.transaction import TransactionType
+from app.repositories.system_categories import system_categories
 
 
 async def seed_categories():
@@ -54,6 +56,8 @@ async def seed_categories():
             print(f"  ✅ Added income category: {icon} {name}")
         
         await session.commit()
+        await system_categories.bump()
+        await close_redis()
         print(f"\n✅ Successfully seeded {len(DEFAULT_EXPENSE_CATEGORIES)} expense and {len(DEFAULT_INCOME_CATEGORIES)} income categories!")
 
 
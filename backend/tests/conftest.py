@@ -0,0 +1,7 @@
+"""Shared test configuration."""
+
+import os
+
+# Settings are read at import time and these have no defaults
+os.environ.setdefault("SECRET_KEY", "test-secret-key-" + "x" * 32)
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-" + "x" * 32)
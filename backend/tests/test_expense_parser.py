@@ -0,0 +1,120 @@
+"""Tests for the bot's expense parser."""
+
+from decimal import Decimal
+
+import pytest
+
+from app.bot.parsers import ExpenseParser
+from app.core.keyword_index import KeywordIndex, StaticKeywords
+from app.models.transaction import TransactionType
+from benchmarks.parser import ReferenceParser
+
+INCOME = TransactionType.INCOME
+EXPENSE = TransactionType.EXPENSE
+
+# Message → (type, amount, description), or None when it doesn't parse
+MESSAGES = {
+    # Bare amounts and "$"
+    "50 lunch": (EXPENSE, "50", "lunch"),
+    "$50 lunch": (EXPENSE, "50", "lunch"),
+    "$12.50 coffee": (EXPENSE, "12.50", "coffee"),
+    "50 on the way home": (EXPENSE, "50", "on the way home"),
+    "50 en el camino": (EXPENSE, "50", "en el camino"),
+    # "spent … on" / "gasté … en"
+    "spent 50 on lunch": (EXPENSE, "50", "lunch"),
+    "spent 50 lunch": (EXPENSE, "50", "lunch"),
+    "Spent 50 On Lunch": (EXPENSE, "50", "lunch"),
+    "spent 50 on": (EXPENSE, "50", "on"),
+    "spent 50 en comida": (EXPENSE, "50", "en comida"),
+    "gasté 50 en comida": (EXPENSE, "50", "comida"),
+    "Gasté 50 comida": (EXPENSE, "50", "comida"),
+    "gasté 50 on lunch": (EXPENSE, "50", "on lunch"),
+    # "+", "income" / "ingreso"
+    "+1000 salary": (INCOME, "1000", "salary"),
+    "+1000 from salary": (INCOME, "1000", "from salary"),
+    "+1000.00 bono": (INCOME, "1000.00", "bono"),
+    "income 1000 salary": (INCOME, "1000", "salary"),
+    "ingreso 1000 salario": (INCOME, "1000", "salario"),
+    # "earned … from" / "gané … de"
+    "earned 1000 from salary": (INCOME, "1000", "salary"),
+    "earned 1000 salary": (INCOME, "1000", "salary"),
+    "earned 1000 de salario": (INCOME, "1000", "de salario"),
+    "gané 1000 de salario": (INCOME, "1000", "salario"),
+    "GANÉ 1000 DE SALARIO": (INCOME, "1000", "salario"),
+    "gané 1000 from salary": (INCOME, "1000", "from salary"),
+    # Surrounding whitespace is ignored
+    "   50   lunch  ": (EXPENSE, "50", "lunch"),
+    # Not transactions
+    "hello": None,
+    "lunch 50": None,
+    "50": None,
+    "50.5 coffee": None,
+    "+ 100 salary": None,
+    "$ 50 lunch": None,
+    "spent on lunch": None,
+    "spent 50": None,
+    "/start": None,
+}
+
+
+@pytest.fixture
+def parser() -> ExpenseParser:
+    return ExpenseParser(StaticKeywords(KeywordIndex({
+        "food": ["lunch", "comida", "uber eats"],
+        "transport": ["uber", "bus"],
+    })))
+
+
+@pytest.mark.parametrize(("message", "expected"), MESSAGES.items())
+def test_parse(parser, message, expected):
+    transaction = parser.parse(message)
+    
+    if expected is None:
+        assert transaction is None
+    else:
+        transaction_type, amount, description = expected
+        assert (transaction.type, transaction.amount, transaction.description) == (
+            transaction_type,
+            Decimal(amount),
+            description,
+        )
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_parse_matches_the_original_parser(parser, message):
+    reference = ReferenceParser(parser._detect_category)
+    
+    assert parser.parse(message) == reference.parse(message)
+
+
+def test_raw_message_is_normalized(parser):
+    assert parser.parse("  Spent 50 On Lunch ").raw_message == "spent 50 on lunch"
+
+
+@pytest.mark.parametrize(
+    ("message", "category_hint"),
+    [
+        ("50 lunch", "food"),
+        ("120 uber eats", "food"),
+        ("80 uber home", "transport"),
+        ("30 business cards", None),
+        ("gasté 50 en comida", "food"),
+        ("200 rent", None),
+    ],
+)
+def test_category_hint(parser, message, category_hint):
+    assert parser.parse(message).category_hint == category_hint
+
+
+def test_parse_many_keeps_order(parser):
+    transactions = parser.parse_many(["50 lunch", "hello", "+100 salary"])
+    
+    assert [transaction and transaction.type for transaction in transactions] == [
+        EXPENSE,
+        None,
+        INCOME,
+    ]
+
+
+def test_bundled_keywords_by_default():
+    assert ExpenseParser().parse("120 uber eats").category_hint == "food"
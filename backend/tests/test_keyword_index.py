@@ -0,0 +1,139 @@
+"""Tests for the keyword index."""
+
+import pytest
+
+from app.core.keyword_index import (
+    BUNDLED_KEYWORDS_FILE,
+    KeywordHit,
+    KeywordIndex,
+    StaticKeywords,
+    normalize,
+)
+
+
+@pytest.fixture
+def index() -> KeywordIndex:
+    return KeywordIndex({
+        "transport": ["uber", "bus", "autobús"],
+        "food": ["uber eats", "eats", "café"],
+        "shopping": ["h&m"],
+        "entertainment": ["disney+", "disney"],
+        "travel": ["new york", "york pizza"],
+    })
+
+
+def test_normalize_strips_case_and_accents():
+    assert normalize("Café Olé") == "cafe ole"
+    assert normalize("AUTOBÚS") == "autobus"
+    assert normalize("plain ascii") == "plain ascii"
+
+
+def test_nested_keywords_are_all_found(index):
+    hits = index.find_all("uber eats pizza")
+    
+    assert [(hit.keyword, hit.start, hit.end) for hit in hits] == [
+        ("uber", 0, 4),
+        ("uber eats", 0, 9),
+        ("eats", 5, 9),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "category"),
+    [
+        ("uber eats pizza", "food"),
+        ("uber to the airport", "transport"),
+        ("pizza via uber eats", "food"),
+        ("uber, then eats", "transport"),
+    ],
+)
+def test_longest_keyword_wins(index, text, category):
+    assert index.best(text) == category
+
+
+def test_overlapping_keywords_are_both_found(index):
+    hits = index.find_all("new york pizza")
+    
+    assert hits == [
+        KeywordHit(0, 8, "new york", "travel"),
+        KeywordHit(4, 14, "york pizza", "travel"),
+    ]
+
+
+def test_ties_go_to_the_leftmost_keyword():
+    index = KeywordIndex({"transport": ["taxi"], "food": ["cena"]})
+    
+    assert index.best("taxi a la cena") == "transport"
+    assert index.best("cena y taxi") == "food"
+
+
+@pytest.mark.parametrize(
+    ("text", "category"),
+    [
+        ("bus ticket", "transport"),
+        ("the bus", "transport"),
+        ("bus.", "transport"),
+        ("business lunch", None),
+        ("minibus", None),
+        ("omnibus ride", None),
+    ],
+)
+def test_only_whole_words_match(index, text, category):
+    assert index.best(text) == category
+
+
+@pytest.mark.parametrize(
+    ("text", "category"),
+    [
+        ("h&m jeans", "shopping"),
+        ("jeans at h&m", "shopping"),
+        ("ah&m", None),
+        ("h&ms", None),
+        ("disney+ subscription", "entertainment"),
+        ("disney+", "entertainment"),
+        ("disneyland", None),
+    ],
+)
+def test_keywords_with_punctuation(index, text, category):
+    assert index.best(text) == category
+
+
+def test_punctuation_keyword_beats_its_prefix(index):
+    assert [hit.keyword for hit in index.find_all("disney+ plan")] == ["disney", "disney+"]
+
+
+@pytest.mark.parametrize(
+    ("text", "category"),
+    [
+        ("café con leche", "food"),
+        ("cafe con leche", "food"),
+        ("CAFÉ", "food"),
+        ("autobus al centro", "transport"),
+        ("Autobús al centro", "transport"),
+    ],
+)
+def test_accents_and_case_are_ignored(index, text, category):
+    assert index.best(text) == category
+
+
+def test_first_category_listed_for_a_keyword_wins():
+    index = KeywordIndex({"transport": ["Uber"], "food": ["uber", " "]})
+    
+    assert index.size == 1
+    assert index.best("uber") == "transport"
+
+
+def test_no_keywords():
+    index = KeywordIndex({})
+    
+    assert index.size == 0
+    assert index.find_all("anything at all") == []
+    assert index.best("anything at all") is None
+
+
+def test_bundled_keywords():
+    index = StaticKeywords.from_file(BUNDLED_KEYWORDS_FILE).index
+    
+    assert index.best("uber eats") == "food"
+    assert index.best("uber al aeropuerto") == "transport"
+    assert index.best("business lunch") != "transport"
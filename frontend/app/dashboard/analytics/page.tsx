@@ -17,24 +17,18 @@ import {
     Line,
 } from 'recharts';
 import { apiClient } from '@/lib/api-client';
-import type { Transaction, Category } from '@/lib/types';
+import type { AnalyticsSummary } from '@/lib/types';
 
 const COLORS = ['#6366f1', '#ec4899', '#8b5cf6', '#14b8a6', '#f59e0b', '#ef4444', '#10b981', '#3b82f6'];
 
 export default function AnalyticsPage() {
-    const [transactions, setTransactions] = useState<Transaction[]>([]);
-    const [categories, setCategories] = useState<Category[]>([]);
+    const [summary, setSummary] = useState<AnalyticsSummary | null>(null);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
         const loadData = async () => {
             try {
-                const [transRes, catsRes] = await Promise.all([
-                    apiClient.get<any>('/api/v1/transactions?page=1&page_size=100'),
-                    apiClient.get<Category[]>('/api/v1/categories')
-                ]);
-                setTransactions(transRes.items || []);
-                setCategories(catsRes);
+                setSummary(await apiClient.get<AnalyticsSummary>('/api/v1/analytics/summary'));
             } catch (error) {
                 console.error('Failed to fetch analytics data:', error);
             } finally {
@@ -46,40 +40,18 @@ export default function AnalyticsPage() {
 
     // Process Monthly Data
     const getMonthlyData = () => {
-        const monthlyData: Record<string, { name: string; income: number; expense: number }> = {};
-
-        transactions.forEach(t => {
-            const date = new Date(t.transaction_date);
-            const monthKey = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`;
-            const monthName = date.toLocaleString('default', { month: 'short', year: '2-digit' });
-
-            if (!monthlyData[monthKey]) {
-                monthlyData[monthKey] = { name: monthName, income: 0, expense: 0 };
-            }
-
-            if (t.type === 'income') {
-                monthlyData[monthKey].income += Number(t.amount);
-            } else {
-                monthlyData[monthKey].expense += Number(t.amount);
-            }
-        });
-
-        return Object.keys(monthlyData).sort().map(key => monthlyData[key]);
+        return (summary?.months || []).map(m => ({
+            name: new Date(`${m.month}T00:00:00`).toLocaleString('default', { month: 'short', year: '2-digit' }),
+            income: Number(m.income),
+            expense: Number(m.expense),
+        }));
     };
 
     // Process Category Breakdown
     const getCategoryData = () => {
-        const expenses = transactions.filter(t => t.type === 'expense');
-        const categoryTotals: Record<string, number> = {};
-
-        expenses.forEach(t => {
-            const cat = categories.find(c => c.id === t.category_id);
-            const name = cat ? cat.name : 'Uncategorized';
-            categoryTotals[name] = (categoryTotals[name] || 0) + Number(t.amount);
-        });
-
-        return Object.entries(categoryTotals)
-            .map(([name, value]) => ({ name, value }))
+        return (summary?.categories || [])
+            .filter(c => c.type === 'expense')
+            .map(c => ({ name: c.name || 'Uncategorized', value: Number(c.total) }))
             .sort((a, b) => b.value - a.value);
     };
 
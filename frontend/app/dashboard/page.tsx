@@ -2,7 +2,7 @@
 
 import { useEffect, useState } from 'react';
 import { apiClient } from '@/lib/api-client';
-import type { Transaction, Category } from '@/lib/types';
+import type { AnalyticsSummary, BudgetStatus, Category, PaginatedResponse, Transaction } from '@/lib/types';
 import TransactionList from '@/components/dashboard/TransactionList';
 import BudgetWidget from '@/components/dashboard/BudgetWidget';
 
@@ -22,36 +22,33 @@ export default function DashboardPage() {
     });
     const [recentTransactions, setRecentTransactions] = useState<Transaction[]>([]);
     const [categories, setCategories] = useState<Category[]>([]);
+    const [budgetStatus, setBudgetStatus] = useState<BudgetStatus | null>(null);
     const [loading, setLoading] = useState(true);
 
     const fetchDashboardData = async () => {
         try {
-            // Fetch transactions
-            const response = await apiClient.get<any>('/api/v1/transactions?page=1&page_size=100');
-            const transactions = response.items || [];
+            // Summary for the current month is aggregated server-side
+            const now = new Date();
+            const monthStart = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}-01`;
 
-            // Fetch categories
-            const categoriesResponse = await apiClient.get<Category[]>('/api/v1/categories');
-            setCategories(categoriesResponse);
-
-            // Calculate summary
-            const totalExpenses = transactions
-                .filter((t: Transaction) => t.type === 'expense')
-                .reduce((sum: number, t: Transaction) => sum + Number(t.amount), 0);
+            const [summaryResponse, transactionsResponse, categoriesResponse, budgetResponse] = await Promise.all([
+                apiClient.get<AnalyticsSummary>(`/api/v1/analytics/summary?start_date=${monthStart}`),
+                apiClient.get<PaginatedResponse<Transaction>>('/api/v1/transactions?page=1&page_size=5&total=none'),
+                apiClient.get<Category[]>('/api/v1/categories'),
+                apiClient.get<BudgetStatus>(`/api/v1/budgets/status?month=${monthStart}`),
+            ]);
 
-            const totalIncome = transactions
-                .filter((t: Transaction) => t.type === 'income')
-                .reduce((sum: number, t: Transaction) => sum + Number(t.amount), 0);
+            setCategories(categoriesResponse);
+            setBudgetStatus(budgetResponse);
 
             setSummary({
-                total_expenses: totalExpenses,
-                total_income: totalIncome,
-                balance: totalIncome - totalExpenses,
-                transaction_count: transactions.length,
+                total_expenses: Number(summaryResponse.total_expenses),
+                total_income: Number(summaryResponse.total_income),
+                balance: Number(summaryResponse.balance),
+                transaction_count: summaryResponse.transaction_count,
             });
 
-            // Get recent 5 transactions
-            setRecentTransactions(transactions.slice(0, 5));
+            setRecentTransactions(transactionsResponse.items || []);
 
         } catch (error) {
             console.error('Failed to fetch dashboard data:', error);
@@ -151,7 +148,7 @@ export default function DashboardPage() {
                 {/* Budget Overview */}
                 <BudgetWidget
                     categories={categories}
-                    transactions={recentTransactions}
+                    budgetStatus={budgetStatus}
                     onBudgetUpdate={() => {
                         fetchDashboardData();
                     }}
@@ -3,59 +3,29 @@
 import { useState } from 'react';
 import { apiClient } from '@/lib/api-client';
 import { toast } from 'sonner';
-import type { Category, Transaction } from '@/lib/types';
+import type { BudgetStatus, Category } from '@/lib/types';
 
 interface BudgetWidgetProps {
     categories: Category[];
-    transactions: Transaction[];
+    budgetStatus: BudgetStatus | null;
     onBudgetUpdate?: () => void;
 }
 
 interface CategorySpending {
-    category: Category;
+    category: Pick<Category, 'id' | 'name' | 'icon'>;
     spent: number;
     limit: number;
     percentage: number;
 }
 
-function calculateCategorySpending(
-    categories: Category[],
-    transactions: Transaction[]
-): CategorySpending[] {
-    // Filter categories with budget limits
-    const budgetedCategories = categories.filter(
-        (cat) => cat.monthly_limit !== null && cat.monthly_limit > 0
-    );
-
-    if (budgetedCategories.length === 0) {
-        return [];
-    }
-
-    // Get current month's date range
-    const now = new Date();
-    const currentMonth = now.getMonth();
-    const currentYear = now.getFullYear();
-
-    // Calculate spending for each category
-    return budgetedCategories.map((category) => {
-        const spent = transactions
-            .filter((t) => {
-                const [year, month, day] = t.transaction_date.split('T')[0].split('-').map(Number);
-                const txDate = new Date(year, month - 1, day);
-                return (
-                    t.category_id === category.id &&
-                    t.type === 'expense' &&
-                    txDate.getMonth() === currentMonth &&
-                    txDate.getFullYear() === currentYear
-                );
-            })
-            .reduce((sum, t) => sum + Number(t.amount), 0);
-
-        const limit = category.monthly_limit!;
-        const percentage = (spent / limit) * 100;
-
-        return { category, spent, limit, percentage };
-    });
+function toCategorySpending(budgetStatus: BudgetStatus | null): CategorySpending[] {
+    // Spending is evaluated server-side for the whole month
+    return (budgetStatus?.categories ?? []).map((status) => ({
+        category: { id: status.category_id, name: status.name, icon: status.icon },
+        spent: Number(status.spent),
+        limit: Number(status.monthly_limit),
+        percentage: Number(status.percent_used),
+    }));
 }
 
 function getProgressColor(percentage: number): string {
@@ -64,12 +34,12 @@ function getProgressColor(percentage: number): string {
     return 'bg-green-500';
 }
 
-export default function BudgetWidget({ categories, transactions, onBudgetUpdate }: BudgetWidgetProps) {
+export default function BudgetWidget({ categories, budgetStatus, onBudgetUpdate }: BudgetWidgetProps) {
     const [showModal, setShowModal] = useState(false);
     const [budgetLimits, setBudgetLimits] = useState<Record<string, string>>({});
     const [saving, setSaving] = useState(false);
 
-    const categorySpending = calculateCategorySpending(categories, transactions);
+    const categorySpending = toCategorySpending(budgetStatus);
     const expenseCategories = categories.filter(cat => cat.type === 'expense');
 
     const handleOpenModal = () => {
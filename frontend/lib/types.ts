@@ -42,10 +42,79 @@ export interface Transaction {
 
 export interface PaginatedResponse<T> {
     items: T[];
-    total: number;
+    total: number | null;
     page: number;
     page_size: number;
-    total_pages: number;
+    total_pages: number | null;
+    has_more: boolean;
+}
+
+export interface CursorPaginatedResponse<T> {
+    items: T[];
+    page_size: number;
+    next_cursor: string | null;
+    prev_cursor: string | null;
+}
+
+export interface CategorySummary {
+    category_id: string | null;
+    name: string | null;
+    icon: string | null;
+    color: string | null;
+    type: TransactionType;
+    total: string;
+    count: number;
+}
+
+export interface MonthlySummary {
+    month: string;
+    income: string;
+    expense: string;
+    count: number;
+}
+
+export interface CurrencyTotals {
+    currency: string;
+    total_income: string;
+    total_expenses: string;
+    balance: string;
+    income_count: number;
+    expense_count: number;
+}
+
+export interface AnalyticsSummary {
+    start_date: string | null;
+    end_date: string | null;
+    currency: string;
+    total_income: string;
+    total_expenses: string;
+    balance: string;
+    income_count: number;
+    expense_count: number;
+    transaction_count: number;
+    categories: CategorySummary[];
+    months: MonthlySummary[];
+    other_currencies: CurrencyTotals[];
+}
+
+export interface CategoryBudgetStatus {
+    category_id: string;
+    name: string;
+    icon: string;
+    color: string;
+    monthly_limit: string;
+    spent: string;
+    remaining: string;
+    percent_used: string;
+    is_over_budget: boolean;
+}
+
+export interface BudgetStatus {
+    month: string;
+    total_limit: string;
+    total_spent: string;
+    total_remaining: string;
+    categories: CategoryBudgetStatus[];
 }
 
 export interface LoginCredentials {